@@ -0,0 +1,104 @@
+"""Startup import-time benchmark for Herald.
+
+Every target is imported in a fresh interpreter under ``python -X importtime``, so module caches
+never leak between measurements. The report lists the cumulative import time of each target
+(median over the repeats) and breaks ``import main`` down into the modules it imports directly.
+
+Usage::
+
+    python benchmarks/import_time.py [--repeat N] [--top N] [TARGET ...]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_TARGETS = [
+    "main",
+    "herald.context_manager.prompt_based",
+    "herald.context_manager.rag_based",
+    "agents",
+    "fastapi",
+    "numpy",
+    "boto3",
+    "chromadb",
+    "fitz",
+    "pymupdf4llm",
+    "rich",
+    "gradio",
+]
+
+
+def import_profile(target: str) -> list:
+    """Import a module in a fresh interpreter and return its ``-X importtime`` records.
+
+    :param str target: Dotted module name to import.
+    :raises RuntimeError: If the import fails.
+    :return: List of (module, depth, self_us, cumulative_us) tuples in import order
+    :rtype: list
+    """
+    env = {**os.environ, "GROQ_API_KEY": os.environ.get("GROQ_API_KEY") or "benchmark"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+
+    records = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return records
+
+
+def cumulative_ms(records: list, target: str) -> float:
+    """Return the cumulative import time of the target module in milliseconds."""
+    return next(cumulative for name, _, _, cumulative in reversed(records) if name == target) / 1000
+
+
+def main(argv: list = None) -> int:
+    """Run the benchmark and print the report.
+
+    :param list argv: Command line arguments, optional. Defaults to sys.argv.
+    :return: Process exit code
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description="Measure Herald's startup import cost per module.")
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS, help="Modules to import.")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per target (median reported).")
+    parser.add_argument("--top", type=int, default=15, help="Direct imports of main to list.")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':<40} {'import ms':>10}")
+    for target in args.targets:
+        try:
+            timings = [cumulative_ms(import_profile(target), target) for _ in range(args.repeat)]
+        except RuntimeError as exc:
+            print(f"{target:<40} {'n/a':>10}  ({exc})")
+            continue
+        print(f"{target:<40} {statistics.median(timings):>10.1f}")
+
+    records = import_profile("main")
+    direct = sorted(
+        ((name, cumulative) for name, depth, _, cumulative in records if depth == 1),
+        key=lambda item: item[1], reverse=True,
+    )
+    loaded = {name for name, _, _, _ in records}
+    print(f"\nHeaviest direct imports of main (total {cumulative_ms(records, 'main'):.1f} ms):")
+    for name, cumulative in direct[:args.top]:
+        print(f"  {name:<38} {cumulative / 1000:>10.1f}")
+    deferred = [name for name in DEFAULT_TARGETS if "." not in name and name not in loaded and name != "main"]
+    print(f"\nNot loaded by `import main`: {', '.join(deferred) or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+"""Retrieval latency under parallel requests: on the event loop vs. in the retrieval pool.
+
+Retrieval requests with unique queries (so no cache helps) arrive at a fixed rate, open loop,
+and their latency is measured from arrival to completion. A probe coroutine stands in for cheap
+requests sharing the same loop (health checks, cached answers) and records how late it is woken
+up. Embedding is simulated with GIL-releasing NumPy work of a configurable cost, so no ONNX model
+download is needed. The pool only adds retrieval throughput with more than one CPU; on any
+machine it keeps the loop responsive.
+
+- ``on loop``: the synchronous retrieval is called straight from the coroutine — every other
+  request waits until it finishes.
+- ``pool``: ``aretrieve_relevant_chunks`` runs embedding and search in the bounded retrieval pool.
+
+Usage::
+
+    python benchmarks/retrieval_concurrency.py [--rate RPS] [--requests N] [--embed-ms MS] [--concurrency C]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import numpy as np
+
+from herald.context_manager.query_cache import QueryEmbeddingCache, RetrievalCache
+from herald.context_manager.rag import CVVectorStore
+
+TOPICS = ["Experience", "Skills", "Education", "Projects", "Summary"]
+DIMENSIONS = 384
+PROBE_INTERVAL_SECONDS = 0.005
+
+
+def _percentile(samples: list, pct: float) -> float:
+    """Return the pct-th percentile of the samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class SyntheticEmbedding:  # pylint: disable=too-few-public-methods
+    """Embedding function burning a fixed amount of GIL-releasing CPU per call, like ONNX inference."""
+
+    def __init__(self, cost_ms: float):
+        self._work = np.random.default_rng(0).normal(size=(256, 256)).astype(np.float32)
+        # calibrate how many matrix products take cost_ms
+        start = time.perf_counter()
+        for _ in range(20):
+            self._work @ self._work  # pylint: disable=pointless-statement
+        per_product_ms = (time.perf_counter() - start) * 1000 / 20
+        self._products = max(1, int(cost_ms / per_product_ms))
+
+    def __call__(self, texts: list) -> list:
+        for _ in range(self._products):
+            self._work @ self._work  # pylint: disable=pointless-statement
+        return [np.random.default_rng(abs(hash(text)) % 2**32).normal(size=DIMENSIONS) for text in texts]
+
+
+def build_store(embed_ms: float) -> CVVectorStore:
+    """Build a CV-sized vector store with retrieval caches disabled."""
+    rng = np.random.default_rng(1)
+    store = CVVectorStore(
+        [],
+        embedding_function=SyntheticEmbedding(embed_ms),
+        index_backend="numpy",
+        query_cache=QueryEmbeddingCache(maxsize=0),
+        retrieval_cache=RetrievalCache(maxsize=0),
+    )
+    store.load_index(
+        [f"chunk {idx}" for idx in range(60)],
+        rng.normal(size=(60, DIMENSIONS)).tolist(),
+        [TOPICS[idx % len(TOPICS)] for idx in range(60)],
+    )
+    return store
+
+
+async def run_scenario(store: CVVectorStore, mode: str, rate: float, requests: int) -> dict:
+    """Fire requests at a fixed arrival rate alongside the loop-lag probe.
+
+    :return: Mapping of "retrieval" and "probe lag" to latency samples in milliseconds
+    :rtype: dict
+    """
+    retrieval, lag = [], []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            expected = time.perf_counter() + PROBE_INTERVAL_SECONDS
+            await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+            lag.append(max(0.0, time.perf_counter() - expected) * 1000)
+
+    async def request(request_id: int, arrival: float):
+        await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+        query = f"question {request_id}"
+        if mode == "on loop":
+            store.retrieve_relevant_chunks(query, top_k=4)
+        else:
+            await store.aretrieve_relevant_chunks(query, top_k=4)
+        # measured from the scheduled arrival, so time spent waiting for a blocked loop counts
+        retrieval.append((time.perf_counter() - arrival) * 1000)
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(request(request_id, start + request_id / rate) for request_id in range(requests)))
+    done.set()
+    await probe_task
+    return {"retrieval": retrieval, "probe lag": lag}
+
+
+def main(argv: list = None) -> int:
+    """Run the benchmark and print the report.
+
+    :param list argv: Command line arguments, optional. Defaults to sys.argv.
+    :return: Process exit code
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description="Retrieval latency under parallel requests.")
+    parser.add_argument("--rate", type=float, default=100.0, help="Retrieval requests per second.")
+    parser.add_argument("--requests", type=int, default=400, help="Total retrieval requests.")
+    parser.add_argument("--embed-ms", type=float, default=5.0, help="Simulated query embedding cost in ms.")
+    parser.add_argument("--concurrency", type=int, default=None, help="Retrieval pool size (RETRIEVAL_CONCURRENCY).")
+    args = parser.parse_args(argv)
+    if args.concurrency:
+        os.environ["RETRIEVAL_CONCURRENCY"] = str(args.concurrency)
+    os.environ["RETRIEVAL_MODE"] = "vector"  # every query pays for an embedding
+
+    store = build_store(args.embed_ms)
+    print(
+        f"{args.requests} retrievals at {args.rate:g}/s, ~{args.embed_ms:g} ms embedding, {os.cpu_count()} CPU(s)\n"
+    )
+    print(f"{'mode':<8} {'metric':<10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for mode in ("on loop", "pool"):
+        for metric, samples in asyncio.run(run_scenario(store, mode, args.rate, args.requests)).items():
+            print(
+                f"{mode:<8} {metric:<10} {statistics.median(samples):>8.1f} "
+                f"{_percentile(samples, 99):>8.1f} {max(samples):>8.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
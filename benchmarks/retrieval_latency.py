@@ -0,0 +1,81 @@
+"""Per-query retrieval latency of the vector index backends.
+
+Both backends are filled with the same synthetic corpus (random unit vectors, CV-like topic mix)
+and answer the same queries, with and without a topic filter. Query embedding is excluded — it
+costs the same for every backend — so the numbers isolate the index itself.
+
+Usage::
+
+    python benchmarks/retrieval_latency.py [--chunks N] [--dim D] [--queries Q] [--top-k K]
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from herald.context_manager.vector_index import create_vector_index
+
+TOPICS = ["Experience", "Skills", "Education", "Projects", "Summary", "Contact"]
+
+
+def _percentile(samples: list, pct: float) -> float:
+    """Return the pct-th percentile of the samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def measure(backend: str, embeddings: np.ndarray, topics: list, queries: np.ndarray, top_k: int) -> dict:
+    """Build one backend and time every query.
+
+    :return: Mapping of scenario ("all topics" / "topic filter") to latency samples in microseconds
+    :rtype: dict
+    """
+    index = create_vector_index(backend)
+    index.add([f"chunk {idx}" for idx in range(len(embeddings))], embeddings.tolist(), topics)
+    samples = {"all topics": [], "topic filter": []}
+    try:
+        for position, query in enumerate(queries.tolist()):
+            for scenario, topic in (("all topics", None), ("topic filter", TOPICS[position % len(TOPICS)])):
+                start = time.perf_counter()
+                index.query(query, top_k, topic=topic)
+                samples[scenario].append((time.perf_counter() - start) * 1e6)
+    finally:
+        index.close()
+    return samples
+
+
+def main(argv: list = None) -> int:
+    """Run the benchmark and print the report.
+
+    :param list argv: Command line arguments, optional. Defaults to sys.argv.
+    :return: Process exit code
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description="Per-query latency of the numpy and chroma index backends.")
+    parser.add_argument("--chunks", type=int, default=60, help="Indexed chunks (a CV has a few dozen).")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension (all-MiniLM-L6-v2: 384).")
+    parser.add_argument("--queries", type=int, default=500, help="Timed queries per scenario.")
+    parser.add_argument("--top-k", type=int, default=4, help="Results per query.")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(args.chunks, args.dim)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    topics = [TOPICS[idx % len(TOPICS)] for idx in range(args.chunks)]
+    queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+
+    print(f"{args.chunks} chunks x {args.dim} dims, {args.queries} queries, top_k={args.top_k}\n")
+    print(f"{'backend':<8} {'scenario':<14} {'mean us':>10} {'p50 us':>10} {'p99 us':>10}")
+    for backend in ("numpy", "chroma"):
+        for scenario, samples in measure(backend, embeddings, topics, queries, args.top_k).items():
+            print(
+                f"{backend:<8} {scenario:<14} {statistics.fmean(samples):>10.1f} "
+                f"{_percentile(samples, 50):>10.1f} {_percentile(samples, 99):>10.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+"""Herald admin API routes.
+
+Admin endpoints are disabled unless HERALD_ADMIN_TOKEN is set; every request must then carry
+the same value in the ``X-Admin-Token`` header.
+"""
+
+import hmac
+import logging
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+
+from herald.reloader import CVReloader
+from herald.resilience import circuit_breakers
+from herald.tenants import TenantRegistry
+
+logger = logging.getLogger(__name__)
+
+
+def require_admin_token(x_admin_token: str = Header(default="")):
+    """Dependency rejecting requests without the configured admin token."""
+    expected = os.getenv("HERALD_ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (HERALD_ADMIN_TOKEN is not set).")
+    if not hmac.compare_digest(x_admin_token.encode("utf-8"), expected.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+
+
+def get_cv_reloader(request: Request) -> CVReloader:
+    """Dependency to get the CV reloader from application state."""
+    cv_reloader = getattr(request.app.state, "cv_reloader", None)
+    if cv_reloader is None:
+        raise HTTPException(status_code=404, detail="CV reloading is not available in multi-tenant mode.")
+    return cv_reloader
+
+
+def get_tenant_registry(request: Request) -> TenantRegistry:
+    """Dependency to get the tenant registry from application state."""
+    registry = getattr(request.app.state, "tenant_registry", None)
+    if registry is None:
+        raise HTTPException(status_code=404, detail="Multi-tenant serving is not enabled.")
+    return registry
+
+
+def get_vector_store(request: Request):
+    """Dependency to get the vector store of the served RAG context from application state."""
+    vector_store = getattr(getattr(request.app.state, "herald_prompt", None), "context_store", None)
+    if vector_store is None:
+        raise HTTPException(status_code=404, detail="Retrieval caches are only available for the RAG context.")
+    return vector_store
+
+
+admin_router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin_token)])
+
+
+@admin_router.post("/reindex")
+async def reindex(cv_reloader: CVReloader = Depends(get_cv_reloader)) -> dict:
+    """Rebuild the CV context now and swap it in, regardless of whether the watcher saw a change."""
+    logger.info("Admin triggered CV reindex")
+    try:
+        return await cv_reloader.reload(reason="admin", force=True)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.exception("Admin CV reindex failed")
+        raise HTTPException(status_code=500, detail=f"Reindex failed: {exc}") from exc
+
+
+@admin_router.get("/reindex")
+def reindex_status(cv_reloader: CVReloader = Depends(get_cv_reloader)) -> dict:
+    """Report the watcher configuration and the outcome of the last reindex."""
+    return {
+        "interval_seconds": cv_reloader.interval,
+        "fingerprint": cv_reloader.current_fingerprint,
+        "last_reload": cv_reloader.last_reload,
+    }
+
+
+@admin_router.get("/tenants")
+def tenant_stats(registry: TenantRegistry = Depends(get_tenant_registry)) -> dict:
+    """Report loaded tenants, their estimated memory and the registry's hit / load / eviction counters."""
+    return registry.stats()
+
+
+@admin_router.delete("/tenants/{tenant_id}")
+def evict_tenant(tenant_id: str, registry: TenantRegistry = Depends(get_tenant_registry)) -> dict:
+    """Unload a tenant, e.g. after its CV changed; the next request for it rebuilds the context."""
+    return {"tenant_id": tenant_id, "evicted": registry.evict(tenant_id)}
+
+
+@admin_router.get("/cache")
+def cache_stats(request: Request, vector_store=Depends(get_vector_store)) -> dict:
+    """Report the answer and retrieval caches of the served context and how uncached queries were answered."""
+    answer_cache = getattr(getattr(request.app.state, "herald_app", None), "answer_cache", None)
+    return {
+        "answers": answer_cache.stats() if answer_cache is not None else None,
+        "query_embeddings": vector_store.query_cache.stats(),
+        "retrieval_results": vector_store.retrieval_cache.stats(),
+        "retrieval_paths": vector_store.retrieval_paths,
+    }
+
+
+@admin_router.get("/resilience")
+def resilience_stats(request: Request) -> dict:
+    """Report the model providers' circuit breakers and the hedging counters of the served context."""
+    hedge_policy = getattr(getattr(request.app.state, "herald_app", None), "hedge_policy", None)
+    return {
+        "circuit_breakers": {name: breaker.stats() for name, breaker in circuit_breakers().items()},
+        "hedging": hedge_policy.stats() if hedge_policy is not None else None,
+    }
+
+
+@admin_router.get("/history")
+def history_stats(request: Request) -> dict:
+    """Report the conversation history policy of the served context and the prompt tokens it saved."""
+    herald_app = getattr(request.app.state, "herald_app", None)
+    if herald_app is None:
+        raise HTTPException(status_code=404, detail="History statistics are not available in multi-tenant mode.")
+    return herald_app.history_policy.stats()
+
+
+@admin_router.get("/preretrieval")
+def preretrieval_stats(request: Request) -> dict:
+    """Report the model calls and seconds pre-retrieval saves per request, against the holdout runs."""
+    preretrieval = getattr(getattr(request.app.state, "herald_app", None), "preretrieval", None)
+    if preretrieval is None:
+        raise HTTPException(status_code=404, detail="Pre-retrieval is only available for a single RAG context.")
+    return preretrieval.stats()
+
+
+@admin_router.get("/coalescing")
+def coalescing_stats(request: Request) -> dict:
+    """Report how many opening questions joined an identical agent run already in flight."""
+    singleflight = getattr(getattr(request.app.state, "herald_app", None), "singleflight", None)
+    if singleflight is None:
+        raise HTTPException(status_code=404, detail="Coalescing is disabled or not available in multi-tenant mode.")
+    return singleflight.stats()
+
+
+@admin_router.get("/routing")
+def routing_stats(request: Request) -> dict:
+    """Report how questions were routed between the fast and the large model, with latency and tokens per route."""
+    router = getattr(getattr(request.app.state, "herald_app", None), "router", None)
+    if router is None:
+        raise HTTPException(status_code=404, detail="Model routing is disabled or not available in multi-tenant mode.")
+    return router.stats()
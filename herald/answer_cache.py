@@ -0,0 +1,100 @@
+"""Semantic cache of first-turn answers.
+
+Most visitors open with one of a handful of questions ("what do you do?", "where have you
+worked?"), and each one pays a full agent run with tool calls. The opening answer only depends
+on the question and the CV, so it is cached under the question's embedding — computed by the
+vector store's ONNX embedder — and served to any later opening question close enough to it.
+
+Follow-up questions depend on the conversation so far and are never cached. Entries are tied to
+the corpus version of the index they were answered from: a reindexed CV clears the cache.
+
+Environment variables:
+    ANSWER_CACHE_SIZE      - Maximum cached answers (default: 128, 0 disables).
+    ANSWER_CACHE_THRESHOLD - Minimum cosine similarity between two questions for a cached
+                             answer to be served (default: 0.92).
+"""
+
+import os
+
+import numpy as np
+
+from herald.context_manager.query_cache import LRUCache
+
+DEFAULT_ANSWER_CACHE_SIZE = 128
+DEFAULT_ANSWER_CACHE_THRESHOLD = 0.92
+
+
+class SemanticAnswerCache(LRUCache):
+    """LRU cache of answers, looked up by cosine similarity of question embeddings."""
+
+    def __init__(self, maxsize: int = None, threshold: float = None):
+        """Initialize the cache.
+
+        :param int maxsize: Maximum number of cached answers, optional.
+            Defaults to ANSWER_CACHE_SIZE (128). 0 disables caching.
+        :param float threshold: Minimum cosine similarity of a hit, optional.
+            Defaults to ANSWER_CACHE_THRESHOLD (0.92).
+        """
+        if maxsize is None:
+            maxsize = int(os.getenv("ANSWER_CACHE_SIZE", str(DEFAULT_ANSWER_CACHE_SIZE)))
+        if threshold is None:
+            threshold = float(os.getenv("ANSWER_CACHE_THRESHOLD", str(DEFAULT_ANSWER_CACHE_THRESHOLD)))
+        super().__init__(maxsize)
+        self.threshold = threshold
+        self._version = None
+
+    @staticmethod
+    def _unit(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _check_version(self, version: str):
+        """Drop every entry answered from another corpus version. Caller holds the lock."""
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def lookup(self, version: str, embedding) -> str | None:
+        """Return the answer to the most similar cached question, if it is similar enough.
+
+        :param str version: Corpus version of the index the question is asked against.
+        :param embedding: Embedding of the question.
+        :return: The cached answer, or None on a miss
+        :rtype: str | None
+        """
+        with self._lock:
+            self._check_version(version)
+            questions = list(self._entries)
+            if questions:
+                entries = [self._entries[question][0] for question in questions]  # (unit embedding, answer)
+                similarities = np.stack([unit for unit, _ in entries]) @ self._unit(embedding)
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    self._entries.move_to_end(questions[best])
+                    self.hits += 1
+                    return entries[best][1]
+            self.misses += 1
+            return None
+
+    def store(self, version: str, question: str, embedding, answer: str):
+        """Cache the answer to a question, evicting the least recently used entry when full.
+
+        :param str version: Corpus version of the index the answer was produced from.
+        :param str question: The question text.
+        :param embedding: Embedding of the question.
+        :param str answer: The answer to cache.
+        """
+        if not self.maxsize or not answer:
+            return
+        with self._lock:
+            self._check_version(version)
+        self.put(question, (self._unit(embedding), answer))
+
+    def stats(self) -> dict:
+        """Report the cache size, similarity threshold and hit / miss counters.
+
+        :return: Mapping with size, maxsize, ttl_seconds, threshold, hits, misses and hit_rate
+        :rtype: dict
+        """
+        return {**super().stats(), "threshold": self.threshold}
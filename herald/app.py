@@ -1,30 +1,101 @@
 """Application entry point for the herald package."""
 
+import asyncio
+import hashlib
 import logging
 import os
-from openai import AsyncOpenAI, APIConnectionError, APIStatusError, RateLimitError
-from agents import Agent, Runner, SQLiteSession
+import threading
+import time
+import uuid
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, OpenAIError, RateLimitError
+from agents import Agent, RunConfig, Runner, SQLiteSession
 from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
+from agents.models.openai_responses import OpenAIResponsesModel
+from agents.run_config import ModelInputData
 
+from herald.answer_cache import SemanticAnswerCache
 from herald.context_manager.icontext import ContextInterface
+from herald.guard import LocalGuard, Refusal, guard_mode
+from herald.history import HistoryPolicy
+from herald.preretrieval import PreRetrieval, PreRetrievedTurn, preretrieval_enabled
+from herald.resilience import HedgePolicy, circuit_breaker, first_successful
+from herald.routing import FAST, LARGE, ModelRouter, RouteDecision, routing_enabled, tier_models
+from herald.singleflight import SingleFlight, normalize_message, singleflight_enabled
+from herald.usage_tracker import TokenUsage
 
-_GROQ_MODEL = "openai/gpt-oss-120b"
 _FALLBACK_MODEL = "gpt-5-nano"
 
 logger = logging.getLogger(__name__)
 
+_SUMMARY_INSTRUCTIONS = (
+    "You maintain a running summary of a conversation between a visitor and Herald, an assistant answering "
+    "questions about a CV. Merge the previous summary and the new turns into one updated summary of at most "
+    "120 words. Keep what the visitor asked about, their stated interests or role, and facts Herald already "
+    "gave. Reply with the summary only."
+)
 
-def _build_groq_model() -> OpenAIChatCompletionsModel:
-    """Build a Groq-backed chat completions model, bypassing the agents SDK prefix router."""
-    client = AsyncOpenAI(
+# Provider errors that trigger the fallback and count against the provider's circuit breaker.
+_PROVIDER_ERRORS = (APIConnectionError, RateLimitError, APIStatusError)
+
+# Process-wide model clients; each keeps its HTTP keep-alive connection pool across requests,
+# reloads and tenants instead of paying a new TLS handshake per message.
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _shared_client(provider: str, **client_options) -> AsyncOpenAI:
+    """Return the process-wide client of a model provider, building it on first use.
+
+    :param str provider: Provider name the client is cached under.
+    :param client_options: AsyncOpenAI constructor arguments, used when the client is first built.
+    :return: Shared async OpenAI-compatible client
+    :rtype: AsyncOpenAI
+    """
+    if provider not in _CLIENTS:
+        with _CLIENTS_LOCK:
+            if provider not in _CLIENTS:
+                _CLIENTS[provider] = AsyncOpenAI(**client_options)
+    return _CLIENTS[provider]
+
+
+def _build_groq_model(model: str) -> OpenAIChatCompletionsModel:
+    """Build a Groq-backed chat completions model, bypassing the agents SDK prefix router.
+
+    :param str model: Groq model name
+    """
+    client = _shared_client(
+        "groq",
         api_key=os.environ["GROQ_API_KEY"],
         base_url="https://api.groq.com/openai/v1",
     )
-    return OpenAIChatCompletionsModel(model=_GROQ_MODEL, openai_client=client)
+    return OpenAIChatCompletionsModel(model=model, openai_client=client)
 
 
-class HeraldApp:
-    """Herald application."""
+def _build_fallback_model() -> OpenAIResponsesModel:
+    """Build the OpenAI fallback model on the shared OpenAI client, authenticated with OPENAI_API_KEY.
+
+    The default client main.py installs points at Groq, which does not serve the fallback model, so the
+    fallback gets a client of its own. Raises OpenAIError if OPENAI_API_KEY is not set.
+    """
+    client = _shared_client("openai", api_key=os.getenv("OPENAI_API_KEY"))
+    return OpenAIResponsesModel(model=_FALLBACK_MODEL, openai_client=client)
+
+
+class HeraldApp:  # pylint: disable=too-many-instance-attributes
+    """Herald application.
+
+    A HeraldApp is bound to one context: its agents, tools and system prompt are built on first use
+    and reused by every request. A changed CV gets a new HeraldApp (see herald.reloader).
+
+    While Groq's circuit breaker is open, requests go straight to the fallback agent; with HEDGE_DELAY
+    set, a slow primary run is raced against the fallback agent (see herald.resilience).
+    Off-topic questions and manipulation attempts are refused by a local guard without a model call
+    (see herald.guard). The history sent to the model is windowed, summarized and capped (see herald.history).
+    With a RAG context, answers to opening questions are cached by question embedding
+    (see herald.answer_cache) and served to similar opening questions without an agent run, and the
+    chunks of a question's likely CV sections are fetched before the agent runs (see herald.preretrieval).
+    Concurrent identical opening questions share one agent run (see herald.singleflight).
+    """
 
     def __init__(self, prompt: ContextInterface):
         """Initialize the Herald application.
@@ -33,37 +104,536 @@ class HeraldApp:
         which provides the necessary context for the agent to operate.
         """
         self.prompt = prompt
+        self._agent_options = None
+        self._agent = None
+        self._fast_agent = None
+        self._fallback = None
+        self._fallback_unavailable = False
+        self._models = tier_models()
+        self._answer_cache = SemanticAnswerCache() if prompt.type == "rag_based" else None
+        self._preretrieval = (
+            PreRetrieval(prompt.context_store) if prompt.type == "rag_based" and preretrieval_enabled() else None
+        )
+        self._hedge = HedgePolicy()
+        self._history = HistoryPolicy()
+        self._summarizer = None
+        self._guard = self._build_guard()
+        self._singleflight = SingleFlight() if singleflight_enabled() else None
+        self._router = self._build_router()
+        self._cv_version = None
 
-    def _base_agent_options(self) -> dict:
-        """Build shared agent options (name, instructions, tools)."""
-        options = {
-            "name": "heralder",
-            "instructions": self.prompt.get_system_instructions(),
-        }
+    @property
+    def answer_cache(self) -> SemanticAnswerCache | None:
+        """Get the cache of opening answers.
+
+        :return: The answer cache, or None if the context has no embedding model
+        :rtype: SemanticAnswerCache | None
+        """
+        return self._answer_cache
+
+    @property
+    def preretrieval(self) -> PreRetrieval | None:
+        """Get the pre-retrieval stage and its savings report.
+
+        :return: The pre-retrieval stage, or None if the context has no vector store or it is disabled
+        :rtype: PreRetrieval | None
+        """
+        return self._preretrieval
+
+    @property
+    def singleflight(self) -> SingleFlight | None:
+        """Get the coalescing of concurrent opening questions and its counters.
+
+        :return: The singleflight group, or None if coalescing is disabled
+        :rtype: SingleFlight | None
+        """
+        return self._singleflight
+
+    @property
+    def router(self) -> ModelRouter | None:
+        """Get the model router and its per-route counters.
+
+        :return: The model router, or None if routing is disabled
+        :rtype: ModelRouter | None
+        """
+        return self._router
+
+    def _build_router(self) -> ModelRouter | None:
+        """Build the model router, on the context's embedding model if it has one, as configured by MODEL_ROUTING."""
+        if not routing_enabled():
+            return None
+        if self.prompt.type == "rag_based":
+            store = self.prompt.context_store
+            return ModelRouter(store.aembed_query, store.embed_documents, fallback_model=_FALLBACK_MODEL)
+        return ModelRouter(fallback_model=_FALLBACK_MODEL)
+
+    def _build_guard(self) -> LocalGuard | None:
+        """Build the local guard on the context's embedding model, as configured by GUARD_ENABLED."""
+        mode = guard_mode()
+        if mode == "false":
+            return None
         if self.prompt.type == "rag_based":
-            options["tools"] = self.prompt.context_store.create_tools()
-        return options
+            store = self.prompt.context_store
+            return LocalGuard(store.aembed_query, store.embed_documents)
+        return LocalGuard.with_default_embedder() if mode == "true" else None
+
+    @property
+    def hedge_policy(self) -> HedgePolicy:
+        """Get the hedging policy and its counters.
+
+        :return: The hedge policy
+        :rtype: HedgePolicy
+        """
+        return self._hedge
+
+    @property
+    def history_policy(self) -> HistoryPolicy:
+        """Get the conversation history policy and its token counters.
+
+        :return: The history policy
+        :rtype: HistoryPolicy
+        """
+        return self._history
+
+    def _base_agent_options(self) -> dict:
+        """Build shared agent options (name, instructions, tools) once for both agents."""
+        if self._agent_options is None:
+            options = {
+                "name": "heralder",
+                "instructions": self.prompt.get_system_instructions(),
+            }
+            if self.prompt.type == "rag_based":
+                options["tools"] = self.prompt.context_store.create_tools()
+            self._agent_options = options
+        return self._agent_options
 
     def herald_agent(self):
-        """Primary heralder agent backed by Groq."""
-        return Agent(**self._base_agent_options(), model=_build_groq_model())
+        """Primary heralder agent backed by the large Groq model."""
+        if self._agent is None:
+            self._agent = Agent(**self._base_agent_options(), model=_build_groq_model(self._models[LARGE]))
+        return self._agent
+
+    def _tier_agent(self, tier: str):
+        """Heralder agent of a model tier; the fast agent shares the large agent's instructions and tools."""
+        if tier == LARGE:
+            return self.herald_agent()
+        if self._fast_agent is None:
+            self._fast_agent = Agent(**self._base_agent_options(), model=_build_groq_model(self._models[FAST]))
+        return self._fast_agent
+
+    def _fallback_agent(self) -> Agent | None:
+        """Fallback heralder agent backed by OpenAI (gpt-5-nano), or None if it cannot be built.
+
+        Without a fallback agent, the primary agent answers every question, even while its circuit is open.
+        A model that cannot be built is not tried again, so the warning is logged once per app.
+        """
+        if self._fallback is None and not self._fallback_unavailable:
+            try:
+                model = _build_fallback_model()
+            except OpenAIError as exc:
+                logger.warning("No fallback model (%s) — answering with Groq only", exc)
+                self._fallback_unavailable = True
+                return None
+            self._fallback = Agent(**self._base_agent_options(), model=model)
+        return self._fallback
+
+    def _summarizer_agent(self):
+        """Agent folding conversation turns into a rolling summary, backed by Groq."""
+        if self._summarizer is None:
+            self._summarizer = Agent(
+                name="history-summarizer", instructions=_SUMMARY_INSTRUCTIONS,
+                model=_build_groq_model(self._models[LARGE]),
+            )
+        return self._summarizer
 
-    def _fallback_agent(self):
-        """Fallback heralder agent backed by OpenAI (gpt-5-nano)."""
-        return Agent(**self._base_agent_options(), model=_FALLBACK_MODEL)
+    def _run_config(self, session: SQLiteSession, turn: PreRetrievedTurn = None) -> RunConfig | None:
+        """Run configuration applying the history policy and the pre-retrieved chunks to every model call of a run."""
+        history = self._history.input_filter(session.session_id) if self._history.enabled else None
+        if history is None and turn is None:
+            return None
 
-    async def run(self, message: str, session: SQLiteSession):
+        def _filter(data) -> ModelInputData:
+            model_data = history(data) if history is not None else data.model_data
+            return turn.apply(model_data) if turn is not None else model_data
+        return RunConfig(call_model_input_filter=_filter)
+
+    async def _summarize_history(self, previous: str, transcript: str) -> str | None:
+        """Fold transcript lines into the previous summary. Skipped while Groq's circuit is open."""
+        if not circuit_breaker("groq").allow_request():
+            return None
+        prompt = f"Previous summary:\n{previous or '(none)'}\n\nNew turns:\n{transcript}"
+        result = await self._tracked("groq", Runner.run(self._summarizer_agent(), prompt))
+        return result.final_output
+
+    async def run(self, message: str, session: SQLiteSession, usage: TokenUsage = None):
         """
         Run query on the CV provided, maintaining conversation history via the given session.
-        Falls back to OpenAI gpt-5-nano if the Groq call fails.
+        Falls back to OpenAI gpt-5-nano if the Groq call fails or Groq's circuit is open, and races it
+        against a slow Groq call when hedging is enabled.
 
         :param message: Message provided by the user
         :param session: Per-user SQLiteSession that stores conversation history
+        :param usage: Collects the tokens the answer cost, per model, optional. Answers shared with a
+            run already in flight and cancelled hedge runs add nothing.
         """
         print(f"Session ID: {session.session_id}")
+        refusal = await self._screen(message, session)
+        if refusal is not None:
+            yield refusal
+            return
+        first_turn = await self._first_turn(session)
+        opening = await self._opening_question(message, session) if first_turn else None
+        if opening and opening["answer"] is not None:
+            yield opening["answer"]
+            return
+        if first_turn and self._singleflight is not None:
+            answer, items = await self._coalesced_answer(message, opening, usage)
+            await session.add_items(items)
+        else:
+            answer = await self._answer(message, session, opening, usage)
+        yield answer
+
+    async def _answer(self, message: str, session: SQLiteSession, opening: dict | None, usage: TokenUsage = None):
+        """Answer the message with an agent run and do the bookkeeping of a finished run.
+
+        :param message: Message provided by the user
+        :param session: Session the run reads its history from and writes its turn to
+        :param opening: Answer cache lookup of an opening question, or None
+        :param usage: Collects the tokens of the run, optional
+        :return: The agent's answer
+        """
+        turn = await self._pre_retrieve(message)
+        decision = await self._route(message, turn)
+        tier = decision.tier if decision else LARGE
+        if self._hedge.enabled:
+            result = await self._run_hedged(message, session, turn, tier)
+        else:
+            result = await self._run_with_fallback(message, session, turn, tier)
+        self._record_turn(turn, result)
+        self._account(usage, result, decision)
+        self._cache_answer(opening, message, result.final_output)
+        self._history.schedule_summary(session, self._summarize_history)
+        return result.final_output
+
+    async def _coalesced_answer(self, message: str, opening: dict | None, usage: TokenUsage = None) -> tuple:
+        """Answer an opening question with the run in flight for the same question, or start that run.
+
+        The shared run works on a scratch session, so its turn can be appended to every caller's session.
+
+        :param message: Message provided by the user
+        :param opening: Answer cache lookup of the question, or None
+        :param usage: Collects the tokens of the run if this caller starts it, optional
+        :return: Tuple of (answer, session items of the turn with the caller's own message)
+        :rtype: tuple
+        """
+        if self._cv_version is None:
+            self._cv_version = hashlib.sha256(str(self.prompt.cv_md_content).encode("utf-8")).hexdigest()
+
+        async def shared_run() -> tuple:
+            scratch = SQLiteSession(f"opening-{uuid.uuid4().hex}")
+            try:
+                answer = await self._answer(message, scratch, opening, usage)
+                return answer, await scratch.get_items()
+            finally:
+                scratch.close()
+
+        (answer, items), shared = await self._singleflight.do((self._cv_version, normalize_message(message)),
+                                                             shared_run)
+        if shared:
+            logger.info("Opening question answered by a run already in flight: %r", message)
+        return answer, [{"role": "user", "content": message}] + items[1:]
+
+    @staticmethod
+    async def _tracked(provider: str, call):
+        """Await a model call and report its outcome to the provider's circuit breaker."""
+        with circuit_breaker(provider).track(_PROVIDER_ERRORS):
+            return await call
+
+    async def _run_with_fallback(
+        self, message: str, session: SQLiteSession, turn: PreRetrievedTurn = None, tier: str = LARGE
+    ):
+        """Run the primary agent unless its circuit is open, and the fallback agent if it fails.
+
+        :param message: Message provided by the user
+        :param session: Per-user SQLiteSession that stores conversation history
+        :param turn: Chunks pre-retrieved for the message, optional
+        :param tier: Model tier the question was routed to, optional. Defaults to the large model.
+        :return: Result of the run that answered
+        :rtype: RunResult
+        """
+        run_config = self._run_config(session, turn)
+        fallback = self._fallback_agent()
+        if fallback is None or circuit_breaker("groq").allow_request():
+            try:
+                return await self._tracked(
+                    "groq", Runner.run(self._tier_agent(tier), message, session=session, run_config=run_config)
+                )
+            except _PROVIDER_ERRORS as exc:
+                if fallback is None:
+                    raise
+                logger.warning("Groq call failed (%s) — falling back to OpenAI", exc)
+        else:
+            logger.info("Groq circuit is open — answering with OpenAI")
+        return await self._tracked("openai", Runner.run(fallback, message, session=session, run_config=run_config))
+
+    async def _run_hedged(  # pylint: disable=too-many-locals
+        self, message: str, session: SQLiteSession, turn: PreRetrievedTurn = None, tier: str = LARGE
+    ):
+        """Run the primary agent and hedge with the fallback agent once it exceeds the hedge delay.
+
+        Both agents run on a copy of the session history rather than the session itself, so two
+        parallel runs cannot interleave their items; only the winner's turn is written back.
+
+        :param message: Message provided by the user
+        :param session: Per-user SQLiteSession that stores conversation history
+        :param turn: Chunks pre-retrieved for the message, optional
+        :param tier: Model tier the question was routed to, optional. Defaults to the large model.
+            Each tier has its own latency window, so fast runs do not shorten the large model's hedge delay.
+        :return: Result of the winning run
+        :rtype: RunResult
+        """
+        # built before the race: a fallback that cannot be built must not cancel a healthy primary
+        fallback = self._fallback_agent()
+        if fallback is None:
+            return await self._run_with_fallback(message, session, turn, tier)
+        history = await session.get_items()
+        run_input = history + [{"role": "user", "content": message}]
+        run_config = self._run_config(session, turn)
+
+        def run_on(provider: str, runner_agent: Agent):
+            return self._tracked(provider, Runner.run(runner_agent, run_input, run_config=run_config))
+
+        if not circuit_breaker("groq").allow_request():
+            logger.info("Groq circuit is open — answering with OpenAI")
+            result = await run_on("openai", fallback)
+            await session.add_items(result.to_input_list()[len(history):])
+            return result
+        delay = self._hedge.delay(tier)
+        latency = self._hedge.latency(tier)
+        started = time.perf_counter()
+        primary = asyncio.create_task(run_on("groq", self._tier_agent(tier)))
+        tasks = [primary]
+        try:
+            await asyncio.wait(tasks, timeout=delay)
+            if primary.done():
+                try:
+                    result = primary.result()
+                except _PROVIDER_ERRORS as exc:
+                    logger.warning("Groq call failed (%s) — falling back to OpenAI", exc)
+                    result = await run_on("openai", fallback)
+                else:
+                    latency.record(time.perf_counter() - started)
+            else:
+                logger.info("Groq call still running after %.2fs — hedging with OpenAI", delay)
+                self._hedge.hedged += 1
+                tasks.append(asyncio.create_task(run_on("openai", fallback)))
+                winner = await first_successful(tasks)
+                if winner is primary:
+                    latency.record(time.perf_counter() - started)
+                else:
+                    self._hedge.fallback_wins += 1
+                    if primary.cancelled() or not primary.done():
+                        # a lower bound of the primary's latency keeps a slow primary from shrinking the percentile
+                        latency.record(time.perf_counter() - started)
+                result = winner.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+        await session.add_items(result.to_input_list()[len(history):])
+        return result
+
+    async def run_stream(self, message: str, session: SQLiteSession, usage: TokenUsage = None):
+        """
+        Stream the answer to a query as it is generated, maintaining conversation history via the given session.
+        Falls back to OpenAI gpt-5-nano if the Groq call fails before anything was streamed, or
+        while Groq's circuit is open.
+
+        Yields event dicts:
+            ``{"type": "token", "delta": str}`` for every text delta of the answer,
+            ``{"type": "tool_call", "name": str}`` when the agent calls a retrieval tool,
+            ``{"type": "tool_output", "name": str}`` when that tool returns,
+            ``{"type": "done", "response": str}`` once with the final answer; a guard refusal adds
+            ``"refusal": category``.
+
+        :param message: Message provided by the user
+        :param session: Per-user SQLiteSession that stores conversation history
+        :param usage: Collects the tokens the answer cost, per model, optional
+        """
+        refusal = await self._screen(message, session)
+        if refusal is not None:
+            yield {"type": "token", "delta": refusal}
+            yield {"type": "done", "response": refusal, "refusal": refusal.category}
+            return
+        opening = await self._opening_question(message, session) if await self._first_turn(session) else None
+        if opening and opening["answer"] is not None:
+            yield {"type": "token", "delta": opening["answer"]}
+            yield {"type": "done", "response": opening["answer"]}
+            return
+        turn = await self._pre_retrieve(message)
+        decision = await self._route(message, turn)
+        agent = self._tier_agent(decision.tier if decision else LARGE)
+        run_config = self._run_config(session, turn)
+        fallback = self._fallback_agent()
+        if fallback is None or circuit_breaker("groq").allow_request():
+            streamed = False
+            try:
+                with circuit_breaker("groq").track(_PROVIDER_ERRORS):
+                    async for event in self._stream_agent(agent, message, session, run_config, usage, decision, turn):
+                        streamed = True
+                        self._after_streamed_event(opening, message, session, event)
+                        yield event
+                return
+            except _PROVIDER_ERRORS as exc:
+                # once the visitor saw part of the answer, a second answer would contradict it
+                if streamed or fallback is None:
+                    raise
+                logger.warning("Groq call failed (%s) — falling back to OpenAI", exc)
+        else:
+            logger.info("Groq circuit is open — answering with OpenAI")
+        with circuit_breaker("openai").track(_PROVIDER_ERRORS):
+            async for event in self._stream_agent(fallback, message, session, run_config, usage, decision, turn):
+                self._after_streamed_event(opening, message, session, event)
+                yield event
+
+    async def _screen(self, message: str, session: SQLiteSession) -> Refusal | None:
+        """Refuse off-topic questions and manipulation attempts locally.
+
+        A refusal is recorded in the session like an agent answer. The guard fails open: if the
+        message cannot be classified, the agent answers it.
+
+        :param message: Message provided by the user
+        :param session: Per-user SQLiteSession that stores conversation history
+        :return: The canned refusal, or None if the agent should answer
+        :rtype: Refusal | None
+        """
+        if self._guard is None:
+            return None
+        try:
+            refusal = (await self._guard.classify(message)).refusal
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning("Guard could not classify the message; passing it to the agent", exc_info=True)
+            return None
+        if refusal is not None:
+            await session.add_items([
+                {"role": "user", "content": message},
+                {"role": "assistant", "content": str(refusal)},
+            ])
+        return refusal
+
+    async def _first_turn(self, session: SQLiteSession) -> bool:
+        """Whether the message opens the conversation. Only looked up if an opening question optimization is on."""
+        if (self._answer_cache is None or not self._answer_cache.maxsize) and self._singleflight is None:
+            return False
+        return not await session.get_items(limit=1)
+
+    async def _opening_question(self, message: str, session: SQLiteSession) -> dict | None:
+        """Look up the answer cache for a message that opens a conversation.
+
+        A cached answer is recorded in the session as the user and assistant turn, so follow-up
+        questions see the same history as after an agent run.
+
+        :param message: Message provided by the user
+        :param session: Per-user SQLiteSession that stores conversation history
+        :return: None if the answer cache does not apply, else a mapping of the corpus "version",
+            the question "embedding" and the cached "answer" (None on a miss)
+        :rtype: dict | None
+        """
+        if self._answer_cache is None or not self._answer_cache.maxsize:
+            return None
+        store = self.prompt.context_store
+        version = store.corpus_version
+        embedding = await store.aembed_query(message)
+        answer = self._answer_cache.lookup(version, embedding)
+        if answer is not None:
+            await session.add_items([
+                {"role": "user", "content": message},
+                {"role": "assistant", "content": answer},
+            ])
+        return {"version": version, "embedding": embedding, "answer": answer}
+
+    async def _pre_retrieve(self, message: str) -> PreRetrievedTurn | None:
+        """Fetch the chunks of the message's likely CV sections for the run's first model call.
+
+        Fails soft: if pre-retrieval fails, the agent retrieves through its tools as before.
+
+        :param message: Message provided by the user
+        :return: The turn to apply to the run's model calls, or None without pre-retrieval
+        :rtype: PreRetrievedTurn | None
+        """
+        if self._preretrieval is None:
+            return None
         try:
-            result = await Runner.run(self.herald_agent(), message, session=session)
-        except (APIConnectionError, RateLimitError, APIStatusError) as exc:
-            logger.warning("Groq call failed (%s) — falling back to OpenAI", exc)
-            result = await Runner.run(self._fallback_agent(), message, session=session)
-        yield result.final_output
+            return await self._preretrieval.prepare(message)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning("Pre-retrieval failed; the agent retrieves through its tools", exc_info=True)
+            return None
+
+    def _record_turn(self, turn: PreRetrievedTurn | None, result):
+        """Count a finished run in the pre-retrieval savings report, with the model calls of the run that answered."""
+        if turn is not None:
+            turn.model_calls = len(result.raw_responses)
+            self._preretrieval.record(turn)
+
+    async def _route(self, message: str, turn: PreRetrievedTurn | None) -> RouteDecision | None:
+        """Pick the model tier answering the message, using the CV sections pre-retrieval predicted for it.
+
+        :param message: Message provided by the user
+        :param turn: Chunks pre-retrieved for the message, or None
+        :return: The routing decision, or None without routing
+        :rtype: RouteDecision | None
+        """
+        if self._router is None:
+            return None
+        return await self._router.route(message, turn.topics if turn is not None else None)
+
+    def _account(self, usage: TokenUsage | None, result, decision: RouteDecision = None):
+        """Add the token usage of a finished run to the request's usage and to its route's statistics.
+
+        Usage is tagged with the model that answered: the fallback model, or the routed Groq tier's model.
+        Fallback answers are kept out of the routed tier's statistics.
+        """
+        fallback = self._fallback is not None and result.last_agent is self._fallback
+        if decision is not None:
+            self._router.record(decision, result.context_wrapper.usage, fallback=fallback)
+        if usage is not None:
+            if fallback:
+                model = _FALLBACK_MODEL
+            else:
+                fast = self._fast_agent is not None and result.last_agent is self._fast_agent
+                model = self._models[FAST if fast else LARGE]
+            usage.add(model, result.context_wrapper.usage)
+
+    def _cache_answer(self, opening: dict | None, message: str, answer):
+        """Cache the agent's answer to an opening question."""
+        if opening is not None and isinstance(answer, str):
+            self._answer_cache.store(opening["version"], message, opening["embedding"], answer)
+
+    def _after_streamed_event(self, opening: dict | None, message: str, session: SQLiteSession, event: dict):
+        """Cache and summarize a streamed run once its done event arrives."""
+        if event["type"] == "done":
+            self._cache_answer(opening, message, event["response"])
+            self._history.schedule_summary(session, self._summarize_history)
+
+    async def _stream_agent(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self, agent: Agent, message: str, session: SQLiteSession, run_config: RunConfig = None,
+        usage: TokenUsage = None, decision: RouteDecision = None, turn: PreRetrievedTurn = None,
+    ):
+        """Run one agent with streaming and translate its stream into run_stream events."""
+        result = Runner.run_streamed(agent, message, session=session, run_config=run_config)
+        tool_names = {}  # call_id → tool name, to label tool outputs
+        async for event in result.stream_events():
+            if event.type == "raw_response_event":
+                if getattr(event.data, "type", None) == "response.output_text.delta":
+                    yield {"type": "token", "delta": event.data.delta}
+            elif event.type == "run_item_stream_event" and event.name == "tool_called":
+                raw_item = event.item.raw_item
+                name = getattr(raw_item, "name", None)
+                tool_names[getattr(raw_item, "call_id", None)] = name
+                yield {"type": "tool_call", "name": name}
+            elif event.type == "run_item_stream_event" and event.name == "tool_output":
+                raw_item = event.item.raw_item
+                call_id = raw_item.get("call_id") if isinstance(raw_item, dict) else getattr(raw_item, "call_id", None)
+                yield {"type": "tool_output", "name": tool_names.get(call_id)}
+        self._record_turn(turn, result)
+        self._account(usage, result, decision)
+        yield {"type": "done", "response": result.final_output}
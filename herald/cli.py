@@ -0,0 +1,129 @@
+"""Command line interface for Herald maintenance tasks.
+
+Usage::
+
+    herald build-snapshot [--cv CV_PDF] [--output SNAPSHOT_PATH]
+    herald cache list
+    herald cache prune [--max-age-days DAYS] [--max-entries N]
+"""
+
+import argparse
+import logging
+import os
+import time
+
+import dotenv
+
+from herald.storage.markdown_cache import MarkdownCache
+
+DEFAULT_SNAPSHOT_PATH = "herald.snapshot"
+
+
+def build_snapshot(args: argparse.Namespace) -> int:
+    """Convert, parse and embed the CV once and write the result to a knowledge snapshot.
+
+    :param argparse.Namespace args: Parsed command line arguments.
+    :return: Process exit code
+    :rtype: int
+    """
+    # Imported here so that `herald --help` does not pay for PyMuPDF and ChromaDB.
+    from herald.context_manager.rag_based import HeraldRAGContextManager  # pylint: disable=import-outside-toplevel
+
+    start = time.perf_counter()
+    context = HeraldRAGContextManager(cv_pdf_file=args.cv)
+    path = context.build_snapshot(args.output)
+    print(f"Knowledge snapshot written to {path} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def _markdown_cache() -> MarkdownCache | None:
+    """Return the markdown cache, printing a notice when disk caching is disabled."""
+    markdown_cache = MarkdownCache.from_env()
+    if markdown_cache is None:
+        print("Disk caching is disabled (HERALD_CACHE_DIR is empty).")
+    return markdown_cache
+
+
+def list_cache(_args: argparse.Namespace) -> int:
+    """Print the converted-markdown cache entries.
+
+    :param argparse.Namespace _args: Parsed command line arguments.
+    :return: Process exit code
+    :rtype: int
+    """
+    markdown_cache = _markdown_cache()
+    if markdown_cache is None:
+        return 0
+    entries = markdown_cache.entries()
+    print(f"{len(entries)} cached markdown conversion(s) in {markdown_cache.cache_dir}")
+    for entry in entries:
+        last_used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_used"]))
+        print(f"  {entry['key'][:16]}  {entry['size']:>9} bytes  pymupdf4llm {entry['converter_version']}  {last_used}")
+    return 0
+
+
+def prune_cache(args: argparse.Namespace) -> int:
+    """Remove stale converted-markdown cache entries.
+
+    :param argparse.Namespace args: Parsed command line arguments.
+    :return: Process exit code
+    :rtype: int
+    """
+    markdown_cache = _markdown_cache()
+    if markdown_cache is None:
+        return 0
+    removed = markdown_cache.prune(max_age_days=args.max_age_days, max_entries=args.max_entries)
+    print(f"Removed {removed} cached markdown conversion(s)")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the herald command.
+
+    :return: Configured argument parser
+    :rtype: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(prog="herald", description="Herald maintenance commands.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = subparsers.add_parser(
+        "build-snapshot",
+        help="Build a knowledge snapshot (markdown, chunks, embeddings) for fast server startup.",
+    )
+    snapshot_parser.add_argument(
+        "--cv", default=None,
+        help="Path to the CV PDF. Defaults to CV_PATH, then Cloudflare R2.",
+    )
+    snapshot_parser.add_argument(
+        "--output", default=None,
+        help=f"Snapshot file to write. Defaults to HERALD_SNAPSHOT_PATH, then '{DEFAULT_SNAPSHOT_PATH}'.",
+    )
+    snapshot_parser.set_defaults(handler=build_snapshot)
+
+    cache_parser = subparsers.add_parser("cache", help="Inspect or prune the converted-markdown cache.")
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command", required=True)
+    cache_subparsers.add_parser("list", help="List cached conversions.").set_defaults(handler=list_cache)
+    prune_parser = cache_subparsers.add_parser("prune", help="Remove stale cached conversions.")
+    prune_parser.add_argument("--max-age-days", type=float, default=None, help="Remove entries unused for longer.")
+    prune_parser.add_argument("--max-entries", type=int, default=None, help="Keep only the N most recent entries.")
+    prune_parser.set_defaults(handler=prune_cache)
+    return parser
+
+
+def main(argv: list = None) -> int:
+    """Entry point for the herald command.
+
+    :param list argv: Command line arguments, optional. Defaults to sys.argv.
+    :return: Process exit code
+    :rtype: int
+    """
+    dotenv.load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args(argv)
+    if getattr(args, "output", "unset") is None:
+        args.output = os.getenv("HERALD_SNAPSHOT_PATH") or DEFAULT_SNAPSHOT_PATH
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+"""Construction of Herald contexts from the environment.
+
+Shared by the server lifespan, the terminal / browser entry point and the CV watcher, so a
+reindexed context is always built exactly like the one it replaces.
+
+Context implementations are imported on demand, so the basic prompt never loads ChromaDB.
+"""
+
+import os
+
+from herald.context_manager.icontext import ContextInterface
+from herald.storage.snapshot import load_snapshot_from_env
+
+PROMPT_OPTIONS = ("basic", "rag")
+
+
+def build_context(
+    prompt_option: str = "rag",
+    cv_pdf_file: str = None,
+    previous: ContextInterface = None,
+    snapshot_path: str = None,
+    persona_name: str = None,
+):
+    """Build the context for a prompt option.
+
+    A prebuilt snapshot (HERALD_SNAPSHOT_PATH) skips PDF conversion, parsing and embedding entirely.
+
+    :param str prompt_option: "basic" for the full-CV prompt or "rag" for tool based retrieval.
+    :param str cv_pdf_file: The CV PDF file path, optional. Defaults to CV_PATH, then Cloudflare R2.
+    :param ContextInterface previous: Context being replaced by a reindex, optional.
+        Its chunk embeddings are reused for every chunk that did not change.
+    :param str snapshot_path: Knowledge snapshot to load, optional. Defaults to HERALD_SNAPSHOT_PATH,
+        unless an explicit ``cv_pdf_file`` is given.
+    :param str persona_name: Name of the person the CV belongs to, optional. Defaults to the ME env variable.
+    :raises ValueError: If the prompt option is not supported.
+    :return: The built context
+    :rtype: ContextInterface
+    """
+    if prompt_option not in PROMPT_OPTIONS:
+        raise ValueError(f"Unsupported PROMPT_OPTION: {prompt_option}. Supported options are 'basic' and 'rag'.")
+
+    # pylint: disable=import-outside-toplevel
+    snapshot = load_snapshot_from_env(snapshot_path) if snapshot_path or cv_pdf_file is None else None
+    if prompt_option == "basic":
+        from herald.context_manager.prompt_based import HeraldBasicPrompter
+
+        return HeraldBasicPrompter(cv_pdf_file=cv_pdf_file, snapshot=snapshot, persona_name=persona_name)
+
+    from herald.context_manager.rag_based import HeraldRAGContextManager
+
+    previous_store = previous.context_store if previous is not None and previous.type == "rag_based" else None
+    return HeraldRAGContextManager(
+        cv_pdf_file=cv_pdf_file, snapshot=snapshot, previous_store=previous_store, persona_name=persona_name,
+    )
+
+
+def context_fingerprint(cv_pdf_file: str = None) -> str:
+    """Return a fingerprint of whatever the context is built from.
+
+    With a snapshot configured that is the snapshot file; otherwise it is the CV source.
+
+    :param str cv_pdf_file: The CV PDF file path, optional.
+    :return: Fingerprint that changes whenever the context needs rebuilding
+    :rtype: str
+    """
+    snapshot_path = os.getenv("HERALD_SNAPSHOT_PATH")
+    if snapshot_path and os.path.exists(snapshot_path):
+        stat = os.stat(snapshot_path)
+        return f"snapshot:{snapshot_path}:{stat.st_mtime_ns}:{stat.st_size}"
+    return ContextInterface.cv_fingerprint(cv_pdf_file)
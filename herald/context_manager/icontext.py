@@ -2,22 +2,39 @@
 
 import os
 import abc
-import fitz  # PyMuPDF
-import pymupdf4llm
 
-from herald.storage.r2 import download_cv_bytes
+from herald.storage.markdown_cache import MarkdownCache, pdf_sha256
+
+
+# PyMuPDF, pymupdf4llm and boto3 are imported on first use: a server started from a knowledge
+# snapshot never converts a PDF, and a local CV never touches R2.
+
+def _to_markdown(source) -> str:
+    """Convert a PDF path or an open PyMuPDF document to markdown."""
+    import pymupdf4llm  # pylint: disable=import-outside-toplevel
+    return pymupdf4llm.to_markdown(source)
 
 
 class ContextInterface(abc.ABC):
     """Context Interface for Herald."""
 
-    def __init__(self, cv_pdf_file: str = None):
+    _persona_name = None
+
+    def __init__(self, cv_pdf_file: str = None, snapshot=None, persona_name: str = None):
         """Initialize the Context Interface.
 
         :param str cv_pdf_file: PDF file with CV content, optional
+        :param KnowledgeSnapshot snapshot: Prebuilt knowledge snapshot, optional.
+            When given, the CV markdown is taken from the snapshot and the PDF is not converted.
+        :param str persona_name: Name of the person the CV belongs to, optional. Defaults to the ME env variable.
         """
         self._cv_pdf_file = cv_pdf_file
-        self._cv_md_content = self.prepare_cv_content(cv_pdf_file)
+        self._snapshot = snapshot
+        self._persona_name = persona_name
+        if snapshot is not None:
+            self._cv_md_content = snapshot.markdown
+        else:
+            self._cv_md_content = self.prepare_cv_content(cv_pdf_file)
 
     @staticmethod
     def guardrail(name: str) -> str:
@@ -66,12 +83,66 @@ class ContextInterface(abc.ABC):
             # ── Local file mode ──────────────────────────────────────────────
             if not os.path.exists(cv_pdf_file):
                 raise ValueError(f"The CV pdf '{cv_pdf_file}' does not exist! Please provide a valid one.")
-            return pymupdf4llm.to_markdown(cv_pdf_file)
+            return ContextInterface._convert_local_pdf(cv_pdf_file)
 
         # ── Cloud mode: download from Cloudflare R2 ──────────────────────────
-        pdf_bytes = download_cv_bytes()
+        # The object is synced into the local cache (ETag revalidated) and converted from there
+        from herald.storage import r2  # pylint: disable=import-outside-toplevel
+
+        cached_pdf_file = r2.download_cv_file()
+        if cached_pdf_file is not None:
+            return ContextInterface._convert_local_pdf(cached_pdf_file)
+
+        import fitz  # PyMuPDF  # pylint: disable=import-outside-toplevel
+
+        pdf_bytes = r2.download_cv_bytes()
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        return pymupdf4llm.to_markdown(doc)
+        return _to_markdown(doc)
+
+    @staticmethod
+    def cv_fingerprint(cv_pdf_file: str = None) -> str:
+        """Return a cheap fingerprint of the CV source that changes whenever the CV changes.
+
+        Follows the same resolution order as :meth:`prepare_cv_content`: a local file is
+        fingerprinted by its modification time and size, an R2 object by its ETag (one HEAD request).
+
+        :param str cv_pdf_file: Path to a local PDF file, optional.
+        :return: Fingerprint of the CV source
+        :rtype: str
+        """
+        if cv_pdf_file is None:
+            cv_pdf_file = os.getenv("CV_PATH")
+
+        if cv_pdf_file is not None:
+            stat = os.stat(cv_pdf_file)
+            return f"file:{cv_pdf_file}:{stat.st_mtime_ns}:{stat.st_size}"
+        from herald.storage import r2  # pylint: disable=import-outside-toplevel
+
+        return f"r2:{r2.head_cv_etag()}"
+
+    def close(self):
+        """Release resources held by the context, e.g. after it was replaced by a reindexed one."""
+
+    @staticmethod
+    def _convert_local_pdf(cv_pdf_file: str) -> str:
+        """Convert a local PDF to markdown, reusing a cached conversion of identical PDF bytes.
+
+        :param str cv_pdf_file: Path to a local PDF file.
+        :return: CV content in markdown format.
+        :rtype: str
+        """
+        # Converted markdown is cached on disk by PDF hash — conversion only runs when the PDF changes
+        markdown_cache = MarkdownCache.from_env()
+        if markdown_cache is None:
+            return _to_markdown(cv_pdf_file)
+
+        with open(cv_pdf_file, "rb") as pdf_file:
+            cache_key = pdf_sha256(pdf_file.read())
+        markdown = markdown_cache.get(cache_key)
+        if markdown is None:
+            markdown = _to_markdown(cv_pdf_file)
+            markdown_cache.put(cache_key, markdown)
+        return markdown
 
     def basic_system_instructions(self) -> str:
         """Basic system instructions for the Agent.
@@ -82,8 +153,7 @@ class ContextInterface(abc.ABC):
         :return: Basic system instructions for the Agent
         :rtype: str
         """
-        # Get the name of the person from env variable, if not set then use a default name
-        name = os.getenv("ME", "The Candidate")
+        name = self.persona_name
         # pylint: disable=line-too-long
         return f"""You are a helpful assistant that answers questions about {name}'s professional background and qualifications.
 
@@ -162,6 +232,16 @@ class ContextInterface(abc.ABC):
         :rtype: str
         """
 
+    @property
+    def persona_name(self) -> str:
+        """Get the name of the person the CV belongs to.
+
+        :return: The persona name given at construction, else the ME env variable, else "The Candidate"
+        :rtype: str
+        """
+        # Get the name of the person from env variable, if not set then use a default name
+        return self._persona_name or os.getenv("ME", "The Candidate")
+
     @property
     def cv_md_content(self) -> str:
         """Get the CV content in markdown format.
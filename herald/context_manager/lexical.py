@@ -0,0 +1,152 @@
+"""BM25 lexical index over the normalized CV chunks.
+
+Visitor questions often name exact tokens — a company, a technology, a degree title. For those
+an inverted index answers faster than the embedding model and at least as precisely. The index
+is built as documents are written to the vector store; a query is scored by walking the postings
+of its terms only.
+
+A search also reports whether the lexical ranking is confident enough to be served on its own:
+the best chunk must contain every query term the index knows, at least one of those terms must
+be selective, and the best score must clearly beat the runner-up. Otherwise the caller fuses
+the lexical ranking with the vector ranking.
+
+Environment variables:
+    LEXICAL_CONFIDENCE_MARGIN - Minimum ratio of best to runner-up BM25 score for a confident
+                                lexical answer (default: 1.5).
+"""
+
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+DEFAULT_CONFIDENCE_MARGIN = 1.5
+BM25_K1 = 1.2
+BM25_B = 0.75
+# A term is selective when at most this share of the chunks contains it.
+SELECTIVE_DOCUMENT_FREQUENCY = 0.5
+
+# Keeps tokens such as "c++", "c#", "node.js" and ".net" intact.
+_TOKEN_PATTERN = re.compile(r"[a-z0-9.+#][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from has have how i in is it me my of on or "
+    "the their there to was were what when where which who why with you your".split()
+)
+
+
+def tokenize(text: str) -> list:
+    """Split text into lowercase lexical terms, dropping stopwords.
+
+    :param str text: Text to tokenize.
+    :return: Terms in text order
+    :rtype: list
+    """
+    return [
+        term for term in (token.rstrip(".") for token in _TOKEN_PATTERN.findall(text.lower()))
+        if any(char.isalnum() for char in term) and term not in _STOPWORDS
+    ]
+
+
+@dataclass
+class LexicalResult:
+    """Ranked documents of one lexical search."""
+
+    documents: list = field(default_factory=list)
+    confident: bool = False
+
+
+class BM25Index:  # pylint: disable=too-many-instance-attributes
+    """Inverted index with Okapi BM25 scoring."""
+
+    def __init__(self, confidence_margin: float = None):
+        """Initialize an empty index.
+
+        :param float confidence_margin: Minimum best / runner-up score ratio of a confident answer, optional.
+            Defaults to LEXICAL_CONFIDENCE_MARGIN (1.5).
+        """
+        if confidence_margin is None:
+            confidence_margin = float(os.getenv("LEXICAL_CONFIDENCE_MARGIN", str(DEFAULT_CONFIDENCE_MARGIN)))
+        self.confidence_margin = confidence_margin
+        self._documents = []
+        self._topics = []
+        self._lengths = []
+        self._postings = defaultdict(list)  # term → [(document position, term frequency)]
+        self._idf = {}
+        self._average_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, documents: list, topics: list):
+        """Index documents.
+
+        :param list documents: Normalized chunk documents.
+        :param list topics: Topic of each document.
+        """
+        for document, topic in zip(documents, topics):
+            position = len(self._documents)
+            terms = Counter(tokenize(document))
+            for term, frequency in terms.items():
+                self._postings[term].append((position, frequency))
+            self._documents.append(document)
+            self._topics.append(topic)
+            self._lengths.append(sum(terms.values()))
+
+        count = len(self._documents)
+        self._average_length = sum(self._lengths) / count if count else 0.0
+        self._idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def search(self, query: str, topic: str = None) -> LexicalResult:
+        """Rank the documents matching any query term by BM25 score.
+
+        :param str query: The query string.
+        :param str topic: Restrict the search to one topic, optional.
+        :return: Matching documents by decreasing score, and whether the ranking is confident
+        :rtype: LexicalResult
+        """
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        known_terms = [term for term in query_terms if term in self._postings]
+        if not known_terms:
+            return LexicalResult()
+
+        scores, matched_terms = self._score(known_terms, topic)
+        if not scores:
+            return LexicalResult()
+
+        ranking = sorted(scores, key=lambda position: (-scores[position], position))
+        best = ranking[0]
+        runner_up = scores[ranking[1]] if len(ranking) > 1 else 0.0
+        selective = any(
+            len(self._postings[term]) <= SELECTIVE_DOCUMENT_FREQUENCY * len(self._documents) for term in known_terms
+        )
+        confident = (
+            2 * len(known_terms) >= len(query_terms)  # the index knows most of the query
+            and matched_terms[best] == len(known_terms)
+            and selective
+            and scores[best] >= self.confidence_margin * runner_up
+        )
+        return LexicalResult([self._documents[position] for position in ranking], confident)
+
+    def _score(self, terms: list, topic: str = None) -> tuple:
+        """Accumulate BM25 scores over the postings of the given terms.
+
+        :param list terms: Query terms present in the index.
+        :param str topic: Restrict scoring to one topic, optional.
+        :return: Tuple of (document position → score, document position → number of matched terms)
+        :rtype: tuple
+        """
+        scores = defaultdict(float)
+        matched_terms = defaultdict(int)
+        for term in terms:
+            idf = self._idf[term]
+            for position, frequency in self._postings[term]:
+                if topic is not None and self._topics[position] != topic:
+                    continue
+                length_norm = 1 - BM25_B + BM25_B * self._lengths[position] / self._average_length
+                scores[position] += idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * length_norm)
+                matched_terms[position] += 1
+        return scores, matched_terms
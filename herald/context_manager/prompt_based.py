@@ -6,12 +6,14 @@ from herald.context_manager.icontext import ContextInterface
 class HeraldBasicPrompter(ContextInterface):
     """Herald Prompt options."""
 
-    def __init__(self, cv_pdf_file: str = None):
+    def __init__(self, cv_pdf_file: str = None, snapshot=None, persona_name: str = None):
         """Initialize the Herald Prompt options.
 
         :param str cv_pdf_file: PDF file with CV content, optional
+        :param KnowledgeSnapshot snapshot: Prebuilt knowledge snapshot, optional
+        :param str persona_name: Name of the person the CV belongs to, optional. Defaults to the ME env variable.
         """
-        super().__init__(cv_pdf_file=cv_pdf_file)
+        super().__init__(cv_pdf_file=cv_pdf_file, snapshot=snapshot, persona_name=persona_name)
 
     @property
     def type(self) -> str:
@@ -0,0 +1,132 @@
+"""In-memory caches on the retrieval request path.
+
+Every retrieval tool call embeds its query before searching the index. Visitors — and the
+system prompt, which steers the model toward a handful of canned queries — repeat the same
+query strings, so two bounded LRU caches sit in front of the embedding model and the index:
+
+- ``QueryEmbeddingCache``: query text to embedding vector. Only depends on the embedding model.
+- ``RetrievalCache``: retrieval arguments to result documents. Keys include the corpus version,
+  so entries of a replaced index can never be served; they simply age out by TTL or LRU order.
+
+Environment variables:
+    QUERY_EMBEDDING_CACHE_SIZE - Maximum cached query embeddings (default: 256, 0 disables).
+    RETRIEVAL_CACHE_SIZE       - Maximum cached retrieval results (default: 1024, 0 disables).
+    RETRIEVAL_CACHE_TTL        - Seconds a retrieval result stays valid (default: 600, 0 never expires).
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_QUERY_EMBEDDING_CACHE_SIZE = 256
+DEFAULT_RETRIEVAL_CACHE_SIZE = 1024
+DEFAULT_RETRIEVAL_CACHE_TTL = 600.0
+
+
+class LRUCache:
+    """Thread-safe LRU cache with optional per-entry TTL and hit / miss counters."""
+
+    def __init__(self, maxsize: int, ttl: float = None):
+        """Initialize the cache.
+
+        :param int maxsize: Maximum number of entries. 0 disables caching.
+        :param float ttl: Seconds an entry stays valid, optional. None or 0 never expires entries.
+        """
+        self.maxsize = max(0, maxsize)
+        self.ttl = ttl or None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key → (value, expiry time or None)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._expired(entry)
+
+    @staticmethod
+    def _expired(entry: tuple) -> bool:
+        return entry[1] is not None and entry[1] <= time.monotonic()
+
+    def get(self, key):
+        """Return the cached value of a key and mark it most recently used.
+
+        :param key: The cache key.
+        :return: The cached value, or None on a miss or an expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Cache a value, evicting the least recently used entry when full.
+
+        :param key: The cache key.
+        :param value: The value to cache.
+        """
+        if not self.maxsize:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Report the cache size and hit / miss counters.
+
+        :return: Mapping with size, maxsize, ttl_seconds, hits, misses and hit_rate
+        :rtype: dict
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class QueryEmbeddingCache(LRUCache):
+    """LRU cache of query text to embedding vector."""
+
+    def __init__(self, maxsize: int = None):
+        """Initialize the cache.
+
+        :param int maxsize: Maximum number of cached queries, optional.
+            Defaults to QUERY_EMBEDDING_CACHE_SIZE (256). 0 disables caching.
+        """
+        if maxsize is None:
+            maxsize = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", str(DEFAULT_QUERY_EMBEDDING_CACHE_SIZE)))
+        super().__init__(maxsize)
+
+
+class RetrievalCache(LRUCache):
+    """LRU cache of retrieval results keyed by corpus version and retrieval arguments."""
+
+    def __init__(self, maxsize: int = None, ttl: float = None):
+        """Initialize the cache.
+
+        :param int maxsize: Maximum number of cached results, optional.
+            Defaults to RETRIEVAL_CACHE_SIZE (1024). 0 disables caching.
+        :param float ttl: Seconds a result stays valid, optional. Defaults to RETRIEVAL_CACHE_TTL (600).
+        """
+        if maxsize is None:
+            maxsize = int(os.getenv("RETRIEVAL_CACHE_SIZE", str(DEFAULT_RETRIEVAL_CACHE_SIZE)))
+        if ttl is None:
+            ttl = float(os.getenv("RETRIEVAL_CACHE_TTL", str(DEFAULT_RETRIEVAL_CACHE_TTL)))
+        super().__init__(maxsize, ttl)
@@ -1,31 +1,230 @@
 """RAG based context manager for Herald.
 
 This module implements a context manager that retrieves relevant information to embeddings.
+
+Environment variables:
+    RETRIEVAL_MODE        - "hybrid" (default): BM25 answers confident exact-token queries without embedding
+                            them and is fused with the vector ranking otherwise. "vector": vector search only.
+    RETRIEVAL_CONCURRENCY - Threads running embedding and index searches for the async retrieval
+                            methods, shared by every vector store in the process (default: 4).
 """
 
+import asyncio
+import hashlib
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Literal
+
 import tqdm
-import chromadb
 from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
 from agents.tool import function_tool, FunctionTool
-
-
-class CVVectorStore:
+from pydantic import BaseModel, Field
+
+from herald.context_manager.lexical import BM25Index
+from herald.context_manager.query_cache import QueryEmbeddingCache, RetrievalCache
+from herald.context_manager.vector_index import create_vector_index
+from herald.storage.embedding_cache import EmbeddingCache, content_hash, embedding_model_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_BATCH_SIZE = 32
+RETRIEVAL_MODES = ("hybrid", "vector")
+# Reciprocal rank fusion constant; 60 is the value from the original RRF paper.
+RRF_K = 60
+DEFAULT_RETRIEVAL_CONCURRENCY = 4
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def retrieval_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool for CPU-bound retrieval work, creating it on first use.
+
+    ONNX inference and NumPy matrix products release the GIL, so the pool runs them in parallel
+    while the event loop keeps serving other requests. Its size bounds retrieval CPU use across
+    all tenants, independent of asyncio's default executor.
+
+    :return: The retrieval thread pool
+    :rtype: ThreadPoolExecutor
+    """
+    global _EXECUTOR  # pylint: disable=global-statement
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                workers = int(os.getenv("RETRIEVAL_CONCURRENCY", str(DEFAULT_RETRIEVAL_CONCURRENCY)))
+                _EXECUTOR = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="herald-retrieval")
+    return _EXECUTOR
+
+
+@dataclass
+class IngestStats:
+    """Throughput metrics of one ingestion run."""
+
+    chunks: int = 0
+    batches: int = 0
+    embedded: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def cached(self) -> int:
+        """Number of chunks whose embedding was served from the embedding cache."""
+        return self.chunks - self.embedded
+
+    @property
+    def chunks_per_second(self) -> float:
+        """Ingestion throughput in chunks per second."""
+        return self.chunks / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def _reciprocal_rank_fusion(vector_ranking: list, lexical_ranking: list, top_k: int) -> list:
+    """Fuse two rankings of documents by reciprocal rank; ties keep the vector order.
+
+    :param list vector_ranking: Documents by decreasing vector similarity.
+    :param list lexical_ranking: Documents by decreasing BM25 score.
+    :param int top_k: Number of documents to return.
+    :return: The top_k documents by fused score
+    :rtype: list
+    """
+    scores = {}
+    for ranking in (vector_ranking, lexical_ranking):
+        for rank, document in enumerate(ranking):
+            scores[document] = scores.get(document, 0.0) + 1.0 / (RRF_K + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)[:top_k]
+
+
+class RetrievalRequest(BaseModel):  # pylint: disable=too-few-public-methods
+    """One query of a batched retrieval tool call."""
+    query: str = Field(description="The query string to search for relevant CV chunks.")
+    topic: Literal["Experience", "Skills", "Education", "Projects"] | None = Field(
+        default=None, description="CV section to search, or null to search the whole profile."
+    )
+    top_k: int = Field(default=3, description="The number of top relevant chunks to retrieve.")
+
+
+class CVVectorStore:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """A simple vector store implementation for storing and retrieving CV information."""
 
-    def __init__(self, cv_chunks: list):
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        cv_chunks,
+        embedding_function=None,
+        embedding_cache: EmbeddingCache = None,
+        previous_store=None,
+        index_backend: str = None,
+        query_cache: QueryEmbeddingCache = None,
+        retrieval_cache: RetrievalCache = None,
+    ):
         """Initialize the vector store.
 
-        :param list cv_chunks: The chunked CV data to be stored in the vector store.
+        :param cv_chunks: The chunked CV data to be stored in the vector store.
+            Any iterable works, e.g. a chunk generator from the parser — it is consumed by vectorize_chunks.
+        :param embedding_function: ChromaDB compatible embedding function, optional.
+            Defaults to ChromaDB's built-in ONNX embedding function.
+        :param EmbeddingCache embedding_cache: Persistent embedding cache, optional.
+            Defaults to the cache inside HERALD_CACHE_DIR (disabled when that is empty).
+        :param CVVectorStore previous_store: Store built from an earlier version of the CV, optional.
+            Chunks it already indexed are reused by content hash, so a reindex only embeds changed chunks.
+        :param str index_backend: Vector index backend, "numpy" or "chroma", optional.
+            Defaults to VECTOR_INDEX_BACKEND, then "numpy".
+        :param QueryEmbeddingCache query_cache: LRU cache of query embeddings, optional.
+            Defaults to the previous store's cache when it uses the same model, else a new cache.
+        :param RetrievalCache retrieval_cache: Cache of retrieval results, optional.
+            Defaults to the previous store's cache, else a new cache. Keys carry the corpus version,
+            so sharing it with a rebuilt index only keeps serving results for unchanged corpora.
         """
         self.__cv_chunks = cv_chunks
-        # In-memory ChromaDB collection — rebuilt on every startup.
-        # The CV is small enough that re-embedding takes only a few seconds and
-        # avoids any dependency on a persistent filesystem (required for Railway).
+        self.__documents, self.__embeddings, self.__topics = [], [], []
+        self.__ingest_stats = None
+        self.__corpus_version = None
         # Uses ChromaDB's built-in ONNX embedding function — no external API needed.
-        self.__cv_collection = chromadb.Client().create_collection(
-            name="cv_lookup",
-            embedding_function=DefaultEmbeddingFunction(),
-        )
+        self.__embedding_function = embedding_function or DefaultEmbeddingFunction()
+        # Chunk embeddings are content-addressed on disk, so an unchanged CV skips ONNX entirely on restart.
+        # The cache is optional — without a persistent filesystem every chunk is simply re-embedded.
+        if embedding_cache is None:
+            embedding_cache = EmbeddingCache.from_env(embedding_model_id(self.__embedding_function))
+        self.__embedding_cache = embedding_cache
+        self.__reusable_embeddings = previous_store.indexed_embeddings() if previous_store is not None else {}
+        # Query embeddings only depend on the model, so a reindexed CV keeps the warm cache of its predecessor.
+        if query_cache is None and previous_store is not None and previous_store.model_id == self.model_id:
+            query_cache = previous_store.query_cache
+        self.__query_cache = query_cache if query_cache is not None else QueryEmbeddingCache()
+        if retrieval_cache is None and previous_store is not None:
+            retrieval_cache = previous_store.retrieval_cache
+        self.__retrieval_cache = retrieval_cache if retrieval_cache is not None else RetrievalCache()
+        # In-memory vector index — rebuilt on every startup from the (cached) embeddings.
+        self.__index = create_vector_index(index_backend, embedding_function=self.__embedding_function)
+        retrieval_mode = os.getenv("RETRIEVAL_MODE", "hybrid").lower()
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(
+                f"Unsupported RETRIEVAL_MODE: {retrieval_mode}. Supported modes are 'hybrid' and 'vector'."
+            )
+        # Inverted index over the same documents, built as they are written to the vector index.
+        self.__lexical_index = BM25Index() if retrieval_mode == "hybrid" else None
+        # counted from the retrieval executor's threads
+        self.__retrieval_paths = dict.fromkeys(("lexical", "hybrid", "vector"), 0)
+        self.__retrieval_paths_lock = threading.Lock()
+
+    @classmethod
+    def from_snapshot(cls, snapshot, embedding_function=None):
+        """Build a vector store from a prebuilt knowledge snapshot — no chunk is embedded.
+
+        The snapshot's query embeddings are loaded into the query cache; other queries load the
+        embedding model on first use.
+
+        :param KnowledgeSnapshot snapshot: The loaded knowledge snapshot.
+        :param embedding_function: ChromaDB compatible embedding function used for queries, optional.
+        :raises ValueError: If the snapshot was built with a different embedding model.
+        :return: A ready-to-query vector store
+        :rtype: CVVectorStore
+        """
+        vector_store = cls(snapshot.chunks, embedding_function=embedding_function)
+        if snapshot.model_id != vector_store.model_id:
+            raise ValueError(
+                f"Snapshot embeddings were built with '{snapshot.model_id}' but queries use "
+                f"'{vector_store.model_id}'. Rebuild the snapshot with `herald build-snapshot`."
+            )
+        vector_store.load_index(snapshot.documents, snapshot.embeddings, snapshot.topics)
+        for query, embedding in snapshot.query_embeddings.items():
+            vector_store.query_cache.put(query, embedding)
+        return vector_store
+
+    @property
+    def cv_chunks(self) -> list:
+        """Get the chunked CV data held by the vector store.
+
+        :return: The parsed CV chunks
+        :rtype: list
+        """
+        return self.__cv_chunks
+
+    @property
+    def model_id(self) -> str:
+        """Get the identity of the embedding model used by the vector store.
+
+        :return: Embedding model identity
+        :rtype: str
+        """
+        return embedding_model_id(self.__embedding_function)
+
+    @property
+    def corpus_version(self) -> str:
+        """Get a version identifier of the indexed corpus, changing whenever any indexed document changes.
+
+        :return: Hex encoded SHA-256 over the indexed documents and topics
+        :rtype: str
+        """
+        # Memoized: it is part of every retrieval cache key. Any index write resets it.
+        if self.__corpus_version is None:
+            digest = hashlib.sha256(self.model_id.encode("utf-8"))
+            for document, topic in zip(self.__documents, self.__topics):
+                digest.update(content_hash(f"{topic}\n{document}").encode("ascii"))
+            self.__corpus_version = digest.hexdigest()
+        return self.__corpus_version
 
     def __normalize_chunk(self, chunk: dict) -> str:
         """Normalize the text for better retrieval."""
@@ -52,20 +251,232 @@ class CVVectorStore:
         # print(f"Normalized chunk:\n{norm_chunk}\n")
         return norm_chunk
 
-    def vectorize_chunks(self):
-        """Vectorize the CV chunks and store them in the vector store."""
-        for idx, chunk in enumerate(tqdm.tqdm(self.__cv_chunks, desc="Vectorizing CV chunks", colour="green")):
-            # normalize the chunk text
-            normalized_text = self.__normalize_chunk(chunk)
+    def __embed_documents(self, texts: list) -> tuple:
+        """Embed normalized chunk texts, serving unchanged chunks from the embedding cache.
 
+        :param list texts: Normalized chunk texts.
+        :return: Tuple of (one embedding vector per text in input order, number of texts actually embedded)
+        :rtype: tuple
+        """
+        model_id = self.model_id
+        cached = {
+            text: self.__reusable_embeddings[key] for text in texts
+            if (key := content_hash(text, model_id)) in self.__reusable_embeddings
+        }
+        if self.__embedding_cache:
+            cached.update(self.__embedding_cache.get_many([text for text in texts if text not in cached]))
+        missing = list(dict.fromkeys(text for text in texts if text not in cached))
+        if missing:
+            fresh = {
+                text: [float(value) for value in vector]
+                for text, vector in zip(missing, self.__embedding_function(missing))
+            }
+            if self.__embedding_cache:
+                self.__embedding_cache.put_many(fresh)
+            cached.update(fresh)
+        return [cached[text] for text in texts], len(missing)
+
+    def vectorize_chunks(self, chunks=None, batch_size: int = None) -> IngestStats:
+        """Vectorize the CV chunks and store them in the vector store.
+
+        Chunks are consumed lazily, normalized, embedded and upserted one batch at a time, so a
+        generator straight from the parser is never materialized up front and each batch costs a
+        single embedding call and a single index write.
+
+        :param chunks: Iterable of chunks to index, optional. Defaults to the chunks given at construction,
+            which replace anything indexed before, so running it again does not duplicate chunks.
+            Passing new chunks appends them to the index, e.g. for a second document.
+        :param int batch_size: Number of chunks per embedding call and upsert, optional.
+            Defaults to EMBEDDING_BATCH_SIZE (32).
+        :return: Throughput metrics for this ingestion run
+        :rtype: IngestStats
+        """
+        batch_size = batch_size or int(os.getenv("EMBEDDING_BATCH_SIZE", str(DEFAULT_EMBEDDING_BATCH_SIZE)))
+        appending = chunks is not None
+        source = chunks if appending else self.__cv_chunks
+        if not appending and self.__documents:
+            self.__reset_index()
+        consumed = []
+        stats = IngestStats()
+        start = time.perf_counter()
+
+        batches = tqdm.tqdm(itertools.batched(source, batch_size), desc="Vectorizing CV chunks", colour="green")
+        for batch in batches:
+            consumed.extend(batch)
             # TODO: clean the text if needed (e.g., remove extra whitespace, special characters, etc.)
-            # ChromaDB's DefaultEmbeddingFunction handles embedding locally via ONNX — no external API needed.
-            self.__cv_collection.add(
-                documents=[normalized_text],
-                ids=[f"chunk_{idx}"],
-                metadatas=[{"topic": chunk.get("topic", "Misc")}],
+            normalized_texts = [self.__normalize_chunk(chunk) for chunk in batch]
+            embeddings, embedded = self.__embed_documents(normalized_texts)
+            topics = [chunk.get("topic", "Misc") for chunk in batch]
+            self.__upsert_batch(normalized_texts, embeddings, topics)
+            stats.chunks += len(batch)
+            stats.batches += 1
+            stats.embedded += embedded
+
+        self.__cv_chunks = self.__cv_chunks + consumed if appending else consumed
+        stats.elapsed_seconds = time.perf_counter() - start
+        self.__ingest_stats = stats
+        logger.info(
+            "Indexed %d chunk(s) in %d batch(es): %d embedded, %d from cache, %.1f chunks/s",
+            stats.chunks, stats.batches, stats.embedded, stats.cached, stats.chunks_per_second,
+        )
+        return stats
+
+    def __reset_index(self):
+        """Empty the indexes before a full re-ingest; the dropped embeddings are reused by content hash."""
+        self.__reusable_embeddings = {**self.__reusable_embeddings, **self.indexed_embeddings()}
+        backend = self.__index.backend
+        self.__index.close()
+        self.__index = create_vector_index(backend, embedding_function=self.__embedding_function)
+        if self.__lexical_index is not None:
+            self.__lexical_index = BM25Index()
+        self.__documents, self.__embeddings, self.__topics = [], [], []
+        self.__corpus_version = None
+
+    def load_index(self, documents: list, embeddings, topics: list, batch_size: int = None):
+        """Load precomputed documents and embeddings into the vector store without embedding anything.
+
+        :param list documents: Normalized chunk documents.
+        :param embeddings: One embedding vector per document (list of lists or a 2-D array).
+        :param list topics: Topic of each document.
+        :param int batch_size: Number of documents per upsert, optional. Defaults to EMBEDDING_BATCH_SIZE (32).
+        """
+        batch_size = batch_size or int(os.getenv("EMBEDDING_BATCH_SIZE", str(DEFAULT_EMBEDDING_BATCH_SIZE)))
+        for offset in range(0, len(documents), batch_size):
+            self.__upsert_batch(
+                list(documents[offset:offset + batch_size]),
+                embeddings[offset:offset + batch_size],
+                list(topics[offset:offset + batch_size]),
             )
 
+    def export_index(self) -> tuple:
+        """Return the indexed documents, embeddings and topics, e.g. for writing a snapshot.
+
+        :return: Tuple of (documents, embeddings, topics)
+        :rtype: tuple
+        """
+        return self.__documents, self.__embeddings, self.__topics
+
+    def indexed_embeddings(self) -> dict:
+        """Return the indexed embeddings keyed by content hash, e.g. to seed the store of a reindexed CV.
+
+        :return: Mapping of content hash (model identity + normalized text) to embedding vector
+        :rtype: dict
+        """
+        model_id = self.model_id
+        return {
+            content_hash(document, model_id): embedding
+            for document, embedding in zip(self.__documents, self.__embeddings)
+        }
+
+    @property
+    def index_backend(self) -> str:
+        """Get the name of the vector index backend.
+
+        :return: "numpy" or "chroma"
+        :rtype: str
+        """
+        return self.__index.backend
+
+    @property
+    def query_cache(self) -> QueryEmbeddingCache:
+        """Get the LRU cache of query embeddings shared by all retrieval tools.
+
+        :return: The query embedding cache
+        :rtype: QueryEmbeddingCache
+        """
+        return self.__query_cache
+
+    @property
+    def retrieval_cache(self) -> RetrievalCache:
+        """Get the cache of retrieval results keyed by corpus version and retrieval arguments.
+
+        :return: The retrieval result cache
+        :rtype: RetrievalCache
+        """
+        return self.__retrieval_cache
+
+    def warm_query_cache(self, queries) -> int:
+        """Embed queries ahead of the first request so their tool calls skip the embedding model.
+
+        Queries are embedded in one batch, and through the persistent embedding cache when enabled,
+        so a restart with an unchanged model does not run ONNX for them either.
+
+        :param queries: Iterable of query strings, e.g. the canned queries of the system prompt.
+        :return: Number of queries added to the cache
+        :rtype: int
+        """
+        missing = [query for query in dict.fromkeys(queries) if query not in self.__query_cache]
+        if not missing:
+            return 0
+        embeddings, _ = self.__embed_documents(missing)
+        for query, embedding in zip(missing, embeddings):
+            self.__query_cache.put(query, embedding)
+        return len(missing)
+
+    def embed_queries(self, queries) -> dict:
+        """Embed queries through the query cache, e.g. to store them in a knowledge snapshot.
+
+        :param queries: Iterable of query strings.
+        :return: Mapping of query to its embedding
+        :rtype: dict
+        """
+        queries = list(dict.fromkeys(queries))
+        return dict(zip(queries, self.__embed_queries(queries)))
+
+    def embed_documents(self, texts: list) -> list:
+        """Embed texts with the store's embedding model, through the persistent embedding cache when enabled.
+
+        :param list texts: Texts to embed.
+        :return: One embedding per text
+        :rtype: list
+        """
+        return self.__embed_documents(texts)[0]
+
+    def __embed_queries(self, queries: list) -> list:
+        """Return one embedding per query, embedding every query missing from the query cache in one batch."""
+        embeddings = {query: self.__query_cache.get(query) for query in dict.fromkeys(queries)}
+        missing = [query for query, embedding in embeddings.items() if embedding is None]
+        if missing:
+            for query, embedding in zip(missing, self.__embedding_function(missing)):
+                self.__query_cache.put(query, embedding)
+                embeddings[query] = embedding
+        return [embeddings[query] for query in queries]
+
+    async def aembed_query(self, query: str) -> list:
+        """Embed a query with the store's embedding model, through the query cache and off the event loop.
+
+        :param str query: The query string.
+        :return: The query embedding
+        :rtype: list
+        """
+        if query in self.__query_cache:
+            return self.__query_cache.get(query)
+        loop = asyncio.get_running_loop()
+        return (await loop.run_in_executor(retrieval_executor(), self.__embed_queries, [query]))[0]
+
+    def close(self):
+        """Release the vector index's memory. The store is unusable afterwards."""
+        self.__index.close()
+
+    @property
+    def ingest_stats(self):
+        """Get the throughput metrics of the last vectorize_chunks run.
+
+        :return: Ingestion metrics, or None if vectorize_chunks has not run
+        :rtype: IngestStats | None
+        """
+        return self.__ingest_stats
+
+    def __upsert_batch(self, documents: list, embeddings, topics: list):
+        """Bulk-upsert one batch of documents with their precomputed embeddings."""
+        self.__index.add(documents, embeddings, topics)
+        if self.__lexical_index is not None:
+            self.__lexical_index.add(documents, topics)
+        self.__corpus_version = None
+        self.__documents.extend(documents)
+        self.__embeddings.extend(embeddings)
+        self.__topics.extend(topics)
+
     def retrieve_relevant_chunks(self, query: str, top_k: int = 4, topic: str = None) -> list:
         """
         Retrieve relevant chunks from the vector store based on the query using cosine similarity search.
@@ -76,19 +487,109 @@ class CVVectorStore:
         :return: A list of relevant CV chunk texts.
         :rtype: list
         """
-        # ChromaDB embeds the query locally and runs cosine similarity search
-        query_kwargs = {
-            "query_texts": [query],
-            "n_results": top_k,
-        }
-        if topic:
-            query_kwargs["where"] = {"topic": topic}
+        return self.retrieve_many([(query, topic, top_k)])[0]
 
-        results = self.__cv_collection.query(**query_kwargs)
+    def retrieve_many(self, queries: list) -> list:
+        """Retrieve relevant chunks for several queries in one pass.
+
+        Cached results are served first. In hybrid mode a query the BM25 index ranks confidently is
+        answered from it without being embedded; the other queries are embedded in a single batch,
+        scored against the vector index together and fused with their lexical ranking.
+
+        :param list queries: (query, topic, top_k) tuples. A topic of None searches every CV section.
+        :return: One list of relevant CV chunk texts per query, in input order.
+        :rtype: list
+        """
+        keys, results = self.__cached_results(queries)
+        return self.__retrieve_pending(queries, keys, results)
+
+    async def aretrieve_many(self, queries: list) -> list:
+        """Async variant of retrieve_many that keeps embedding and search off the event loop.
+
+        Fully cached calls are answered on the loop; anything else runs in the bounded retrieval pool.
+
+        :param list queries: (query, topic, top_k) tuples. A topic of None searches every CV section.
+        :return: One list of relevant CV chunk texts per query, in input order.
+        :rtype: list
+        """
+        keys, results = self.__cached_results(queries)
+        if all(documents is not None for documents in results):
+            return [list(documents) for documents in results]
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(retrieval_executor(), self.__retrieve_pending, queries, keys, results)
+
+    async def aretrieve_relevant_chunks(self, query: str, top_k: int = 4, topic: str = None) -> list:
+        """Async variant of retrieve_relevant_chunks that keeps embedding and search off the event loop.
+
+        :param str query: The query string to search for relevant CV chunks.
+        :param int top_k: The number of top relevant chunks to retrieve.
+        :param str topic: Optional topic filter to restrict search to a specific CV section.
+        :return: A list of relevant CV chunk texts.
+        :rtype: list
+        """
+        return (await self.aretrieve_many([(query, topic, top_k)]))[0]
 
-        docs = results.get("documents", [])  # get the documents from the results, default to empty list if not found
+    def __cached_results(self, queries: list) -> tuple:
+        """Look queries up in the retrieval cache.
 
-        return docs[0] if docs else []
+        :return: Tuple of (cache key per query, cached documents per query or None on a miss)
+        :rtype: tuple
+        """
+        version = self.corpus_version
+        keys = [("query", version, query, topic, top_k) for query, topic, top_k in queries]
+        return keys, [self.__retrieval_cache.get(key) for key in keys]
+
+    def __retrieve_pending(self, queries: list, keys: list, results: list) -> list:
+        """Answer the queries without a cached result and fill them into results."""
+        pending = [position for position, cached in enumerate(results) if cached is None]
+
+        lexical_rankings = {}
+        if self.__lexical_index is not None:
+            for position in list(pending):
+                query, topic, top_k = queries[position]
+                lexical = self.__lexical_index.search(query, topic)
+                if lexical.confident:
+                    # exact-token fast path: the query is never embedded
+                    results[position] = lexical.documents[:top_k]
+                    self.__retrieval_cache.put(keys[position], tuple(results[position]))
+                    self.__count_retrieval_path("lexical")
+                    pending.remove(position)
+                elif lexical.documents:
+                    lexical_rankings[position] = lexical.documents
+
+        if pending:
+            # Queries are embedded locally with the same model as the chunks, then searched in the index.
+            # Fused queries fetch a deeper vector ranking so lexical matches can move up into the top_k.
+            embeddings = self.__embed_queries([queries[position][0] for position in pending])
+            found = self.__index.query_many(
+                embeddings,
+                [queries[position][2] * (2 if position in lexical_rankings else 1) for position in pending],
+                [queries[position][1] for position in pending],
+            )
+            for position, documents in zip(pending, found):
+                if position in lexical_rankings:
+                    documents = _reciprocal_rank_fusion(documents, lexical_rankings[position], queries[position][2])
+                    self.__count_retrieval_path("hybrid")
+                else:
+                    self.__count_retrieval_path("vector")
+                self.__retrieval_cache.put(keys[position], tuple(documents))
+                results[position] = documents
+        return [list(documents) for documents in results]
+
+    def __count_retrieval_path(self, path: str):
+        """Count one uncached query answered by the given retrieval path."""
+        with self.__retrieval_paths_lock:
+            self.__retrieval_paths[path] += 1
+
+    @property
+    def retrieval_paths(self) -> dict:
+        """Get how many uncached queries were answered lexically, by fused ranking or by vector search alone.
+
+        :return: Mapping of "lexical", "hybrid" and "vector" to query counts
+        :rtype: dict
+        """
+        with self.__retrieval_paths_lock:
+            return dict(self.__retrieval_paths)
 
     def get_all_chunks_by_topic(self, topic: str) -> list:
         """Return all stored chunks for a given topic without similarity search.
@@ -97,17 +598,44 @@ class CVVectorStore:
         :return: All chunk documents for that topic.
         :rtype: list
         """
-        results = self.__cv_collection.get(where={"topic": topic})
-        return results.get("documents", [])
+        key = ("topic", self.corpus_version, topic)
+        cached = self.__retrieval_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        return self.__load_topic(key, topic)
+
+    async def aget_all_chunks_by_topic(self, topic: str) -> list:
+        """Async variant of get_all_chunks_by_topic that keeps index reads off the event loop.
+
+        :param str topic: The topic to filter by (e.g. "Experience").
+        :return: All chunk documents for that topic.
+        :rtype: list
+        """
+        key = ("topic", self.corpus_version, topic)
+        cached = self.__retrieval_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(retrieval_executor(), self.__load_topic, key, topic)
+
+    def __load_topic(self, key: tuple, topic: str) -> list:
+        """Read every document of a topic from the index and cache it under key."""
+        results = self.__index.documents_by_topic(topic)
+        self.__retrieval_cache.put(key, tuple(results))
+        return results
 
     def create_tools(self) -> list:
-        """Create topic-specific tool wrappers for the retrieve_relevant_chunks method."""
+        """Create topic-specific tool wrappers for the retrieve_relevant_chunks method.
+
+        The tools are coroutines: cached answers return on the event loop, and embedding and search
+        run in the bounded retrieval pool, so a retrieval never stalls other requests.
+        """
 
         # FunctionTool used directly so we can supply an explicit schema with
         # "properties": {} — function_tool() on a no-arg function omits "properties",
         # which Groq rejects as invalid JSON Schema.
         async def _list_all_experience_impl(_ctx, _args: str) -> list:
-            return self.get_all_chunks_by_topic("Experience")
+            return await self.aget_all_chunks_by_topic("Experience")
 
         list_all_experience_chunks = FunctionTool(
             name="list_all_experience_chunks",
@@ -124,7 +652,7 @@ class CVVectorStore:
         )
 
         @function_tool
-        def retrieve_experience_chunks(query: str, top_k: int = 4) -> list:
+        async def retrieve_experience_chunks(query: str, top_k: int = 4) -> list:
             """
             Retrieve relevant chunks from the work experience section of the CV.
             Use this tool for questions about jobs, roles, companies, employment history,
@@ -137,10 +665,10 @@ class CVVectorStore:
             Returns:
                 A list of relevant work experience chunk texts.
             """
-            return self.retrieve_relevant_chunks(query, top_k, topic="Experience")
+            return await self.aretrieve_relevant_chunks(query, top_k, topic="Experience")
 
         @function_tool
-        def retrieve_skills_chunks(query: str, top_k: int = 3) -> list:
+        async def retrieve_skills_chunks(query: str, top_k: int = 3) -> list:
             """
             Retrieve relevant chunks from the skills section of the CV.
             Use this tool for questions about technical skills, programming languages,
@@ -153,10 +681,10 @@ class CVVectorStore:
             Returns:
                 A list of relevant skills chunk texts.
             """
-            return self.retrieve_relevant_chunks(query, top_k, topic="Skills")
+            return await self.aretrieve_relevant_chunks(query, top_k, topic="Skills")
 
         @function_tool
-        def retrieve_education_chunks(query: str, top_k: int = 3) -> list:
+        async def retrieve_education_chunks(query: str, top_k: int = 3) -> list:
             """
             Retrieve relevant chunks from the education section of the CV.
             Use this tool for questions about degrees, universities, certifications,
@@ -169,10 +697,10 @@ class CVVectorStore:
             Returns:
                 A list of relevant education chunk texts.
             """
-            return self.retrieve_relevant_chunks(query, top_k, topic="Education")
+            return await self.aretrieve_relevant_chunks(query, top_k, topic="Education")
 
         @function_tool
-        def retrieve_projects_chunks(query: str, top_k: int = 3) -> list:
+        async def retrieve_projects_chunks(query: str, top_k: int = 3) -> list:
             """
             Retrieve relevant chunks from the projects section of the CV.
             Use this tool for questions about personal projects, side projects,
@@ -185,10 +713,10 @@ class CVVectorStore:
             Returns:
                 A list of relevant project chunk texts.
             """
-            return self.retrieve_relevant_chunks(query, top_k, topic="Projects")
+            return await self.aretrieve_relevant_chunks(query, top_k, topic="Projects")
 
         @function_tool
-        def retrieve_profile_chunks(query: str, top_k: int = 3) -> list:
+        async def retrieve_profile_chunks(query: str, top_k: int = 3) -> list:
             """
             Retrieve relevant chunks from the general profile sections of the CV,
             including summary, contact information, certifications, languages, and publications.
@@ -202,7 +730,29 @@ class CVVectorStore:
             Returns:
                 A list of relevant profile chunk texts.
             """
-            return self.retrieve_relevant_chunks(query, top_k)
+            return await self.aretrieve_relevant_chunks(query, top_k)
+
+        @function_tool
+        async def retrieve_many_chunks(requests: list[RetrievalRequest]) -> list:
+            """
+            Retrieve relevant chunks for several queries, possibly across several CV sections, in one call.
+            Use this tool when the question spans multiple topics (e.g. "summarise your background")
+            instead of calling several topic-specific tools one after another.
+
+            Args:
+                requests: One entry per query, each with the query string, the CV section to search
+                    (Experience, Skills, Education, Projects, or null for the whole profile) and top_k.
+
+            Returns:
+                One entry per request with its query, topic and the relevant chunk texts.
+            """
+            results = await self.aretrieve_many(
+                [(request.query, request.topic, request.top_k) for request in requests]
+            )
+            return [
+                {"query": request.query, "topic": request.topic, "chunks": chunks}
+                for request, chunks in zip(requests, results)
+            ]
 
         return [
             list_all_experience_chunks,
@@ -211,4 +761,5 @@ class CVVectorStore:
             retrieve_education_chunks,
             retrieve_projects_chunks,
             retrieve_profile_chunks,
+            retrieve_many_chunks,
         ]
@@ -0,0 +1,230 @@
+"""Vector index backends for the CV vector store.
+
+CVVectorStore embeds documents and queries itself and hands the vectors to a VectorIndex:
+
+- ``numpy`` (default): L2-normalized embeddings in one contiguous float32 matrix with a boolean
+  row mask per topic. A query is a single matrix-vector product plus ``argpartition`` — exact
+  cosine search without a client, an HNSW graph or SQLite, which is all a CV's few dozen chunks need.
+- ``chroma``: an in-memory ChromaDB collection, for corpora large enough to want an ANN index.
+
+Environment variables:
+    VECTOR_INDEX_BACKEND - "numpy" (default) or "chroma".
+"""
+
+import abc
+import os
+import uuid
+
+import chromadb
+import numpy as np
+from chromadb.errors import NotFoundError
+
+DEFAULT_INDEX_BACKEND = "numpy"
+COLLECTION_NAME_PREFIX = "cv_lookup"
+
+
+class VectorIndex(abc.ABC):
+    """Similarity index over embedded CV chunks."""
+
+    @property
+    @abc.abstractmethod
+    def backend(self) -> str:
+        """Get the name of the index backend.
+
+        :return: Backend name
+        :rtype: str
+        """
+
+    @abc.abstractmethod
+    def add(self, documents: list, embeddings, topics: list):
+        """Append documents with their precomputed embeddings.
+
+        :param list documents: Normalized chunk documents.
+        :param embeddings: One embedding vector per document (list of lists or a 2-D array).
+        :param list topics: Topic of each document.
+        """
+
+    @abc.abstractmethod
+    def query(self, query_embedding, top_k: int, topic: str = None) -> list:
+        """Return the documents most similar to a query embedding.
+
+        :param query_embedding: Embedding vector of the query.
+        :param int top_k: Maximum number of documents to return.
+        :param str topic: Restrict the search to one topic, optional.
+        :return: Documents ordered by decreasing similarity
+        :rtype: list
+        """
+
+    def query_many(self, query_embeddings, top_ks: list, topics: list) -> list:
+        """Answer several queries at once.
+
+        The base implementation runs them one by one; backends override it to score all queries in one pass.
+
+        :param query_embeddings: One embedding vector per query (list of lists or a 2-D array).
+        :param list top_ks: Maximum number of documents to return for each query.
+        :param list topics: Topic filter of each query, None for no filter.
+        :return: One list of documents per query, each ordered by decreasing similarity
+        :rtype: list
+        """
+        return [
+            self.query(query_embedding, top_k, topic=topic)
+            for query_embedding, top_k, topic in zip(query_embeddings, top_ks, topics)
+        ]
+
+    @abc.abstractmethod
+    def documents_by_topic(self, topic: str) -> list:
+        """Return every document of a topic in insertion order.
+
+        :param str topic: The topic to filter by.
+        :return: Documents of that topic
+        :rtype: list
+        """
+
+    def close(self):
+        """Release resources held by the index. The index is unusable afterwards."""
+
+
+class NumpyVectorIndex(VectorIndex):
+    """Exact cosine search over a contiguous float32 matrix of L2-normalized embeddings."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._documents = []
+        self._topics = []
+        self._topic_masks = {}  # topic → boolean row mask
+        self._topic_counts = {}  # topic → number of rows
+
+    @property
+    def backend(self) -> str:
+        return "numpy"
+
+    def add(self, documents: list, embeddings, topics: list):
+        if not documents:
+            return
+        rows = np.asarray(embeddings, dtype=np.float32).reshape(len(documents), -1)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        rows = rows / np.where(norms == 0, 1.0, norms)
+
+        self._matrix = np.ascontiguousarray(np.vstack([self._matrix, rows]) if self._documents else rows)
+        self._documents.extend(documents)
+        self._topics.extend(topics)
+
+        topic_array = np.asarray(self._topics, dtype=object)
+        self._topic_masks = {topic: topic_array == topic for topic in set(self._topics)}
+        self._topic_counts = {topic: int(mask.sum()) for topic, mask in self._topic_masks.items()}
+
+    def query(self, query_embedding, top_k: int, topic: str = None) -> list:
+        return self.query_many([query_embedding], [top_k], [topic])[0]
+
+    def query_many(self, query_embeddings, top_ks: list, topics: list) -> list:
+        if not self._documents or not top_ks:
+            return [[] for _ in top_ks]
+        queries = np.asarray(query_embeddings, dtype=np.float32).reshape(len(top_ks), -1)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1.0, norms)
+
+        # one matrix-matrix product scores every query against every chunk
+        scores = self._matrix @ queries.T
+        return [
+            self._top_k(scores[:, column], top_k, topic)
+            for column, (top_k, topic) in enumerate(zip(top_ks, topics))
+        ]
+
+    def _top_k(self, scores: np.ndarray, top_k: int, topic: str = None) -> list:
+        """Return the top_k documents by score, restricted to a topic when given."""
+        if topic is not None:
+            mask = self._topic_masks.get(topic)
+            candidates = self._topic_counts.get(topic, 0)
+        else:
+            mask, candidates = None, len(self._documents)
+        top_k = min(top_k, candidates)
+        if top_k <= 0:
+            return []
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+
+        # argpartition selects the top-k in O(n); only those k are sorted
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [self._documents[row] for row in top]
+
+    def documents_by_topic(self, topic: str) -> list:
+        mask = self._topic_masks.get(topic)
+        if mask is None:
+            return []
+        return [self._documents[row] for row in np.flatnonzero(mask)]
+
+
+class ChromaVectorIndex(VectorIndex):
+    """In-memory ChromaDB collection."""
+
+    def __init__(self, embedding_function=None):
+        """Initialize an empty collection.
+
+        :param embedding_function: ChromaDB compatible embedding function attached to the collection, optional.
+        """
+        # chromadb.Client() is a process-wide singleton, so every index gets its own collection name;
+        # this lets a reindexed store be built while the previous one is still serving requests.
+        self._client = chromadb.Client()
+        self._collection_name = f"{COLLECTION_NAME_PREFIX}_{uuid.uuid4().hex[:12]}"
+        self._collection = self._client.create_collection(
+            name=self._collection_name,
+            embedding_function=embedding_function,
+            metadata={"hnsw:space": "cosine"},  # same ranking as the NumPy backend for any embedder
+        )
+        self._count = 0
+
+    @property
+    def backend(self) -> str:
+        return "chroma"
+
+    def add(self, documents: list, embeddings, topics: list):
+        self._collection.upsert(
+            documents=documents,
+            embeddings=list(embeddings),
+            ids=[f"chunk_{self._count + idx}" for idx in range(len(documents))],
+            metadatas=[{"topic": topic} for topic in topics],
+        )
+        self._count += len(documents)
+
+    def query(self, query_embedding, top_k: int, topic: str = None) -> list:
+        query_kwargs = {
+            "query_embeddings": [query_embedding],
+            "n_results": top_k,
+        }
+        if topic:
+            query_kwargs["where"] = {"topic": topic}
+
+        results = self._collection.query(**query_kwargs)
+
+        docs = results.get("documents", [])  # get the documents from the results, default to empty list if not found
+
+        return docs[0] if docs else []
+
+    def documents_by_topic(self, topic: str) -> list:
+        results = self._collection.get(where={"topic": topic})
+        return results.get("documents", [])
+
+    def close(self):
+        try:
+            self._client.delete_collection(self._collection_name)
+        except NotFoundError:  # already closed
+            pass
+
+
+def create_vector_index(backend: str = None, embedding_function=None) -> VectorIndex:
+    """Create a vector index for the configured backend.
+
+    :param str backend: "numpy" or "chroma", optional. Defaults to VECTOR_INDEX_BACKEND, then "numpy".
+    :param embedding_function: ChromaDB compatible embedding function, used by the chroma backend, optional.
+    :raises ValueError: If the backend is not supported.
+    :return: An empty vector index
+    :rtype: VectorIndex
+    """
+    backend = (backend or os.getenv("VECTOR_INDEX_BACKEND") or DEFAULT_INDEX_BACKEND).lower()
+    if backend == "numpy":
+        return NumpyVectorIndex()
+    if backend == "chroma":
+        return ChromaVectorIndex(embedding_function=embedding_function)
+    raise ValueError(f"Unsupported VECTOR_INDEX_BACKEND: {backend}. Supported backends are 'numpy' and 'chroma'.")
@@ -32,6 +32,17 @@ class CVParserInterface(abc.ABC):
         :rtype: dict
         """
 
+    def iter_chunks(self):
+        """Yield parsed CV chunks one at a time.
+
+        Parsers that can produce chunks incrementally should override this; the default
+        simply iterates over the result of :meth:`parse`.
+
+        :return: Iterator over parsed chunks
+        :rtype: Iterator[dict]
+        """
+        yield from self.parse()
+
     @property
     @abc.abstractmethod
     def type(self) -> str:
@@ -50,35 +50,57 @@ class LinkedInCVParser(CVParserInterface):
         :return: Parsed CV data as a dictionary
         :rtype: dict
         """
+        return list(self.iter_chunks())
+
+    def iter_chunks(self):
+        """Parse the CV, yielding each chunk as soon as its section has been processed.
+
+        The full list is stored in :attr:`parsed_cv` once the iterator is exhausted.
+
+        :return: Iterator over parsed chunks
+        :rtype: Iterator[dict]
+        """
         md_splitter = MarkdownHeaderTextSplitter(headers_to_split_on=self.__linkedin_cv_struct)
         sections = md_splitter.split_text(self._cv)
 
         chunks = []
         for section in sections:
-            metadata = section.metadata
-            if "misc_topics" in metadata:
-                topic = metadata["misc_topics"]
-                if topic in self.__topics["misc_topics"]:
-                    chunks.append({"topic": topic, "content": section.page_content})
-            elif "name" in metadata:
-                if "main_topics" in metadata:
-                    topic = metadata["main_topics"]
-                    if topic in self.__topics["main_topics"] and topic not in ["Experience"]:
-                        chunks.append({"topic": topic, "content": section.page_content})
-                    elif topic == "Experience":  # Experience section is a special case, we will handle it separately
-                        experience_content = self._parse_experience(section.page_content)
-                        chunks.extend(experience_content)
-                    # elif topic == "Education": # Education section is a special case, we will handle it separately
-                    #     education_content = self.__parse_education(section.page_content)
-                    #     chunks.extend(education_content)
-                else:  # Just the name section without any main topics
-                    name = metadata["name"]
-                    chunks.append({"topic": "name", "content": name})
-                    chunks.append({"topic": "overall_description", "content": section.page_content})
-            else:  # All other unspecified sections can be added to a miscellaneous topic
-                chunks.append({"topic": "miscellaneous", "content": section.page_content})
+            section_chunks = self.__section_chunks(section)
+            chunks.extend(section_chunks)
+            yield from section_chunks
 
         self._parsed_cv = chunks
+
+    def __section_chunks(self, section) -> list:
+        """Return the chunks extracted from one markdown section.
+
+        :param section: A document produced by the markdown header splitter.
+        :return: Chunks for the section
+        :rtype: list
+        """
+        chunks = []
+        metadata = section.metadata
+        if "misc_topics" in metadata:
+            topic = metadata["misc_topics"]
+            if topic in self.__topics["misc_topics"]:
+                chunks.append({"topic": topic, "content": section.page_content})
+        elif "name" in metadata:
+            if "main_topics" in metadata:
+                topic = metadata["main_topics"]
+                if topic in self.__topics["main_topics"] and topic not in ["Experience"]:
+                    chunks.append({"topic": topic, "content": section.page_content})
+                elif topic == "Experience":  # Experience section is a special case, we will handle it separately
+                    experience_content = self._parse_experience(section.page_content)
+                    chunks.extend(experience_content)
+                # elif topic == "Education": # Education section is a special case, we will handle it separately
+                #     education_content = self.__parse_education(section.page_content)
+                #     chunks.extend(education_content)
+            else:  # Just the name section without any main topics
+                name = metadata["name"]
+                chunks.append({"topic": "name", "content": name})
+                chunks.append({"topic": "overall_description", "content": section.page_content})
+        else:  # All other unspecified sections can be added to a miscellaneous topic
+            chunks.append({"topic": "miscellaneous", "content": section.page_content})
         return chunks
 
     @staticmethod
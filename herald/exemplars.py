@@ -0,0 +1,67 @@
+"""Nearest-exemplar scoring of visitor messages against labelled example questions.
+
+Shared by the local guard (herald.guard), the pre-retrieval topic predictor (herald.preretrieval) and
+the model router (herald.routing): each embeds a fixed set of example questions per label once, with
+the context's embedding model, and scores a message by its cosine similarity to the most similar example of each label.
+"""
+
+import asyncio
+
+import numpy as np
+
+
+def retrieval_executor():
+    """Return the retrieval thread pool; herald.context_manager.rag is imported late because it loads chromadb."""
+    from herald.context_manager.rag import retrieval_executor as executor  # pylint: disable=import-outside-toplevel
+    return executor()
+
+
+def unit_rows(embeddings) -> np.ndarray:
+    """Scale embeddings to unit length, so dot products are cosine similarities.
+
+    :param embeddings: One embedding, or a sequence of embeddings.
+    :return: Array of the same shape with unit-length rows
+    :rtype: np.ndarray
+    """
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class ExemplarIndex:  # pylint: disable=too-few-public-methods
+    """Example questions per label, embedded on first use."""
+
+    def __init__(self, exemplars: dict, embed_texts):
+        """Initialize the index.
+
+        :param dict exemplars: Mapping of label to a sequence of example questions.
+        :param embed_texts: Function embedding a list of texts, run in the retrieval pool.
+        """
+        self.exemplars = exemplars
+        self._embed_texts = embed_texts
+        self._labels = [label for label, questions in exemplars.items() for _ in questions]
+        self._matrix = None
+        self._lock = asyncio.Lock()
+
+    async def _exemplar_matrix(self) -> np.ndarray:
+        """Embed the exemplars once, in the retrieval pool."""
+        async with self._lock:
+            if self._matrix is None:
+                texts = [question for questions in self.exemplars.values() for question in questions]
+                loop = asyncio.get_running_loop()
+                embeddings = await loop.run_in_executor(retrieval_executor(), self._embed_texts, texts)
+                self._matrix = unit_rows(embeddings)
+        return self._matrix
+
+    async def best_similarities(self, embedding) -> dict:
+        """Score a message embedding against every label.
+
+        :param embedding: Embedding of the message.
+        :return: Mapping of label to the cosine similarity of its most similar exemplar
+        :rtype: dict
+        """
+        similarities = (await self._exemplar_matrix()) @ unit_rows(embedding)
+        best = {}
+        for label, similarity in zip(self._labels, similarities.tolist()):
+            best[label] = max(best.get(label, -1.0), similarity)
+        return best
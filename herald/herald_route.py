@@ -1,15 +1,20 @@
 
 """Herald API routes."""
 
+import dataclasses
+import json
 import logging
 import time
 from pydantic import BaseModel, Field
-from fastapi import APIRouter, Request, Depends, Header
+from fastapi import APIRouter, Request, Depends, Header, HTTPException
+from fastapi.responses import StreamingResponse
 from agents import SQLiteSession
 
 from herald.app import HeraldApp
 from herald.context_manager.icontext import ContextInterface
-from herald.usage_tracker import UsageTracker, DAILY_MESSAGE_LIMIT
+from herald.guard import Refusal, refusals_count_against_quota
+from herald.tenants import UnknownTenantError
+from herald.usage_tracker import UsageTracker, TokenUsage, DAILY_MESSAGE_LIMIT
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +48,75 @@ def get_usage_tracker(request: Request) -> UsageTracker:
     return request.app.state.usage_tracker
 
 
+def get_tenant_id(request: Request, x_tenant_id: str = Header(default=None)) -> str | None:
+    """Dependency resolving the tenant from the ``/t/{tenant_id}`` path prefix or the X-Tenant-Id header."""
+    return request.path_params.get("tenant_id") or x_tenant_id
+
+
+async def get_tenant_app(request: Request, tenant_id: str | None = Depends(get_tenant_id)) -> HeraldApp:
+    """Dependency returning the HeraldApp serving the request's tenant, loading the tenant on first use.
+
+    Requests without a tenant id are served by the single-tenant application.
+    """
+    if tenant_id is None:
+        herald_app = get_herald_app(request)
+        if herald_app is None:
+            raise HTTPException(
+                status_code=400,
+                detail="A tenant id is required: send the X-Tenant-Id header or use the /t/{tenant_id} prefix.",
+            )
+        return herald_app
+
+    registry = getattr(request.app.state, "tenant_registry", None)
+    if registry is None:
+        raise HTTPException(status_code=404, detail="Multi-tenant serving is not enabled.")
+    try:
+        tenant = await registry.get(tenant_id)
+    except UnknownTenantError as exc:
+        raise HTTPException(status_code=404, detail=f"Unknown tenant '{tenant_id}'.") from exc
+    return tenant.app
+
+
+def _tenant_scoped(tenant_id: str | None, key: str) -> str:
+    """Prefix a session or user id with the tenant, so tenants never share history or quota."""
+    return f"{tenant_id}/{key}" if tenant_id else key
+
+
+def _token_payload(tokens: int, token_limit: int) -> dict:
+    """Build the token part of a usage block; limit and remaining are None without a token quota."""
+    return {
+        "used": tokens,
+        "limit": token_limit or None,
+        "remaining": max(0, token_limit - tokens) if token_limit else None,
+    }
+
+
+def _usage_payload(used: int, tokens: int, token_limit: int) -> dict:
+    """Build the usage block returned with every answer."""
+    return {
+        "used": used,
+        "limit": DAILY_MESSAGE_LIMIT,
+        "remaining": max(0, DAILY_MESSAGE_LIMIT - used),
+        "tokens": _token_payload(tokens, token_limit),
+    }
+
+
+def _record_usage(usage_tracker: UsageTracker, user_id: str, refused: bool) -> int:
+    """Count an answered message against the user's quota; guard refusals only if configured to.
+
+    :return: Messages used today
+    :rtype: int
+    """
+    if refused and not refusals_count_against_quota():
+        return usage_tracker.get_count(user_id)
+    return usage_tracker.increment(user_id)
+
+
+def _sse(event: dict) -> str:
+    """Format an event as one Server-Sent Events message named after its type."""
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
 herald_router = APIRouter()
 
 
@@ -83,45 +157,98 @@ def app_root() -> dict:
 
 
 @herald_router.get("/ai/usage")
+@herald_router.get("/t/{tenant_id}/ai/usage")
 def get_usage(
     usage_tracker: UsageTracker = Depends(get_usage_tracker),
+    tenant_id: str | None = Depends(get_tenant_id),
     x_user_id: str = Header(default="anonymous"),
 ) -> dict:
-    """Return today's usage stats for the requesting user."""
-    used = usage_tracker.get_count(x_user_id)
-    return {
-        "used": used,
-        "limit": DAILY_MESSAGE_LIMIT,
-        "remaining": max(0, DAILY_MESSAGE_LIMIT - used),
-    }
+    """Return today's message and token usage for the requesting user, with the tokens per model."""
+    user_id = _tenant_scoped(tenant_id, x_user_id)
+    by_model = usage_tracker.get_token_usage(user_id)
+    tokens_used = sum(tokens.total_tokens for tokens in by_model.values())
+    usage = _usage_payload(usage_tracker.get_count(user_id), tokens_used, usage_tracker.token_limit)
+    for field in ("input_tokens", "output_tokens", "cached_tokens"):
+        usage["tokens"][field] = sum(getattr(tokens, field) for tokens in by_model.values())
+    usage["tokens"]["by_model"] = {model: dataclasses.asdict(tokens) for model, tokens in by_model.items()}
+    return usage
 
 
 @herald_router.post("/ai/ask")
-async def ask_api(
+@herald_router.post("/t/{tenant_id}/ai/ask")
+async def ask_api(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     chat_request: ChatRequest,
-    herald_app: HeraldApp = Depends(get_herald_app),
+    herald_app: HeraldApp = Depends(get_tenant_app),
     session_store: dict = Depends(get_session_store),
     usage_tracker: UsageTracker = Depends(get_usage_tracker),
+    tenant_id: str | None = Depends(get_tenant_id),
     x_user_id: str = Header(default="anonymous"),
 ) -> dict:
     """API endpoint to handle chat requests."""
+    user_id = _tenant_scoped(tenant_id, x_user_id)
     # Enforce daily quota before spending any tokens
-    used, _ = usage_tracker.check_quota(x_user_id)
+    used, _ = usage_tracker.check_quota(user_id)
 
     logger.info(
-        "Processing chat request [user=%s, session=%s, usage=%d/%d]: %s",
-        x_user_id, chat_request.session_id, used, DAILY_MESSAGE_LIMIT, chat_request.message,
+        "Processing chat request [tenant=%s, user=%s, session=%s, usage=%d/%d]: %s",
+        tenant_id, x_user_id, chat_request.session_id, used, DAILY_MESSAGE_LIMIT, chat_request.message,
     )
 
-    session = _get_or_create_session(session_store, chat_request.session_id)
+    session = _get_or_create_session(session_store, _tenant_scoped(tenant_id, chat_request.session_id))
 
-    async for chunk in herald_app.run(message=chat_request.message, session=session):
-        new_count = usage_tracker.increment(x_user_id)
+    token_usage = TokenUsage()
+    async for chunk in herald_app.run(message=chat_request.message, session=session, usage=token_usage):
+        new_count = _record_usage(usage_tracker, user_id, refused=isinstance(chunk, Refusal))
         return {
             "response": chunk,
-            "usage": {
-                "used": new_count,
-                "limit": DAILY_MESSAGE_LIMIT,
-                "remaining": max(0, DAILY_MESSAGE_LIMIT - new_count),
-            },
+            "usage": _usage_payload(
+                new_count, usage_tracker.record_tokens(user_id, token_usage), usage_tracker.token_limit
+            ),
         }
+
+
+@herald_router.post("/ai/ask/stream")
+@herald_router.post("/t/{tenant_id}/ai/ask/stream")
+async def ask_stream_api(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    chat_request: ChatRequest,
+    herald_app: HeraldApp = Depends(get_tenant_app),
+    session_store: dict = Depends(get_session_store),
+    usage_tracker: UsageTracker = Depends(get_usage_tracker),
+    tenant_id: str | None = Depends(get_tenant_id),
+    x_user_id: str = Header(default="anonymous"),
+) -> StreamingResponse:
+    """API endpoint streaming the answer to a chat request as Server-Sent Events.
+
+    Events are ``token`` (a text delta), ``tool_call`` / ``tool_output`` (retrieval progress) and finally
+    ``done`` with the full response and usage, or ``error``. The quota is checked before streaming starts
+    and the message is only counted once the answer is complete.
+    """
+    user_id = _tenant_scoped(tenant_id, x_user_id)
+    used, _ = usage_tracker.check_quota(user_id)
+
+    logger.info(
+        "Processing streaming chat request [tenant=%s, user=%s, session=%s, usage=%d/%d]: %s",
+        tenant_id, x_user_id, chat_request.session_id, used, DAILY_MESSAGE_LIMIT, chat_request.message,
+    )
+
+    session = _get_or_create_session(session_store, _tenant_scoped(tenant_id, chat_request.session_id))
+
+    async def events():
+        token_usage = TokenUsage()
+        try:
+            async for event in herald_app.run_stream(message=chat_request.message, session=session, usage=token_usage):
+                if event["type"] == "done":
+                    used = _record_usage(usage_tracker, user_id, refused="refusal" in event)
+                    tokens = usage_tracker.record_tokens(user_id, token_usage)
+                    event = {**event, "usage": _usage_payload(used, tokens, usage_tracker.token_limit)}
+                yield _sse(event)
+        except Exception:  # pylint: disable=broad-exception-caught
+            # the 200 status is already sent, so the failure is reported in-band
+            logger.exception("Streaming chat request failed [session=%s]", chat_request.session_id)
+            yield _sse({"type": "error", "detail": "The answer could not be completed. Please try again."})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
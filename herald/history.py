@@ -0,0 +1,218 @@
+"""Conversation history policy applied to every model call.
+
+A session stores every item of the conversation, and without a policy each model call sends all
+of them back to the model, so prompt tokens and latency grow with every turn. The policy sits
+between the session and the model (``RunConfig.call_model_input_filter``) and leaves the stored
+session untouched:
+
+- the last HISTORY_MAX_TURNS turns are sent verbatim; a turn runs from a visitor message up to the
+  next one, including the tool calls and outputs in between;
+- older turns are replaced by a rolling summary, produced in the background after a response so
+  no visitor waits for it; turns the summary does not cover yet stay verbatim;
+- the history sent, summary included, is capped at HISTORY_MAX_TOKENS by dropping the oldest turns.
+
+Token counts are estimated from the serialized items (about four characters per token).
+
+Environment variables:
+    HISTORY_MAX_TURNS  - Previous turns sent verbatim (default: 6, 0 sends every turn).
+    HISTORY_MAX_TOKENS - Cap on the estimated tokens of the history sent (default: 6000, 0 no cap).
+    HISTORY_SUMMARY    - Summarize turns outside the window instead of dropping them (default: true).
+"""
+
+import asyncio
+import json
+import logging
+import os
+
+from agents.run_config import ModelInputData
+
+from herald.context_manager.query_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_MAX_TURNS = 6
+DEFAULT_HISTORY_MAX_TOKENS = 6000
+CHARS_PER_TOKEN = 4
+# Summaries outlive neither the session (30 minute TTL) nor a bounded number of sessions.
+SUMMARY_CACHE_SIZE = 1024
+SUMMARY_TTL_SECONDS = 30 * 60
+SUMMARY_HEADER = "\n\nSummary of the earlier conversation with this visitor:\n"
+
+
+def estimate_tokens(items) -> int:
+    """Estimate the tokens of input items or text.
+
+    :param items: Input items, or a string.
+    :return: Estimated token count
+    :rtype: int
+    """
+    text = items if isinstance(items, str) else json.dumps(items, default=str, ensure_ascii=False)
+    return len(text) // CHARS_PER_TOKEN
+
+
+def split_turns(items: list) -> list:
+    """Group input items into turns, each starting at a user message.
+
+    :param list items: Conversation input items in order.
+    :return: List of turns, each a list of items
+    :rtype: list
+    """
+    turns = []
+    for item in items:
+        if not turns or (isinstance(item, dict) and item.get("role") == "user"):
+            turns.append([])
+        turns[-1].append(item)
+    return turns
+
+
+def _text(content) -> str:
+    """Return the text of a message content, which is a string or a list of content parts."""
+    if isinstance(content, str):
+        return content
+    return " ".join(part.get("text", "") for part in content or [] if isinstance(part, dict))
+
+
+def render_transcript(turns: list) -> str:
+    """Render turns as a plain transcript of visitor and Herald messages, leaving out tool traffic.
+
+    :param list turns: Turns as returned by split_turns.
+    :return: One line per message
+    :rtype: str
+    """
+    lines = []
+    for item in (item for turn in turns for item in turn):
+        role = item.get("role") if isinstance(item, dict) else None
+        if role == "user":
+            lines.append(f"Visitor: {_text(item.get('content'))}")
+        elif role == "assistant":
+            lines.append(f"Herald: {_text(item.get('content'))}")
+    return "\n".join(lines)
+
+
+class HistoryPolicy:  # pylint: disable=too-many-instance-attributes
+    """Windows, summarizes and caps the conversation history sent to the model."""
+
+    def __init__(self, max_turns: int = None, max_tokens: int = None, summarize: bool = None):
+        """Initialize the policy.
+
+        :param int max_turns: Previous turns sent verbatim, optional. Defaults to HISTORY_MAX_TURNS (6).
+            0 sends every turn.
+        :param int max_tokens: Cap on the estimated history tokens sent, optional.
+            Defaults to HISTORY_MAX_TOKENS (6000). 0 disables the cap.
+        :param bool summarize: Summarize turns outside the window, optional. Defaults to HISTORY_SUMMARY (true).
+        """
+        if max_turns is None:
+            max_turns = int(os.getenv("HISTORY_MAX_TURNS", str(DEFAULT_HISTORY_MAX_TURNS)))
+        if max_tokens is None:
+            max_tokens = int(os.getenv("HISTORY_MAX_TOKENS", str(DEFAULT_HISTORY_MAX_TOKENS)))
+        if summarize is None:
+            summarize = os.getenv("HISTORY_SUMMARY", "true").strip().lower() in ("1", "true", "yes")
+        self.max_turns = max(0, max_turns)
+        self.max_tokens = max(0, max_tokens)
+        self.summarize = summarize and self.max_turns > 0
+        self.model_calls = 0
+        self.history_tokens = 0
+        self.sent_tokens = 0
+        self.summaries = 0
+        self._summaries = LRUCache(SUMMARY_CACHE_SIZE, SUMMARY_TTL_SECONDS)  # session id → (summary, turns covered)
+        self._due = {}  # session id → turns the summary should cover after the current run
+        self._pending = {}  # session id → running summary task
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the policy changes anything about the history sent."""
+        return bool(self.max_turns or self.max_tokens)
+
+    def input_filter(self, session_id: str):
+        """Build the call_model_input_filter of one session's runs.
+
+        :param str session_id: ID of the session the run belongs to.
+        :return: Filter mapping CallModelData to the ModelInputData actually sent
+        """
+        def _filter(data) -> ModelInputData:
+            return self.apply(session_id, data.model_data)
+        return _filter
+
+    def apply(self, session_id: str, model_data: ModelInputData) -> ModelInputData:
+        """Window, summarize and cap the history of one model call.
+
+        :param str session_id: ID of the session the call belongs to.
+        :param ModelInputData model_data: Instructions and full input the run would send.
+        :return: Instructions and input to send instead
+        :rtype: ModelInputData
+        """
+        turns = split_turns(model_data.input)
+        history, current = turns[:-1], turns[-1:]  # the current turn includes this run's tool calls
+        summary, covered = self._summaries.get(session_id) or ("", 0)
+        start = max(0, len(history) - self.max_turns) if self.max_turns else 0
+        if self.summarize:
+            start = min(start, covered)  # turns the summary does not cover yet stay verbatim
+            # history plus this turn's answer, seen by the next run
+            if len(history) + 1 - self.max_turns > covered:
+                self._due[session_id] = len(history) + 1 - self.max_turns
+
+        turn_tokens = [estimate_tokens(turn) for turn in history]
+        if self.max_tokens:
+            budget = self.max_tokens - estimate_tokens(summary)
+            while start < len(history) and sum(turn_tokens[start:]) > budget:
+                start += 1
+
+        instructions = model_data.instructions
+        if start and summary:
+            instructions = f"{instructions or ''}{SUMMARY_HEADER}{summary}"
+        kept = [item for turn in history[start:] for item in turn]
+        self.model_calls += 1
+        self.history_tokens += sum(turn_tokens)
+        self.sent_tokens += sum(turn_tokens[start:]) + (estimate_tokens(summary) if start and summary else 0)
+        return ModelInputData(input=kept + [item for turn in current for item in turn], instructions=instructions)
+
+    def schedule_summary(self, session, summarize) -> asyncio.Task | None:
+        """Fold the turns that left the window into the session's summary, in the background.
+
+        Does nothing unless a model call of the finished run found turns the summary does not cover.
+
+        :param session: The session whose run just finished.
+        :param summarize: Coroutine function (previous summary, transcript) → new summary, or None to skip.
+        :return: The background task, or None if no summary is due
+        :rtype: asyncio.Task | None
+        """
+        session_id = session.session_id
+        target = self._due.pop(session_id, None)
+        if target is None or session_id in self._pending:
+            return None
+        task = asyncio.create_task(self._update_summary(session, target, summarize))
+        self._pending[session_id] = task
+        task.add_done_callback(lambda _: self._pending.pop(session_id, None))
+        return task
+
+    async def _update_summary(self, session, target: int, summarize):
+        """Summarize the session's turns up to target on top of its previous summary."""
+        previous, covered = self._summaries.get(session.session_id) or ("", 0)
+        try:
+            turns = split_turns(await session.get_items())[:target]
+            summary = await summarize(previous, render_transcript(turns[covered:]))
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning("History summary of session %s failed; older turns stay verbatim", session.session_id,
+                           exc_info=True)
+            return
+        if summary:
+            self._summaries.put(session.session_id, (summary, len(turns)))
+            self.summaries += 1
+
+    def stats(self) -> dict:
+        """Report the policy configuration and the estimated tokens it saved.
+
+        :return: Mapping with max_turns, max_tokens, summarize, model_calls, history_tokens,
+            sent_tokens, tokens_saved and summaries
+        :rtype: dict
+        """
+        return {
+            "max_turns": self.max_turns,
+            "max_tokens": self.max_tokens,
+            "summarize": self.summarize,
+            "model_calls": self.model_calls,
+            "history_tokens": self.history_tokens,
+            "sent_tokens": self.sent_tokens,
+            "tokens_saved": self.history_tokens - self.sent_tokens,
+            "summaries": self.summaries,
+        }
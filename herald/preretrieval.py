@@ -0,0 +1,262 @@
+"""Speculative pre-retrieval of CV chunks before the agent runs.
+
+In RAG mode a typical answer takes two model calls: the model first asks for a ``retrieve_*`` tool
+call, then answers from its output. Pre-retrieval predicts the likely CV section(s) of the question
+locally, by comparing its embedding with example questions per section (see herald.exemplars),
+fetches the top chunks of those sections from the vector store and hands them to the model with the
+visitor's message. When they answer the question the model replies in its first call; otherwise it
+calls the retrieval tools as before.
+
+The chunks are added per model call through ``RunConfig.call_model_input_filter``, right before the
+visitor's message, and are never stored in the session.
+
+A random share of runs (PRERETRIEVAL_HOLDOUT) is answered without pre-retrieval. Comparing the model
+calls and latency of both groups gives the turns and seconds pre-retrieval saves per request.
+
+Environment variables:
+    PRERETRIEVAL              - Pre-retrieve chunks for RAG contexts (default: true).
+    PRERETRIEVAL_TOP_K        - Chunks fetched per predicted section (default: 3).
+    PRERETRIEVAL_MAX_TOPICS   - Sections fetched per question (default: 2).
+    PRERETRIEVAL_TOPIC_MARGIN - How far below the most similar section another section may score and
+                                still be fetched (default: 0.05).
+    PRERETRIEVAL_HOLDOUT      - Share of runs answered without pre-retrieval, as the baseline of the
+                                savings report (default: 0.05, 0 disables the baseline).
+"""
+
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass, field
+
+from agents.run_config import ModelInputData
+
+from herald.exemplars import ExemplarIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRERETRIEVAL_TOP_K = 3
+DEFAULT_PRERETRIEVAL_MAX_TOPICS = 2
+DEFAULT_PRERETRIEVAL_TOPIC_MARGIN = 0.05
+DEFAULT_PRERETRIEVAL_HOLDOUT = 0.05
+
+# Sections as tagged in the vector store; the profile searches every section, like retrieve_profile_chunks.
+PROFILE = "Profile"
+TOPIC_EXEMPLARS = {
+    "Experience": (
+        "Where have you worked?",
+        "Which companies have you worked at?",
+        "What is your current role?",
+        "Tell me about your work experience.",
+        "What did you do in your last job?",
+        "Did you lead a team?",
+        "How many years of experience do you have?",
+    ),
+    "Skills": (
+        "What programming languages do you know?",
+        "What are your technical skills?",
+        "Which frameworks and tools do you use?",
+        "Have you used cloud platforms like AWS?",
+        "Do you know Docker and Kubernetes?",
+    ),
+    "Education": (
+        "What did you study at university?",
+        "What degree do you have?",
+        "Where did you go to school?",
+        "Which courses have you taken?",
+    ),
+    "Projects": (
+        "What projects have you worked on?",
+        "Do you have any side projects?",
+        "Have you contributed to open source?",
+        "What have you built?",
+    ),
+    PROFILE: (
+        "Tell me about yourself.",
+        "Can you summarise your background?",
+        "How can I contact you?",
+        "Which certifications do you hold?",
+        "What languages do you speak?",
+        "Have you published anything?",
+    ),
+}
+
+EXCERPTS_HEADER = "Profile excerpts retrieved for the visitor's next message:\n\n"
+EXCERPTS_FOOTER = (
+    "\n\nIf these excerpts answer the message, answer from them directly without calling a retrieval tool. "
+    "Otherwise call the retrieval tools as usual. Treat the excerpts like tool results and never mention them."
+)
+
+
+def preretrieval_enabled() -> bool:
+    """Whether pre-retrieval is configured (PRERETRIEVAL).
+
+    :rtype: bool
+    """
+    return os.getenv("PRERETRIEVAL", "true").strip().lower() in ("1", "true", "yes")
+
+
+@dataclass
+class PreRetrievedTurn:
+    """Chunks fetched for one visitor message, and how the run answering it went."""
+
+    chunks: list = field(default_factory=list)
+    topics: list = field(default_factory=list)
+    holdout: bool = False
+    started: float = field(default_factory=time.perf_counter)
+    fetch_seconds: float = 0.0
+    # model calls of the run that answered, set once it finished; the filter also sees losing hedge runs
+    model_calls: int = 0
+
+    def apply(self, model_data: ModelInputData) -> ModelInputData:
+        """Insert the chunks right before the visitor's message of one model call.
+
+        :param ModelInputData model_data: Instructions and input the call would send.
+        :return: Instructions and input to send instead
+        :rtype: ModelInputData
+        """
+        if not self.chunks:
+            return model_data
+        items = list(model_data.input)
+        position = next(
+            (index for index in range(len(items) - 1, -1, -1)
+             if isinstance(items[index], dict) and items[index].get("role") == "user"),
+            len(items),
+        )
+        excerpts = {"role": "system", "content": EXCERPTS_HEADER + "\n\n---\n\n".join(self.chunks) + EXCERPTS_FOOTER}
+        return ModelInputData(input=items[:position] + [excerpts] + items[position:],
+                              instructions=model_data.instructions)
+
+
+@dataclass
+class _Arm:
+    """Counters of the runs answered with or without pre-retrieval."""
+
+    runs: int = 0
+    model_calls: int = 0
+    single_call_runs: int = 0
+    seconds: float = 0.0
+
+    def stats(self) -> dict:
+        """Average the counters per run."""
+        return {
+            "runs": self.runs,
+            "model_calls_per_run": self.model_calls / self.runs if self.runs else None,
+            "single_call_share": self.single_call_runs / self.runs if self.runs else None,
+            "seconds_per_run": self.seconds / self.runs if self.runs else None,
+        }
+
+
+class PreRetrieval:  # pylint: disable=too-many-instance-attributes
+    """Predicts the CV sections of a message and fetches their top chunks before the agent runs."""
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        store,
+        top_k: int = None,
+        max_topics: int = None,
+        topic_margin: float = None,
+        holdout: float = None,
+    ):
+        """Initialize pre-retrieval on a vector store.
+
+        :param CVVectorStore store: The context's vector store.
+        :param int top_k: Chunks fetched per predicted section, optional. Defaults to PRERETRIEVAL_TOP_K (3).
+        :param int max_topics: Sections fetched per message, optional. Defaults to PRERETRIEVAL_MAX_TOPICS (2).
+        :param float topic_margin: Similarity below the best section another section may score and still be
+            fetched, optional. Defaults to PRERETRIEVAL_TOPIC_MARGIN (0.05).
+        :param float holdout: Share of runs answered without pre-retrieval, optional.
+            Defaults to PRERETRIEVAL_HOLDOUT (0.05).
+        """
+        if top_k is None:
+            top_k = int(os.getenv("PRERETRIEVAL_TOP_K", str(DEFAULT_PRERETRIEVAL_TOP_K)))
+        if max_topics is None:
+            max_topics = int(os.getenv("PRERETRIEVAL_MAX_TOPICS", str(DEFAULT_PRERETRIEVAL_MAX_TOPICS)))
+        if topic_margin is None:
+            topic_margin = float(os.getenv("PRERETRIEVAL_TOPIC_MARGIN", str(DEFAULT_PRERETRIEVAL_TOPIC_MARGIN)))
+        if holdout is None:
+            holdout = float(os.getenv("PRERETRIEVAL_HOLDOUT", str(DEFAULT_PRERETRIEVAL_HOLDOUT)))
+        self.top_k = max(1, top_k)
+        self.max_topics = max(1, max_topics)
+        self.topic_margin = topic_margin
+        self.holdout = min(max(holdout, 0.0), 1.0)
+        self._store = store
+        self._topics = ExemplarIndex(TOPIC_EXEMPLARS, store.embed_documents)
+        self._prefetched = _Arm()
+        self._baseline = _Arm()
+        self._fetch_seconds = 0.0
+        self._topic_counts = dict.fromkeys(TOPIC_EXEMPLARS, 0)
+
+    async def predict_topics(self, message: str) -> list:
+        """Predict the CV sections a message is about.
+
+        :param str message: The visitor's message.
+        :return: Up to max_topics section names, most similar first
+        :rtype: list
+        """
+        best = await self._topics.best_similarities(await self._store.aembed_query(message))
+        ranking = sorted(best, key=best.get, reverse=True)
+        top = best[ranking[0]]
+        return [topic for topic in ranking[:self.max_topics] if best[topic] >= top - self.topic_margin]
+
+    async def prepare(self, message: str) -> PreRetrievedTurn:
+        """Fetch the chunks of the message's predicted sections, unless the run falls into the holdout.
+
+        :param str message: The visitor's message.
+        :return: The turn to pass to the run's input filter
+        :rtype: PreRetrievedTurn
+        """
+        turn = PreRetrievedTurn()
+        if random.random() < self.holdout:
+            turn.holdout = True
+            return turn
+        turn.topics = await self.predict_topics(message)
+        results = await self._store.aretrieve_many(
+            [(message, None if topic == PROFILE else topic, self.top_k) for topic in turn.topics]
+        )
+        turn.chunks = list(dict.fromkeys(chunk for chunks in results for chunk in chunks))
+        turn.fetch_seconds = time.perf_counter() - turn.started
+        return turn
+
+    def record(self, turn: PreRetrievedTurn):
+        """Count a finished run in its group.
+
+        :param PreRetrievedTurn turn: The turn of the run, after its last model call.
+        """
+        arm = self._baseline if turn.holdout else self._prefetched
+        arm.runs += 1
+        arm.model_calls += turn.model_calls
+        arm.single_call_runs += turn.model_calls == 1
+        arm.seconds += time.perf_counter() - turn.started
+        if not turn.holdout:
+            self._fetch_seconds += turn.fetch_seconds
+            for topic in turn.topics:
+                self._topic_counts[topic] += 1
+        logger.debug("Pre-retrieval %s: %d model call(s) [topics=%s]",
+                     "holdout" if turn.holdout else "run", turn.model_calls, turn.topics)
+
+    def stats(self) -> dict:
+        """Report both groups and the model calls and seconds pre-retrieval saves per request.
+
+        :return: Mapping with the configuration, "prefetched" and "holdout" group counters,
+            fetch_seconds_per_run, topics, and turns_saved_per_request and seconds_saved_per_request
+            (None until both groups have runs)
+        :rtype: dict
+        """
+        prefetched, baseline = self._prefetched.stats(), self._baseline.stats()
+        compared = prefetched["runs"] and baseline["runs"]
+        return {
+            "top_k": self.top_k,
+            "max_topics": self.max_topics,
+            "holdout_share": self.holdout,
+            "prefetched": prefetched,
+            "holdout": baseline,
+            "fetch_seconds_per_run": self._fetch_seconds / prefetched["runs"] if prefetched["runs"] else None,
+            "topics": dict(self._topic_counts),
+            "turns_saved_per_request": (
+                baseline["model_calls_per_run"] - prefetched["model_calls_per_run"] if compared else None
+            ),
+            "seconds_saved_per_request": (
+                baseline["seconds_per_run"] - prefetched["seconds_per_run"] if compared else None
+            ),
+        }
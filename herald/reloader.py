@@ -0,0 +1,134 @@
+"""Live CV hot-reload for Herald.
+
+A background task polls a cheap fingerprint of the CV source (local file mtime/size, the R2
+ETag or the snapshot file) and rebuilds the context when it changes. The rebuild runs in a worker
+thread and reuses the embeddings of every unchanged chunk, so only added or edited chunks are
+embedded. The new context and HeraldApp are then swapped onto the application state in one step:
+requests that already resolved the old HeraldApp finish on it, new requests get the new one, and
+the in-memory session store is left untouched.
+
+Environment variables:
+    CV_RELOAD_INTERVAL - Seconds between CV change checks (default: 60, 0 disables the watcher).
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from herald.app import HeraldApp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RELOAD_INTERVAL = 60.0
+RETIRE_DELAY_SECONDS = 120.0  # how long a replaced context stays alive for in-flight requests
+
+
+def _indexed_documents(context) -> set:
+    """Return the set of indexed chunk documents of a context (empty for non-RAG contexts)."""
+    if context is None or context.type != "rag_based":
+        return set()
+    documents, _, _ = context.context_store.export_index()
+    return set(documents)
+
+
+class CVReloader:  # pylint: disable=too-many-instance-attributes
+    """Watches the CV source and atomically swaps in a reindexed context when it changes."""
+
+    def __init__(self, state, build_context, fingerprint, interval: float = None):
+        """Initialize the reloader.
+
+        :param state: Application state holding ``herald_prompt`` and ``herald_app``.
+        :param build_context: Callable taking the current context and returning a freshly built one.
+        :param fingerprint: Callable returning the current fingerprint of the CV source.
+        :param float interval: Seconds between change checks, optional. Defaults to CV_RELOAD_INTERVAL (60).
+        """
+        self._state = state
+        self._build_context = build_context
+        self._fingerprint = fingerprint
+        if interval is None:
+            interval = float(os.getenv("CV_RELOAD_INTERVAL", str(DEFAULT_RELOAD_INTERVAL)))
+        self.interval = interval
+        self.current_fingerprint = None
+        self.last_reload = None
+        self._lock = asyncio.Lock()
+        self._task = None
+
+    async def start(self):
+        """Record the fingerprint of the served CV and start polling, unless the interval is 0."""
+        self.current_fingerprint = await self._safe_fingerprint()
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._watch())
+            logger.info("Watching the CV for changes every %.0fs", self.interval)
+
+    async def stop(self):
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _safe_fingerprint(self) -> str | None:
+        """Fingerprint the CV source in a worker thread, logging (not raising) failures."""
+        try:
+            return await asyncio.to_thread(self._fingerprint)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Could not fingerprint the CV source: %s", exc)
+            return None
+
+    async def _watch(self):
+        """Poll loop: reindex whenever the fingerprint changes."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reload(reason="watcher")
+            except Exception:  # pylint: disable=broad-exception-caught
+                # keep serving the current CV — the next poll retries
+                logger.exception("CV reindex failed — still serving the previous version")
+
+    async def reload(self, reason: str = "manual", force: bool = False) -> dict:
+        """Rebuild the context if the CV changed (or unconditionally when forced) and swap it in.
+
+        :param str reason: Short label for the logs, e.g. "watcher" or "admin".
+        :param bool force: Rebuild even if the fingerprint is unchanged.
+        :return: Summary with keys "reloaded", "fingerprint" and, after a rebuild,
+            "chunks", "added", "removed" and "elapsed_seconds"
+        :rtype: dict
+        """
+        async with self._lock:
+            fingerprint = await self._safe_fingerprint()
+            if not force and (fingerprint is None or fingerprint == self.current_fingerprint):
+                return {"reloaded": False, "fingerprint": self.current_fingerprint}
+
+            start = time.perf_counter()
+            old_prompt = self._state.herald_prompt
+            new_prompt = await asyncio.to_thread(self._build_context, old_prompt)
+            new_app = HeraldApp(prompt=new_prompt)
+
+            # No await between these assignments, so no request can observe a half-swapped state
+            self._state.herald_prompt = new_prompt
+            self._state.herald_app = new_app
+            self.current_fingerprint = fingerprint
+
+            old_documents, new_documents = _indexed_documents(old_prompt), _indexed_documents(new_prompt)
+            summary = {
+                "reloaded": True,
+                "fingerprint": fingerprint,
+                "chunks": len(new_documents),
+                "added": len(new_documents - old_documents),
+                "removed": len(old_documents - new_documents),
+                "elapsed_seconds": round(time.perf_counter() - start, 3),
+            }
+            self.last_reload = {**summary, "reason": reason, "at": time.time()}
+            logger.info(
+                "CV reindexed (%s) in %.2fs: %d chunk(s), %d added, %d removed",
+                reason, summary["elapsed_seconds"], summary["chunks"], summary["added"], summary["removed"],
+            )
+
+        if old_prompt is not None and old_prompt is not new_prompt:
+            # in-flight requests may still be retrieving from the old context — release it later
+            asyncio.get_running_loop().call_later(RETIRE_DELAY_SECONDS, old_prompt.close)
+        return summary
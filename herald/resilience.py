@@ -0,0 +1,350 @@
+"""Latency and failure handling around the model providers.
+
+Hedging: a slow but successful Groq call holds the visitor for its full latency; the fallback
+model is only tried once Groq raises. With hedging enabled, a primary run that has not finished
+within the hedge delay gets the fallback agent started next to it, and whichever answers first
+wins. The delay is either fixed or a percentile of the primary's recently observed latency, so
+only the slowest tail of requests pays for a second model call. Latency is tracked per primary
+model (e.g. per routed tier), so a fast model's runs do not shorten a slower model's delay.
+
+Circuit breaking: during a provider outage every request would first wait for the failing call
+and then re-run on the fallback. One process-wide breaker per provider counts consecutive
+failures and the error rate of recent calls; once either crosses its threshold the circuit opens
+and callers skip the provider for a cooldown. After the cooldown a single probe request is let
+through (half-open): its success closes the circuit, its failure opens it again.
+
+Environment variables:
+    HEDGE_DELAY               - Seconds to wait for the primary before starting the fallback in
+                                parallel, or a percentile of observed primary latency such as "p90".
+                                Unset or empty disables hedging (default).
+    CIRCUIT_FAILURE_THRESHOLD - Consecutive failures that open a circuit (default: 5).
+    CIRCUIT_ERROR_RATE        - Error rate over the recent calls that opens a circuit (default: 0.5).
+    CIRCUIT_WINDOW            - Recent calls the error rate is computed over; the rate only counts
+                                once half of the window is filled (default: 20).
+    CIRCUIT_COOLDOWN          - Seconds an open circuit rejects calls before a probe (default: 30).
+"""
+
+import asyncio
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+LATENCY_WINDOW = 200
+# A percentile delay is only trusted once this many primary runs have been observed.
+MIN_LATENCY_SAMPLES = 20
+# Latency window of callers with a single primary model.
+DEFAULT_PRIMARY = "primary"
+
+_PERCENTILE_PATTERN = re.compile(r"p(\d{1,2}(?:\.\d+)?)")
+
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+DEFAULT_CIRCUIT_ERROR_RATE = 0.5
+DEFAULT_CIRCUIT_WINDOW = 20
+DEFAULT_CIRCUIT_COOLDOWN = 30.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Process-wide breakers; a provider outage affects every tenant and reloaded context alike.
+_BREAKERS = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        """Initialize an empty window.
+
+        :param int window: Number of most recent samples kept.
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        """Add a latency sample.
+
+        :param float seconds: Observed latency in seconds.
+        """
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the pct-th percentile of the window (nearest rank).
+
+        :param float pct: Percentile between 0 and 100.
+        :return: Latency in seconds, or None while the window is empty
+        :rtype: float | None
+        """
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class HedgePolicy:
+    """Decides how long the primary model runs alone before the fallback is hedged in."""
+
+    def __init__(self, delay: str = None):
+        """Initialize the policy.
+
+        :param str delay: Fixed delay in seconds or a latency percentile such as "p90", optional.
+            Defaults to HEDGE_DELAY. Empty disables hedging.
+        :raises ValueError: If the delay is neither a number nor a percentile
+        """
+        if delay is None:
+            delay = os.getenv("HEDGE_DELAY", "")
+        delay = delay.strip().lower()
+        self.fixed_delay = None
+        self.percentile = None
+        if (match := _PERCENTILE_PATTERN.fullmatch(delay)) is not None:
+            self.percentile = float(match.group(1))
+        elif delay:
+            try:
+                self.fixed_delay = float(delay)
+            except ValueError:
+                raise ValueError(
+                    f"Unsupported HEDGE_DELAY {delay!r}; expected seconds or a percentile like 'p90'"
+                ) from None
+        self._latencies = {}  # primary model → its latency window
+        self.hedged = 0
+        self.fallback_wins = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether hedging is configured at all."""
+        return self.fixed_delay is not None or self.percentile is not None
+
+    def latency(self, primary: str = DEFAULT_PRIMARY) -> LatencyTracker:
+        """Return the latency window of a primary model, creating it on first use.
+
+        :param str primary: Name of the primary model or tier, optional.
+        :return: The primary's latency window
+        :rtype: LatencyTracker
+        """
+        return self._latencies.setdefault(primary, LatencyTracker())
+
+    def delay(self, primary: str = DEFAULT_PRIMARY) -> float | None:
+        """Return the current hedge delay of a primary model.
+
+        :param str primary: Name of the primary model or tier, optional.
+        :return: Seconds the primary runs alone, or None if no run should be hedged yet
+        :rtype: float | None
+        """
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+        latency = self._latencies.get(primary)
+        if self.percentile is None or latency is None or len(latency) < MIN_LATENCY_SAMPLES:
+            return None
+        return latency.percentile(self.percentile)
+
+    def stats(self) -> dict:
+        """Report the hedging configuration and counters.
+
+        :return: Mapping with enabled, delay_seconds and samples per primary, hedged and fallback_wins
+        :rtype: dict
+        """
+        return {
+            "enabled": self.enabled,
+            "delay_seconds": {primary: self.delay(primary) for primary in self._latencies},
+            "samples": {primary: len(latency) for primary, latency in self._latencies.items()},
+            "hedged": self.hedged,
+            "fallback_wins": self.fallback_wins,
+        }
+
+
+async def first_successful(tasks: list) -> asyncio.Task:
+    """Wait for the first task to finish without an exception and cancel the others.
+
+    :param list tasks: Running tasks racing for the same result.
+    :return: The winning task
+    :rtype: asyncio.Task
+    :raises Exception: The last task's exception if every task failed
+    """
+    pending = set(tasks)
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class CircuitBreaker:  # pylint: disable=too-many-instance-attributes
+    """Closed / open / half-open circuit breaker for one model provider."""
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        name: str,
+        failure_threshold: int = None,
+        error_rate: float = None,
+        window: int = None,
+        cooldown: float = None,
+    ):
+        """Initialize a closed circuit.
+
+        :param str name: Provider name, used in logs and stats.
+        :param int failure_threshold: Consecutive failures that open the circuit, optional.
+            Defaults to CIRCUIT_FAILURE_THRESHOLD (5).
+        :param float error_rate: Error rate over the window that opens the circuit, optional.
+            Defaults to CIRCUIT_ERROR_RATE (0.5).
+        :param int window: Number of recent calls the error rate is computed over, optional.
+            Defaults to CIRCUIT_WINDOW (20).
+        :param float cooldown: Seconds the open circuit rejects calls, optional.
+            Defaults to CIRCUIT_COOLDOWN (30).
+        """
+        if failure_threshold is None:
+            failure_threshold = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", str(DEFAULT_CIRCUIT_FAILURE_THRESHOLD)))
+        if error_rate is None:
+            error_rate = float(os.getenv("CIRCUIT_ERROR_RATE", str(DEFAULT_CIRCUIT_ERROR_RATE)))
+        if window is None:
+            window = int(os.getenv("CIRCUIT_WINDOW", str(DEFAULT_CIRCUIT_WINDOW)))
+        if cooldown is None:
+            cooldown = float(os.getenv("CIRCUIT_COOLDOWN", str(DEFAULT_CIRCUIT_COOLDOWN)))
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.error_rate_threshold = error_rate
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self._outcomes = deque(maxlen=max(1, window))  # True for a failed call
+        self._opened_at = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def error_rate(self) -> float:
+        """Share of failed calls in the window."""
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def allow_request(self) -> bool:
+        """Decide whether a call may go to the provider.
+
+        An open circuit whose cooldown has passed turns half-open and admits exactly one probe.
+
+        :return: True if the caller should call the provider and report the outcome
+        :rtype: bool
+        """
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """Report a successful call."""
+        with self._lock:
+            self.consecutive_failures = 0
+            self._outcomes.append(False)
+            if self.state == HALF_OPEN:
+                logger.info("Circuit %s closed after a successful probe", self.name)
+                self.state = CLOSED
+                self._outcomes.clear()
+                self._probe_in_flight = False
+
+    def record_failure(self):
+        """Report a failed call, opening the circuit when a threshold is crossed."""
+        with self._lock:
+            self.consecutive_failures += 1
+            self._outcomes.append(True)
+            tripped = self.consecutive_failures >= self.failure_threshold or (
+                2 * len(self._outcomes) >= self._outcomes.maxlen and self.error_rate >= self.error_rate_threshold
+            )
+            if self.state == HALF_OPEN or (self.state == CLOSED and tripped):
+                logger.warning(
+                    "Circuit %s opened for %.0fs (%d consecutive failures, %.0f%% error rate)",
+                    self.name, self.cooldown, self.consecutive_failures, 100 * self.error_rate,
+                )
+                self.state = OPEN
+                self.times_opened += 1
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def release(self):
+        """Report a call that ended without a verdict on the provider, e.g. a cancelled hedge loser."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    @contextmanager
+    def track(self, failures: tuple):
+        """Record the outcome of the call made inside the block.
+
+        :param tuple failures: Exception types that count against the provider. Anything else,
+            including cancellation, releases the call without a verdict.
+        """
+        try:
+            yield
+        except failures:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success()
+
+    def stats(self) -> dict:
+        """Report the circuit state and counters.
+
+        :return: Mapping with state, consecutive_failures, error_rate, window_calls, times_opened
+            and retry_in_seconds (None unless open)
+        :rtype: dict
+        """
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "error_rate": self.error_rate,
+                "window_calls": len(self._outcomes),
+                "times_opened": self.times_opened,
+                "retry_in_seconds": retry_in,
+            }
+
+
+def circuit_breaker(provider: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker of a model provider, creating it on first use.
+
+    :param str provider: Provider name.
+    :return: The provider's circuit breaker
+    :rtype: CircuitBreaker
+    """
+    if provider not in _BREAKERS:
+        with _BREAKERS_LOCK:
+            if provider not in _BREAKERS:
+                _BREAKERS[provider] = CircuitBreaker(provider)
+    return _BREAKERS[provider]
+
+
+def circuit_breakers() -> dict:
+    """Return every circuit breaker created so far.
+
+    :return: Mapping of provider name to CircuitBreaker
+    :rtype: dict
+    """
+    return dict(_BREAKERS)
@@ -0,0 +1,214 @@
+"""Complexity-aware routing of questions between a fast and a large Groq model.
+
+Most visitor questions are simple lookups ("what's your email?", "which degree do you have?") that a
+small model answers from one retrieval as well as the 120B model, in a fraction of the time. Only
+synthesis questions ("summarise your career arc", "how did your focus change over time?") need the
+large model. The router decides per question, locally and before the agent runs:
+
+- a long message, or one whose pre-retrieval predicted several CV sections, goes to the large model;
+- so does a message naming a synthesis task (summarise, compare, overview, ...);
+- with an embedding model (RAG), the rest is routed by its most similar example question
+  (see herald.exemplars); without one it goes to the fast model.
+
+When the decision cannot be made, the large model answers. Decisions are logged on the
+``herald.routing`` logger, and per-route counts, reasons, latency and tokens are reported by
+``ModelRouter.stats``. Answers of the fallback model are reported apart from both tiers.
+
+Environment variables:
+    MODEL_ROUTING          - Route simple questions to the fast model (default: true). "false" sends
+                             every question to the large model.
+    FAST_MODEL             - Groq model answering simple questions (default: "openai/gpt-oss-20b").
+    LARGE_MODEL            - Groq model answering synthesis questions (default: "openai/gpt-oss-120b").
+    ROUTING_MAX_FAST_WORDS - Longest message, in words, the fast model may answer (default: 20).
+"""
+
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+from herald.exemplars import ExemplarIndex
+
+logger = logging.getLogger(__name__)
+
+FAST = "fast"
+LARGE = "large"
+DEFAULT_FAST_MODEL = "openai/gpt-oss-20b"
+DEFAULT_LARGE_MODEL = "openai/gpt-oss-120b"
+DEFAULT_ROUTING_MAX_FAST_WORDS = 20
+
+_SYNTHESIS_PATTERN = re.compile(
+    r"\b(summar\w*|overview|compar\w*|contrast|career (?:arc|path|journey|progression)|evolv\w*|evolution"
+    r"|over time|trajectory|strengths?|weakness\w*|why should|what makes you|yourself|pros and cons)\b",
+    re.IGNORECASE,
+)
+
+ROUTE_EXEMPLARS = {
+    FAST: (
+        "What's your email?",
+        "How can I contact you?",
+        "Where do you work now?",
+        "What is your current job title?",
+        "Which university did you go to?",
+        "What degree do you have?",
+        "Do you know Python?",
+        "Have you used AWS?",
+        "Which certifications do you hold?",
+        "When did you start your current job?",
+        "What languages do you speak?",
+        "Where are you based?",
+    ),
+    LARGE: (
+        "Summarise your career arc.",
+        "Give me an overview of your background.",
+        "How has your focus changed over the years?",
+        "What ties your roles together?",
+        "Compare your work at your last two companies.",
+        "What makes you a good fit for a senior engineering role?",
+        "Which of your projects had the biggest impact and why?",
+        "Walk me through how you grew as an engineer.",
+        "How do your skills and experience complement each other?",
+        "Tell me about yourself.",
+    ),
+}
+
+
+def routing_enabled() -> bool:
+    """Whether questions are routed between the model tiers (MODEL_ROUTING).
+
+    :rtype: bool
+    """
+    return os.getenv("MODEL_ROUTING", "true").strip().lower() in ("1", "true", "yes")
+
+
+def tier_models() -> dict:
+    """Return the Groq model of each tier, as configured by FAST_MODEL and LARGE_MODEL.
+
+    :return: Mapping of tier to model name
+    :rtype: dict
+    """
+    return {
+        FAST: os.getenv("FAST_MODEL", DEFAULT_FAST_MODEL),
+        LARGE: os.getenv("LARGE_MODEL", DEFAULT_LARGE_MODEL),
+    }
+
+
+@dataclass
+class RouteDecision:
+    """The tier a question was routed to, and why."""
+
+    tier: str
+    reason: str
+    started: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class _RouteStats:
+    """Counters of the questions routed to one tier."""
+
+    requests: int = 0
+    answered: int = 0
+    seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    reasons: dict = field(default_factory=dict)
+
+    def stats(self, model: str) -> dict:
+        """Average the counters per answered question."""
+        return {
+            "model": model,
+            "requests": self.requests,
+            "reasons": dict(self.reasons),
+            "seconds_per_answer": self.seconds / self.answered if self.answered else None,
+            "input_tokens_per_answer": self.input_tokens / self.answered if self.answered else None,
+            "output_tokens_per_answer": self.output_tokens / self.answered if self.answered else None,
+        }
+
+
+class ModelRouter:
+    """Decides which model tier answers a question and keeps per-route statistics."""
+
+    def __init__(self, embed_query=None, embed_texts=None, max_fast_words: int = None, fallback_model: str = None):
+        """Initialize the router.
+
+        :param embed_query: Coroutine function embedding one message, optional. Without it, questions are
+            routed by the heuristics alone.
+        :param embed_texts: Function embedding a list of texts, run in the retrieval pool. Required with embed_query.
+        :param int max_fast_words: Longest message the fast model may answer, optional.
+            Defaults to ROUTING_MAX_FAST_WORDS (20).
+        :param str fallback_model: Model answering when the routed tier fails or loses a hedge, optional.
+        """
+        if max_fast_words is None:
+            max_fast_words = int(os.getenv("ROUTING_MAX_FAST_WORDS", str(DEFAULT_ROUTING_MAX_FAST_WORDS)))
+        self.max_fast_words = max_fast_words
+        self.models = tier_models()
+        self.fallback_model = fallback_model
+        self._embed_query = embed_query
+        self._exemplars = ExemplarIndex(ROUTE_EXEMPLARS, embed_texts) if embed_query is not None else None
+        self._routes = {FAST: _RouteStats(), LARGE: _RouteStats()}
+        self._fallback = _RouteStats()  # answers of the fallback model, with the tier each was routed to
+
+    async def route(self, message: str, topics: list = None) -> RouteDecision:
+        """Route a question to a tier. Fails safe: a question that cannot be classified goes to the large model.
+
+        :param str message: The visitor's message.
+        :param list topics: CV sections pre-retrieval predicted for the message, optional.
+        :return: The decision
+        :rtype: RouteDecision
+        """
+        try:
+            decision = await self._decide(message, topics or [])
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning("Could not route the message; answering with the large model", exc_info=True)
+            decision = RouteDecision(LARGE, "error")
+        route = self._routes[decision.tier]
+        route.requests += 1
+        route.reasons[decision.reason] = route.reasons.get(decision.reason, 0) + 1
+        logger.info("Route %s [reason=%s topics=%s]: %r", decision.tier, decision.reason, topics, message)
+        return decision
+
+    async def _decide(self, message: str, topics: list) -> RouteDecision:
+        """Apply the heuristics, then the embedding classifier."""
+        if len(message.split()) > self.max_fast_words:
+            return RouteDecision(LARGE, "length")
+        if len(topics) > 1:
+            return RouteDecision(LARGE, "topics")
+        if _SYNTHESIS_PATTERN.search(message):
+            return RouteDecision(LARGE, "keywords")
+        if self._exemplars is None:
+            return RouteDecision(FAST, "heuristics")
+        best = await self._exemplars.best_similarities(await self._embed_query(message))
+        return RouteDecision(LARGE if best[LARGE] > best[FAST] else FAST, "embedding")
+
+    def record(self, decision: RouteDecision, usage, fallback: bool = False):
+        """Count an answered question in its route, or apart from both tiers if the fallback model answered it.
+
+        :param RouteDecision decision: The question's route.
+        :param Usage usage: Tokens of the agent run that answered it.
+        :param bool fallback: Whether the fallback model answered instead of the routed tier.
+        """
+        if fallback:
+            route = self._fallback
+            route.requests += 1
+            route.reasons[decision.tier] = route.reasons.get(decision.tier, 0) + 1
+        else:
+            route = self._routes[decision.tier]
+        route.answered += 1
+        route.seconds += time.perf_counter() - decision.started
+        route.input_tokens += usage.input_tokens
+        route.output_tokens += usage.output_tokens
+
+    def stats(self) -> dict:
+        """Report the routing configuration and the counters of each route.
+
+        :return: Mapping with max_fast_words and, per tier, its model, requests, decision reasons and
+            the seconds and tokens per answer of the answers the tier gave; "fallback" has the same
+            counters for the fallback model's answers, with the routed tiers as reasons
+        :rtype: dict
+        """
+        return {
+            "max_fast_words": self.max_fast_words,
+            "routes": {tier: route.stats(self.models[tier]) for tier, route in self._routes.items()},
+            "fallback": self._fallback.stats(self.fallback_model),
+        }
@@ -0,0 +1,89 @@
+"""In-flight deduplication of identical opening questions.
+
+When a portfolio link is shared, many visitors open the chat with the same question at the same
+moment, and each of them would trigger an agent run of its own. Opening questions carry no
+conversation history, so their answer only depends on the message and the CV. Concurrent opening
+questions with the same normalized message and CV version therefore await one shared agent run;
+its turn is then appended to each visitor's own session.
+
+The shared run keeps going when the visitor who started it disconnects, as long as the run is
+awaited by other visitors; its failure is raised to every visitor waiting for it.
+
+Environment variables:
+    SINGLEFLIGHT - Coalesce concurrent identical opening questions (default: true).
+"""
+
+import asyncio
+import os
+import re
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def singleflight_enabled() -> bool:
+    """Whether opening questions are coalesced (SINGLEFLIGHT).
+
+    :rtype: bool
+    """
+    return os.getenv("SINGLEFLIGHT", "true").strip().lower() in ("1", "true", "yes")
+
+
+def normalize_message(message: str) -> str:
+    """Normalize a message for coalescing: case, surrounding and repeated whitespace, trailing punctuation.
+
+    :param str message: The visitor's message.
+    :return: Normalized message
+    :rtype: str
+    """
+    return _WHITESPACE.sub(" ", message).strip().lower().rstrip("?!. ")
+
+
+class SingleFlight:
+    """Runs one call per key at a time and shares its result with every concurrent caller."""
+
+    def __init__(self):
+        """Initialize with no call in flight."""
+        self._calls = {}  # key → task of the call in flight
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key, call) -> tuple:
+        """Await the call in flight for key, or start it.
+
+        :param key: Hashable identity of the call.
+        :param call: Coroutine function starting the call, used if none is in flight.
+        :return: Tuple of (result of the call, whether it was shared with an earlier caller)
+        :rtype: tuple
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            self.coalesced += 1
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # shielded: a caller that goes away must not cancel the run the others are waiting for
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key, task: asyncio.Task):
+        """Drop a finished call, so later callers start a new one."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here, in case every caller went away before it finished
+
+    def stats(self) -> dict:
+        """Report how many callers started a run and how many joined one in flight.
+
+        :return: Mapping with leaders, coalesced, coalesced_share and in_flight
+        :rtype: dict
+        """
+        requests = self.leaders + self.coalesced
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_share": self.coalesced / requests if requests else None,
+            "in_flight": len(self._calls),
+        }
@@ -0,0 +1,38 @@
+"""Local on-disk cache location for Herald.
+
+All disk caches (embeddings, converted markdown, downloaded objects, ...) live under a
+single directory so that a Railway volume or a CI cache only has to mount one path.
+
+Environment variables:
+    HERALD_CACHE_DIR - Cache root directory (default: .herald_cache).
+                       Set to an empty string to disable every disk cache.
+"""
+
+import os
+
+DEFAULT_CACHE_DIR = ".herald_cache"
+
+
+def cache_root() -> str | None:
+    """Return the cache root directory, or None when disk caching is disabled.
+
+    :return: Cache root directory path, or None
+    :rtype: str | None
+    """
+    root = os.getenv("HERALD_CACHE_DIR", DEFAULT_CACHE_DIR)
+    return root or None
+
+
+def cache_path(*parts: str) -> str | None:
+    """Return a path inside the cache root, creating the parent directory on demand.
+
+    :param str parts: Path components relative to the cache root.
+    :return: Absolute-or-relative path inside the cache root, or None when caching is disabled
+    :rtype: str | None
+    """
+    root = cache_root()
+    if root is None:
+        return None
+    path = os.path.join(root, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
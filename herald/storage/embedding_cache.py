@@ -0,0 +1,133 @@
+"""Persistent, content-addressed embedding cache for Herald.
+
+Embeddings are keyed by ``sha256(model identity + normalized chunk text)`` so an unchanged
+chunk embedded by the same model is never sent through the ONNX runtime twice, across
+restarts, redeploys and replicas sharing the cache volume.
+"""
+
+import hashlib
+import logging
+import sqlite3
+from array import array
+
+from herald.storage.cache import cache_path
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_FILE = "embeddings.db"
+
+
+def content_hash(text: str, model_id: str = "") -> str:
+    """Return the content address of a text for the given embedding model.
+
+    :param str text: Normalized chunk text.
+    :param str model_id: Identity of the embedding model, optional.
+    :return: Hex encoded SHA-256 digest
+    :rtype: str
+    """
+    return hashlib.sha256(f"{model_id}\n{text}".encode("utf-8")).hexdigest()
+
+
+def embedding_model_id(embedding_function) -> str:
+    """Return a stable identity string for a ChromaDB embedding function.
+
+    :param embedding_function: ChromaDB compatible embedding function.
+    :return: Model identity used as part of the cache key
+    :rtype: str
+    """
+    name = getattr(embedding_function, "name", None)
+    name = name() if callable(name) else type(embedding_function).__name__
+    if name == "default":
+        # DefaultEmbeddingFunction delegates to the bundled ONNX all-MiniLM-L6-v2 model.
+        name = "onnx/all-MiniLM-L6-v2"
+    get_config = getattr(embedding_function, "get_config", None)
+    config = get_config() if callable(get_config) else {}
+    config_str = ",".join(f"{k}={v}" for k, v in sorted(config.items())) if isinstance(config, dict) else ""
+    return f"{name}[{config_str}]"
+
+
+class EmbeddingCache:
+    """SQLite backed embedding cache keyed by content hash."""
+
+    def __init__(self, db_path: str, model_id: str):
+        """Initialize the embedding cache.
+
+        :param str db_path: Path to the SQLite database file.
+        :param str model_id: Identity of the embedding model the vectors belong to.
+        """
+        self.db_path = db_path
+        self.model_id = model_id
+        self._init_db()
+
+    @classmethod
+    def from_env(cls, model_id: str):
+        """Create the cache inside HERALD_CACHE_DIR, or return None when disk caching is disabled.
+
+        :param str model_id: Identity of the embedding model.
+        :return: Embedding cache instance or None
+        :rtype: EmbeddingCache | None
+        """
+        db_path = cache_path(EMBEDDING_CACHE_FILE)
+        return cls(db_path, model_id) if db_path else None
+
+    def _init_db(self):
+        """Create the embeddings table if it doesn't exist."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key    TEXT PRIMARY KEY,
+                    model  TEXT NOT NULL,
+                    dim    INTEGER NOT NULL,
+                    vector BLOB NOT NULL
+                )
+            """)
+
+    def key(self, text: str) -> str:
+        """Return the cache key for a text under this cache's model.
+
+        :param str text: Normalized chunk text.
+        :return: Cache key
+        :rtype: str
+        """
+        return content_hash(text, self.model_id)
+
+    def get_many(self, texts: list) -> dict:
+        """Look up cached embeddings.
+
+        :param list texts: Normalized chunk texts.
+        :return: Mapping of text to embedding for every cache hit
+        :rtype: dict
+        """
+        keys = {self.key(text): text for text in texts}
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",  # nosec - placeholders only
+                list(keys),
+            ).fetchall()
+        hits = {}
+        for key, blob in rows:
+            vector = array("f")
+            vector.frombytes(blob)
+            hits[keys[key]] = vector.tolist()
+        return hits
+
+    def put_many(self, embeddings: dict):
+        """Store embeddings in the cache.
+
+        :param dict embeddings: Mapping of normalized chunk text to embedding vector.
+        """
+        rows = [
+            (self.key(text), self.model_id, len(vector), array("f", vector).tobytes())
+            for text, vector in embeddings.items()
+        ]
+        if not rows:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vector) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        logger.debug("Stored %d embeddings in cache %s", len(rows), self.db_path)
@@ -0,0 +1,148 @@
+"""Disk cache for PDF-to-markdown conversions.
+
+``pymupdf4llm.to_markdown`` is the slowest single step at startup. Its output only depends on
+the PDF bytes and the converter version, so converted markdown is stored as
+``<cache root>/markdown/<pymupdf4llm version>/<sha256 of the PDF>.md`` and reused while the
+PDF is unchanged.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import time
+from importlib import metadata
+
+from herald.storage.cache import cache_root
+
+logger = logging.getLogger(__name__)
+
+MARKDOWN_CACHE_DIR = "markdown"
+
+
+def pdf_sha256(pdf_bytes: bytes) -> str:
+    """Return the hex SHA-256 digest of PDF bytes.
+
+    :param bytes pdf_bytes: Raw PDF file contents.
+    :return: Hex encoded SHA-256 digest
+    :rtype: str
+    """
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def _converter_version() -> str:
+    """Return the installed pymupdf4llm version without importing it."""
+    try:
+        return metadata.version("pymupdf4llm")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class MarkdownCache:
+    """Directory of converted CV markdown files keyed by PDF hash."""
+
+    def __init__(self, cache_dir: str, converter_version: str = None):
+        """Initialize the markdown cache.
+
+        :param str cache_dir: Directory holding the cached markdown files.
+        :param str converter_version: Converter version the entries belong to, optional.
+            Defaults to the installed pymupdf4llm version.
+        """
+        self.cache_dir = cache_dir
+        self.converter_version = converter_version or _converter_version()
+
+    @classmethod
+    def from_env(cls):
+        """Create the cache inside HERALD_CACHE_DIR, or return None when disk caching is disabled.
+
+        :return: Markdown cache instance or None
+        :rtype: MarkdownCache | None
+        """
+        root = cache_root()
+        return cls(os.path.join(root, MARKDOWN_CACHE_DIR)) if root else None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, self.converter_version, f"{key}.md")
+
+    def get(self, key: str) -> str | None:
+        """Return the cached markdown for a PDF hash.
+
+        :param str key: SHA-256 of the PDF bytes.
+        :return: Cached markdown, or None on a miss
+        :rtype: str | None
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as file:
+            markdown = file.read()
+        os.utime(path)  # refresh mtime so pruning by age keeps entries that are still in use
+        logger.info("Markdown cache hit for PDF %s", key[:12])
+        return markdown
+
+    def put(self, key: str, markdown: str):
+        """Store converted markdown for a PDF hash.
+
+        :param str key: SHA-256 of the PDF bytes.
+        :param str markdown: Converted markdown.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(markdown)
+        os.replace(tmp_path, path)
+
+    def entries(self) -> list:
+        """List cached entries, most recently used first.
+
+        :return: One dict per entry with keys "key", "converter_version", "size" and "last_used"
+        :rtype: list
+        """
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for version in os.listdir(self.cache_dir):
+            version_dir = os.path.join(self.cache_dir, version)
+            if not os.path.isdir(version_dir):
+                continue
+            for name in os.listdir(version_dir):
+                if not name.endswith(".md"):
+                    continue
+                stat = os.stat(os.path.join(version_dir, name))
+                entries.append({
+                    "key": name[:-len(".md")],
+                    "converter_version": version,
+                    "size": stat.st_size,
+                    "last_used": stat.st_mtime,
+                })
+        return sorted(entries, key=lambda entry: entry["last_used"], reverse=True)
+
+    def prune(self, max_age_days: float = None, max_entries: int = None) -> int:
+        """Remove stale entries.
+
+        Entries written by other converter versions are always removed, since they can never be hit.
+
+        :param float max_age_days: Remove entries not used for longer than this, optional.
+        :param int max_entries: Keep at most this many most recently used entries, optional.
+        :return: Number of entries removed
+        :rtype: int
+        """
+        removed = 0
+        if os.path.isdir(self.cache_dir):
+            for version in os.listdir(self.cache_dir):
+                version_dir = os.path.join(self.cache_dir, version)
+                if version != self.converter_version and os.path.isdir(version_dir):
+                    removed += len([name for name in os.listdir(version_dir) if name.endswith(".md")])
+                    shutil.rmtree(version_dir, ignore_errors=True)
+
+        now = time.time()
+        for position, entry in enumerate(self.entries()):
+            too_old = max_age_days is not None and now - entry["last_used"] > max_age_days * 86400
+            too_many = max_entries is not None and position >= max_entries
+            if too_old or too_many:
+                os.remove(self._path(entry["key"]))
+                removed += 1
+
+        logger.info("Pruned %d markdown cache entr%s", removed, "y" if removed == 1 else "ies")
+        return removed
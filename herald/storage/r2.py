@@ -3,21 +3,40 @@
 Downloads the CV PDF from a Cloudflare R2 bucket using the S3-compatible API.
 boto3 is used as the client since R2 is S3-compatible.
 
+The downloaded object is kept in a local object cache under HERALD_CACHE_DIR together with its
+ETag. Later downloads revalidate with ``If-None-Match`` and skip the transfer entirely while the
+object is unchanged; changed objects are streamed straight to the cache file.
+
 Required environment variables:
     R2_ACCOUNT_ID        - Cloudflare account ID (shown on the R2 overview page)
     R2_ACCESS_KEY_ID     - R2 API token access key
     R2_SECRET_ACCESS_KEY - R2 API token secret key
     R2_BUCKET_NAME       - Name of the R2 bucket holding the CV
     CV_OBJECT_KEY        - Object key of the CV file (default: cv.pdf)
+
+Optional environment variables:
+    R2_ENDPOINT_URL          - Override the R2 endpoint, e.g. a local S3-compatible server for testing
+    R2_MAX_POOL_CONNECTIONS  - Size of the shared client's HTTP connection pool (default: 10)
 """
 
 import logging
 import os
+import threading
 
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from herald.storage.cache import cache_path, cache_root
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+_STREAM_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
 
 def _build_r2_client():
     """Build and return a boto3 client pointed at Cloudflare R2.
@@ -42,27 +61,136 @@ def _build_r2_client():
 
     return boto3.client(
         "s3",
-        endpoint_url=f"https://{account_id}.r2.cloudflarestorage.com",
+        endpoint_url=os.getenv("R2_ENDPOINT_URL") or f"https://{account_id}.r2.cloudflarestorage.com",
         aws_access_key_id=access_key,
         aws_secret_access_key=secret_key,
         region_name="auto",
+        config=Config(
+            max_pool_connections=int(os.getenv("R2_MAX_POOL_CONNECTIONS", str(DEFAULT_MAX_POOL_CONNECTIONS))),
+            tcp_keepalive=True,
+            retries={"max_attempts": 3, "mode": "standard"},
+        ),
     )
 
 
-def download_cv_bytes() -> bytes:
-    """Download the CV PDF from Cloudflare R2 and return its raw bytes.
+def get_r2_client():
+    """Return the process-wide R2 client, building it on first use.
 
-    :raises ValueError: If R2_BUCKET_NAME is not set or credentials are missing.
-    :return: PDF file contents as bytes
-    :rtype: bytes
+    boto3 clients are thread-safe, so one client (and its connection pool) is shared by every
+    download and revalidation in the process.
+
+    :raises ValueError: If any required R2 credential env var is missing.
+    :return: Shared boto3 S3 client
+    """
+    global _CLIENT  # pylint: disable=global-statement
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = _build_r2_client()
+    return _CLIENT
+
+
+def _cv_location() -> tuple:
+    """Return the (bucket, object key) of the CV.
+
+    :raises ValueError: If R2_BUCKET_NAME is not set.
+    :return: Tuple of (bucket, object_key)
+    :rtype: tuple
     """
     bucket = os.getenv("R2_BUCKET_NAME")
     object_key = os.getenv("CV_OBJECT_KEY", "cv.pdf")
 
     if not bucket:
         raise ValueError("R2_BUCKET_NAME environment variable is not set.")
+    return bucket, object_key
+
+
+def _is_not_modified(exc: ClientError) -> bool:
+    """Return True if a ClientError is an HTTP 304 Not Modified answer to a conditional request."""
+    error_code = exc.response.get("Error", {}).get("Code")
+    status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return error_code in ("304", "NotModified") or status == 304
+
+
+def download_cv_file() -> str | None:
+    """Sync the CV PDF into the local object cache and return the cached file path.
+
+    The cached ETag is sent as ``If-None-Match``; an unchanged object costs a single 304 round trip.
+    A changed object is streamed to a temporary file in chunks and moved into place atomically.
+
+    :raises ValueError: If R2_BUCKET_NAME is not set or credentials are missing.
+    :return: Path of the cached PDF, or None when disk caching is disabled
+    :rtype: str | None
+    """
+    if cache_root() is None:
+        return None
+    bucket, object_key = _cv_location()
+    path = cache_path("r2", bucket, object_key)
+
+    etag_path = f"{path}.etag"
+    cached_etag = None
+    if os.path.exists(path) and os.path.exists(etag_path):
+        with open(etag_path, "r", encoding="utf-8") as file:
+            cached_etag = file.read().strip() or None
+
+    request = {"Bucket": bucket, "Key": object_key}
+    if cached_etag:
+        request["IfNoneMatch"] = cached_etag
+
+    client = get_r2_client()
+    logger.info("Syncing CV from R2 bucket '%s', key '%s' (cached ETag: %s)", bucket, object_key, cached_etag)
+    try:
+        response = client.get_object(**request)
+    except ClientError as exc:
+        if cached_etag and _is_not_modified(exc):
+            logger.info("CV unchanged in R2 (ETag %s) — using cached copy", cached_etag)
+            return path
+        raise
+
+    tmp_path = f"{path}.part"
+    size = 0
+    with open(tmp_path, "wb") as file:
+        for chunk in response["Body"].iter_chunks(chunk_size=_STREAM_CHUNK_SIZE):
+            file.write(chunk)
+            size += len(chunk)
+    os.replace(tmp_path, path)
+    with open(etag_path, "w", encoding="utf-8") as file:
+        file.write(response.get("ETag", ""))
+
+    logger.info("CV downloaded successfully (%d bytes, ETag %s)", size, response.get("ETag"))
+    return path
+
+
+def head_cv_etag() -> str:
+    """Return the current ETag of the CV object without downloading it.
+
+    Used by the CV watcher to detect changes with a single HEAD request.
+
+    :raises ValueError: If R2_BUCKET_NAME is not set or credentials are missing.
+    :return: ETag of the CV object
+    :rtype: str
+    """
+    bucket, object_key = _cv_location()
+    response = get_r2_client().head_object(Bucket=bucket, Key=object_key)
+    return response.get("ETag", "")
+
+
+def download_cv_bytes() -> bytes:
+    """Download the CV PDF from Cloudflare R2 and return its raw bytes.
+
+    Served from the local object cache when it is enabled and the object is unchanged.
+
+    :raises ValueError: If R2_BUCKET_NAME is not set or credentials are missing.
+    :return: PDF file contents as bytes
+    :rtype: bytes
+    """
+    path = download_cv_file()
+    if path is not None:
+        with open(path, "rb") as file:
+            return file.read()
 
-    client = _build_r2_client()
+    bucket, object_key = _cv_location()
+    client = get_r2_client()
 
     logger.info("Downloading CV from R2 bucket '%s', key '%s'", bucket, object_key)
     response = client.get_object(Bucket=bucket, Key=object_key)
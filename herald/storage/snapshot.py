@@ -0,0 +1,180 @@
+"""Prebuilt knowledge snapshot for Herald.
+
+A snapshot bundles everything the RAG context manager derives from the CV PDF — the markdown,
+the parsed chunks, the normalized chunk documents, their topics and their embeddings, and the
+embeddings of the queries the system prompt prescribes — in one
+versioned file, so the server can start without PyMuPDF, without embedding the CV and without
+reaching Cloudflare R2.
+
+File layout (little-endian)::
+
+    8 bytes   magic b"HRLDSNAP"
+    uint32    format version
+    uint32    header length in bytes
+    bytes     UTF-8 JSON header (metadata, markdown, chunks, documents, topics, query embeddings)
+    padding   up to the next 64-byte boundary
+    float32   embedding matrix, ``count x dim`` rows, C order
+
+The embedding matrix is memory-mapped on load, so opening a snapshot costs one header parse.
+
+Environment variables:
+    HERALD_SNAPSHOT_PATH - Snapshot to load at startup instead of converting and embedding the CV.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"HRLDSNAP"
+SNAPSHOT_VERSION = 1
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 64
+
+
+@dataclass
+class KnowledgeSnapshot:  # pylint: disable=too-many-instance-attributes
+    """In-memory view of a knowledge snapshot file."""
+
+    version: int
+    created_at: float
+    model_id: str
+    markdown_sha256: str
+    markdown: str
+    chunks: list
+    documents: list
+    topics: list
+    embeddings: np.ndarray
+    query_embeddings: dict = field(default_factory=dict)
+
+
+def write_snapshot(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    path: str,
+    markdown: str,
+    chunks: list,
+    documents: list,
+    topics: list,
+    embeddings: list,
+    model_id: str,
+    query_embeddings: dict = None,
+) -> str:
+    """Write a knowledge snapshot atomically.
+
+    :param str path: Destination file path.
+    :param str markdown: CV content in markdown format.
+    :param list chunks: Parsed CV chunks.
+    :param list documents: Normalized chunk documents, one per embedding row.
+    :param list topics: Topic of each document.
+    :param list embeddings: Embedding vector of each document.
+    :param str model_id: Identity of the embedding model that produced the vectors.
+    :param dict query_embeddings: Mapping of query text to its embedding, loaded into the query cache
+        so the server starts without running the embedding model, optional.
+    :raises ValueError: If documents, topics and embeddings differ in length.
+    :return: The path written
+    :rtype: str
+    """
+    if not len(documents) == len(topics) == len(embeddings):
+        raise ValueError("Snapshot documents, topics and embeddings must have the same length.")
+
+    matrix = np.asarray(embeddings, dtype="<f4")
+    if matrix.ndim != 2:
+        matrix = matrix.reshape(len(documents), -1 if len(documents) else 0)
+    header = json.dumps({
+        "created_at": time.time(),
+        "model_id": model_id,
+        "markdown_sha256": hashlib.sha256(markdown.encode("utf-8")).hexdigest(),
+        "count": int(matrix.shape[0]),
+        "dim": int(matrix.shape[1]),
+        "markdown": markdown,
+        "chunks": chunks,
+        "documents": documents,
+        "topics": topics,
+        "query_embeddings": {
+            query: [float(value) for value in embedding] for query, embedding in (query_embeddings or {}).items()
+        },
+    }).encode("utf-8")
+
+    data_offset = _PREAMBLE.size + len(header)
+    padding = -data_offset % _ALIGNMENT
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)))
+        file.write(header)
+        file.write(b"\0" * padding)
+        file.write(np.ascontiguousarray(matrix).tobytes())
+    os.replace(tmp_path, path)
+
+    logger.info("Wrote knowledge snapshot %s (%d chunks, dim %d)", path, matrix.shape[0], matrix.shape[1])
+    return path
+
+
+def load_snapshot(path: str) -> KnowledgeSnapshot:
+    """Load a knowledge snapshot, memory-mapping its embedding matrix.
+
+    :param str path: Snapshot file path.
+    :raises ValueError: If the file is not a snapshot or has an unsupported version.
+    :return: The loaded snapshot
+    :rtype: KnowledgeSnapshot
+    """
+    with open(path, "rb") as file:
+        magic, version, header_len = _PREAMBLE.unpack(file.read(_PREAMBLE.size))
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"'{path}' is not a Herald knowledge snapshot.")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot version {version} in '{path}' (expected {SNAPSHOT_VERSION}). "
+                "Rebuild it with `herald build-snapshot`."
+            )
+        header = json.loads(file.read(header_len).decode("utf-8"))
+
+    data_offset = _PREAMBLE.size + header_len
+    data_offset += -data_offset % _ALIGNMENT
+    count, dim = header["count"], header["dim"]
+    if count:
+        embeddings = np.memmap(path, dtype="<f4", mode="r", offset=data_offset, shape=(count, dim))
+    else:
+        embeddings = np.empty((0, dim), dtype="<f4")
+
+    return KnowledgeSnapshot(
+        version=version,
+        created_at=header["created_at"],
+        model_id=header["model_id"],
+        markdown_sha256=header["markdown_sha256"],
+        markdown=header["markdown"],
+        chunks=header["chunks"],
+        documents=header["documents"],
+        topics=header["topics"],
+        embeddings=embeddings,
+        query_embeddings=header["query_embeddings"],
+    )
+
+
+def load_snapshot_from_env(snapshot_path: str = None) -> KnowledgeSnapshot | None:
+    """Load the configured snapshot, if any.
+
+    :param str snapshot_path: Snapshot path, optional. Defaults to HERALD_SNAPSHOT_PATH.
+    :return: The loaded snapshot, or None when no snapshot is configured or the file is missing
+    :rtype: KnowledgeSnapshot | None
+    """
+    snapshot_path = snapshot_path or os.getenv("HERALD_SNAPSHOT_PATH")
+    if not snapshot_path:
+        return None
+    if not os.path.exists(snapshot_path):
+        logger.warning("Snapshot '%s' not found — falling back to building the context from the CV", snapshot_path)
+        return None
+
+    start = time.perf_counter()
+    snapshot = load_snapshot(snapshot_path)
+    logger.info(
+        "Loaded knowledge snapshot %s (%d chunks) in %.1f ms",
+        snapshot_path, len(snapshot.documents), (time.perf_counter() - start) * 1000,
+    )
+    return snapshot
@@ -0,0 +1,277 @@
+"""Multi-tenant serving for Herald.
+
+One process can serve many personas. Each tenant lives in its own directory::
+
+    <HERALD_TENANTS_DIR>/<tenant_id>/
+        herald.snapshot   prebuilt knowledge snapshot (used when present), or
+        cv.pdf            the tenant's CV
+        tenant.json       optional: {"name": "Jane Doe", "prompt_option": "rag"}
+
+A tenant's context (markdown, chunks, vector store) and its HeraldApp are built on first use
+and kept in an LRU. When the estimated memory of the loaded tenants exceeds the budget, the
+least recently used tenants are evicted; they are simply rebuilt on their next request.
+
+Environment variables:
+    HERALD_TENANTS_DIR       - Directory holding one sub-directory per tenant (unset: single-tenant mode).
+    HERALD_TENANT_MEMORY_MB  - Memory budget for loaded tenant contexts (default: 1024).
+    HERALD_MAX_TENANTS       - Upper bound on loaded tenants regardless of memory (default: unlimited).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from herald.app import HeraldApp
+from herald.context_manager.factory import build_context
+from herald.reloader import RETIRE_DELAY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT_MEMORY_MB = 1024
+TENANT_CONFIG_FILE = "tenant.json"
+TENANT_SNAPSHOT_FILE = "herald.snapshot"
+TENANT_CV_FILE = "cv.pdf"
+
+_TENANT_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+# Rough per-tenant footprint besides the CV data: agents, tool wrappers, BM25 and vector index bookkeeping
+_TENANT_OVERHEAD_BYTES = 256 * 1024
+# Every embedding value has a float32 copy in the numpy index matrix. The store's own copy is a list of
+# Python floats (a 24-byte float object and an 8-byte list slot) when the CV was embedded, or a row of
+# the memory-mapped snapshot matrix (4 bytes) when it was loaded from a snapshot.
+_BYTES_PER_INDEXED_VALUE = 4
+_BYTES_PER_LISTED_VALUE = 32
+
+
+class UnknownTenantError(KeyError):
+    """Raised when a tenant id is malformed or has no tenant directory."""
+
+
+@dataclass
+class TenantConfig:
+    """Where a tenant's knowledge comes from and how it is served."""
+
+    tenant_id: str
+    name: str = None
+    prompt_option: str = "rag"
+    cv_pdf_file: str = None
+    snapshot_path: str = None
+
+
+@dataclass
+class Tenant:  # pylint: disable=too-many-instance-attributes
+    """A loaded tenant."""
+
+    config: TenantConfig
+    prompt: object
+    app: HeraldApp
+    size_bytes: int
+    load_seconds: float
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    requests: int = 0
+
+
+def estimate_context_bytes(context) -> int:
+    """Estimate the resident memory of a loaded context.
+
+    :param ContextInterface context: The loaded context.
+    :return: Estimated size in bytes
+    :rtype: int
+    """
+    size = _TENANT_OVERHEAD_BYTES + len(context.cv_md_content or "")
+    if context.type == "rag_based":
+        documents, embeddings, _ = context.context_store.export_index()
+        size += sum(len(document) for document in documents)
+        for embedding in embeddings:
+            stored = embedding.itemsize if isinstance(embedding, np.ndarray) else _BYTES_PER_LISTED_VALUE
+            size += len(embedding) * (_BYTES_PER_INDEXED_VALUE + stored)
+    return size
+
+
+class TenantRegistry:
+    """Lazily loaded, LRU-evicted tenant contexts under a memory budget."""
+
+    def __init__(self, tenants_dir: str, memory_budget_bytes: int = None, max_tenants: int = None):
+        """Initialize the tenant registry.
+
+        :param str tenants_dir: Directory holding one sub-directory per tenant.
+        :param int memory_budget_bytes: Memory budget for loaded contexts, optional.
+            Defaults to HERALD_TENANT_MEMORY_MB (1024 MB).
+        :param int max_tenants: Maximum number of loaded tenants, optional. Defaults to HERALD_MAX_TENANTS (unlimited).
+        """
+        self.tenants_dir = tenants_dir
+        if memory_budget_bytes is None:
+            memory_budget_mb = float(os.getenv("HERALD_TENANT_MEMORY_MB", str(DEFAULT_TENANT_MEMORY_MB)))
+            memory_budget_bytes = int(memory_budget_mb * 2**20)
+        self.memory_budget_bytes = memory_budget_bytes
+        if max_tenants is None and os.getenv("HERALD_MAX_TENANTS"):
+            max_tenants = int(os.getenv("HERALD_MAX_TENANTS"))
+        self.max_tenants = max_tenants
+        self._tenants = OrderedDict()  # tenant_id → Tenant, least recently used first
+        self._loading = {}  # tenant_id → asyncio.Lock, so concurrent first requests load once
+        self._counters = {"hits": 0, "loads": 0, "evictions": 0}
+
+    @classmethod
+    def from_env(cls):
+        """Create the registry from HERALD_TENANTS_DIR, or return None in single-tenant mode.
+
+        :return: Tenant registry or None
+        :rtype: TenantRegistry | None
+        """
+        tenants_dir = os.getenv("HERALD_TENANTS_DIR")
+        return cls(tenants_dir) if tenants_dir else None
+
+    def config(self, tenant_id: str) -> TenantConfig:
+        """Resolve a tenant's configuration from its directory.
+
+        :param str tenant_id: Tenant identifier.
+        :raises UnknownTenantError: If the id is malformed or the tenant has no CV or snapshot.
+        :return: The tenant configuration
+        :rtype: TenantConfig
+        """
+        # the id becomes a path component — only plain names are accepted
+        if not tenant_id or not _TENANT_ID_PATTERN.match(tenant_id):
+            raise UnknownTenantError(tenant_id)
+        tenant_dir = os.path.join(self.tenants_dir, tenant_id)
+        if not os.path.isdir(tenant_dir):
+            raise UnknownTenantError(tenant_id)
+
+        options = {}
+        config_path = os.path.join(tenant_dir, TENANT_CONFIG_FILE)
+        if os.path.exists(config_path):
+            with open(config_path, "r", encoding="utf-8") as file:
+                options = json.load(file)
+
+        config = TenantConfig(
+            tenant_id=tenant_id,
+            name=options.get("name"),
+            prompt_option=options.get("prompt_option", "rag"),
+        )
+        snapshot_path = os.path.join(tenant_dir, TENANT_SNAPSHOT_FILE)
+        cv_pdf_file = os.path.join(tenant_dir, TENANT_CV_FILE)
+        if os.path.exists(snapshot_path):
+            config.snapshot_path = snapshot_path
+        elif os.path.exists(cv_pdf_file):
+            config.cv_pdf_file = cv_pdf_file
+        else:
+            raise UnknownTenantError(tenant_id)
+        return config
+
+    def _load(self, config: TenantConfig) -> Tenant:
+        """Build a tenant's context and app (blocking — runs in a worker thread)."""
+        start = time.perf_counter()
+        prompt = build_context(
+            config.prompt_option,
+            cv_pdf_file=config.cv_pdf_file,
+            snapshot_path=config.snapshot_path,
+            persona_name=config.name,
+        )
+        tenant = Tenant(
+            config=config,
+            prompt=prompt,
+            app=HeraldApp(prompt=prompt),
+            size_bytes=estimate_context_bytes(prompt),
+            load_seconds=time.perf_counter() - start,
+        )
+        logger.info(
+            "Loaded tenant '%s' in %.2fs (~%.1f MB)",
+            config.tenant_id, tenant.load_seconds, tenant.size_bytes / 2**20,
+        )
+        return tenant
+
+    async def get(self, tenant_id: str) -> Tenant:
+        """Return a loaded tenant, loading it on first use and evicting others if over budget.
+
+        :param str tenant_id: Tenant identifier.
+        :raises UnknownTenantError: If the tenant does not exist.
+        :return: The loaded tenant
+        :rtype: Tenant
+        """
+        tenant = self._tenants.get(tenant_id)
+        if tenant is not None:
+            self._counters["hits"] += 1
+        else:
+            lock = self._loading.setdefault(tenant_id, asyncio.Lock())
+            try:
+                async with lock:
+                    tenant = self._tenants.get(tenant_id)
+                    if tenant is None:
+                        config = self.config(tenant_id)
+                        tenant = await asyncio.to_thread(self._load, config)
+                        self._tenants[tenant_id] = tenant
+                        self._counters["loads"] += 1
+                        self._enforce_budget(keep=tenant_id)
+            finally:
+                if self._loading.get(tenant_id) is lock:
+                    del self._loading[tenant_id]
+
+        self._tenants.move_to_end(tenant_id)
+        tenant.last_used = time.time()
+        tenant.requests += 1
+        return tenant
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated memory of all loaded tenants in bytes."""
+        return sum(tenant.size_bytes for tenant in self._tenants.values())
+
+    def _enforce_budget(self, keep: str):
+        """Evict least recently used tenants until the budget holds, never evicting ``keep``."""
+        while len(self._tenants) > 1:
+            over_memory = self.memory_bytes > self.memory_budget_bytes
+            over_count = self.max_tenants is not None and len(self._tenants) > self.max_tenants
+            if not (over_memory or over_count):
+                break
+            victim = next(tenant_id for tenant_id in self._tenants if tenant_id != keep)
+            self.evict(victim)
+
+    def evict(self, tenant_id: str) -> bool:
+        """Unload a tenant; its next request rebuilds it.
+
+        In-flight requests keep using the evicted context, whose resources are released after a grace period.
+
+        :param str tenant_id: Tenant identifier.
+        :return: True if the tenant was loaded
+        :rtype: bool
+        """
+        tenant = self._tenants.pop(tenant_id, None)
+        if tenant is None:
+            return False
+        self._counters["evictions"] += 1
+        logger.info("Evicted tenant '%s' (~%.1f MB)", tenant_id, tenant.size_bytes / 2**20)
+        try:
+            asyncio.get_running_loop().call_later(RETIRE_DELAY_SECONDS, tenant.prompt.close)
+        except RuntimeError:  # no running loop — nothing can be in flight
+            tenant.prompt.close()
+        return True
+
+    def stats(self) -> dict:
+        """Report loaded tenants, memory use and hit / load / eviction counters.
+
+        :return: Registry statistics
+        :rtype: dict
+        """
+        return {
+            "loaded": len(self._tenants),
+            "memory_bytes": self.memory_bytes,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "max_tenants": self.max_tenants,
+            **self._counters,
+            "tenants": [
+                {
+                    "tenant_id": tenant_id,
+                    "size_bytes": tenant.size_bytes,
+                    "load_seconds": round(tenant.load_seconds, 3),
+                    "requests": tenant.requests,
+                    "last_used": tenant.last_used,
+                }
+                for tenant_id, tenant in reversed(self._tenants.items())
+            ],
+        }
@@ -1,6 +1,15 @@
-"""Per-user daily message quota tracking."""
+"""Per-user daily message and token quota tracking.
 
+Next to the message count, the input, output and cached tokens of every answer are stored per user,
+day and model, so spend can be followed per provider and quotas enforced on tokens.
+
+Environment variables:
+    DAILY_TOKEN_LIMIT - Daily quota on the input plus output tokens of a user's answers (default: 0, no quota).
+"""
+
+import os
 import sqlite3
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from fastapi import HTTPException
 
@@ -8,11 +17,60 @@ USAGE_DB_PATH = "herald_usage.db"
 DAILY_MESSAGE_LIMIT = 10
 
 
+@dataclass
+class ModelTokens:
+    """Tokens spent on one model."""
+
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        """Input plus output tokens; cached tokens are part of the input."""
+        return self.input_tokens + self.output_tokens
+
+
+class TokenUsage:
+    """Tokens spent on answering one request, per model."""
+
+    def __init__(self):
+        """Initialize without any usage."""
+        self.by_model = {}
+
+    def add(self, model: str, usage):
+        """Add the usage of an agent run.
+
+        :param str model: Model the run was answered by.
+        :param usage: The run's usage (``result.context_wrapper.usage``).
+        """
+        tokens = self.by_model.setdefault(model, ModelTokens())
+        tokens.requests += usage.requests
+        tokens.input_tokens += usage.input_tokens
+        tokens.output_tokens += usage.output_tokens
+        tokens.cached_tokens += usage.input_tokens_details.cached_tokens or 0
+
+    @property
+    def total_tokens(self) -> int:
+        """Input plus output tokens over every model."""
+        return sum(tokens.total_tokens for tokens in self.by_model.values())
+
+
 class UsageTracker:
     """Tracks per-user daily message usage in a persistent SQLite database."""
 
-    def __init__(self, db_path: str = USAGE_DB_PATH):
+    def __init__(self, db_path: str = USAGE_DB_PATH, token_limit: int = None):
+        """Initialize the tracker.
+
+        :param str db_path: Path of the SQLite database.
+        :param int token_limit: Daily quota on a user's input plus output tokens, 0 for none, optional.
+            Defaults to DAILY_TOKEN_LIMIT, read here rather than at import so a .env loaded later applies.
+        """
         self.db_path = db_path
+        if token_limit is None:
+            token_limit = int(os.getenv("DAILY_TOKEN_LIMIT", "0"))
+        self.token_limit = token_limit
         self._init_db()
 
     def _init_db(self):
@@ -26,6 +84,18 @@ class UsageTracker:
                     PRIMARY KEY (user_id, date)
                 )
             """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS token_usage (
+                    user_id TEXT NOT NULL,
+                    date    TEXT NOT NULL,
+                    model   TEXT NOT NULL,
+                    requests      INTEGER NOT NULL DEFAULT 0,
+                    input_tokens  INTEGER NOT NULL DEFAULT 0,
+                    output_tokens INTEGER NOT NULL DEFAULT 0,
+                    cached_tokens INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (user_id, date, model)
+                )
+            """)
 
     @staticmethod
     def _today() -> str:
@@ -57,8 +127,62 @@ class UsageTracker:
             ).fetchone()
         return row[0]
 
+    def record_tokens(self, user_id: str, usage: TokenUsage) -> int:
+        """Add the tokens of an answer to today's usage, per model.
+
+        :param str user_id: The user the answer was for.
+        :param TokenUsage usage: Tokens the answer cost, per model.
+        :return: Input plus output tokens the user has spent today, this answer included
+        :rtype: int
+        """
+        today = self._today()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                """
+                INSERT INTO token_usage (user_id, date, model, requests, input_tokens, output_tokens, cached_tokens)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(user_id, date, model) DO UPDATE SET
+                    requests = requests + excluded.requests,
+                    input_tokens = input_tokens + excluded.input_tokens,
+                    output_tokens = output_tokens + excluded.output_tokens,
+                    cached_tokens = cached_tokens + excluded.cached_tokens
+                """,
+                [
+                    (user_id, today, model, tokens.requests, tokens.input_tokens, tokens.output_tokens,
+                     tokens.cached_tokens)
+                    for model, tokens in usage.by_model.items()
+                ],
+            )
+        return self.get_token_count(user_id)
+
+    def get_token_usage(self, user_id: str) -> dict:
+        """Return the tokens the user has spent today, per model.
+
+        :param str user_id: The user to look up.
+        :return: Mapping of model name to the user's ModelTokens today
+        :rtype: dict
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT model, requests, input_tokens, output_tokens, cached_tokens FROM token_usage
+                WHERE user_id = ? AND date = ?
+                """,
+                (user_id, self._today()),
+            ).fetchall()
+        return {model: ModelTokens(*counts) for model, *counts in rows}
+
+    def get_token_count(self, user_id: str) -> int:
+        """Return how many input plus output tokens the user has spent today.
+
+        :param str user_id: The user to look up.
+        :return: Tokens spent today across all models
+        :rtype: int
+        """
+        return sum(tokens.total_tokens for tokens in self.get_token_usage(user_id).values())
+
     def check_quota(self, user_id: str) -> tuple[int, int]:
-        """Return (used, remaining). Raise HTTP 429 if the daily limit is reached."""
+        """Return (used, remaining) messages. Raise HTTP 429 if the daily message or token limit is reached."""
         used = self.get_count(user_id)
         remaining = max(0, DAILY_MESSAGE_LIMIT - used)
         if used >= DAILY_MESSAGE_LIMIT:
@@ -75,4 +199,22 @@ class UsageTracker:
                     "remaining": 0,
                 },
             )
+        self._check_token_quota(user_id)
         return used, remaining
+
+    def _check_token_quota(self, user_id: str):
+        """Raise HTTP 429 if the token quota is set and the user's tokens today reached it."""
+        if not self.token_limit:
+            return
+        tokens = self.get_token_count(user_id)
+        if tokens >= self.token_limit:
+            raise HTTPException(
+                status_code=429,
+                detail={
+                    "error": "daily_token_limit_reached",
+                    "message": "You've reached your daily usage limit. Come back tomorrow!",
+                    "token_limit": self.token_limit,
+                    "tokens_used": tokens,
+                    "tokens_remaining": 0,
+                },
+            )
@@ -1,25 +1,27 @@
-"""Herald Main Application."""
+"""Herald Main Application.
+
+Importing this module (e.g. ``uvicorn main:herald_app``) only loads what the HTTP API needs:
+Gradio and Rich are imported by the UI entry points, and PDF / vector-store modules load when
+the selected prompt option actually builds its context.
+"""
 
 import os
 import asyncio
 from contextlib import asynccontextmanager
 
 import dotenv
-import gradio as gr
 from agents import SQLiteSession, set_default_openai_client, set_default_openai_api, set_tracing_disabled
 from openai import AsyncOpenAI
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Prompt
-
+from herald.admin_route import admin_router
 from herald.app import HeraldApp
-from herald.context_manager.prompt_based import HeraldBasicPrompter
-from herald.context_manager.rag_based import HeraldRAGContextManager
+from herald.context_manager.factory import build_context, context_fingerprint
 from herald.herald_route import herald_router, HERALD_DB_PATH
+from herald.reloader import CVReloader
+from herald.tenants import TenantRegistry
 from herald.usage_tracker import UsageTracker
 
 dotenv.load_dotenv()
@@ -43,6 +45,10 @@ def cleanup_traces_db():
 
 async def terminal_ui(prompt):
     """For terminal based console."""
+    # pylint: disable=import-outside-toplevel
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.prompt import Prompt
 
     console = Console()
     session = SQLiteSession(session_id="terminal", db_path=HERALD_DB_PATH)
@@ -75,12 +81,29 @@ async def lifespan_context(app: FastAPI):  # pylint: disable=unused-argument
     
     :param FastAPI app: FastAPI application instance
     """
-    print("Building the application context...")
-    app.state.herald_prompt = HeraldRAGContextManager()  # or use HeraldBasicPrompter()
-    app.state.herald_app = HeraldApp(prompt=app.state.herald_prompt)
     app.state.session_store = {}  # session_id → (SQLiteSession, last_active_monotonic)
     app.state.usage_tracker = UsageTracker()  # persistent per-user daily quota tracking
+    # Multi-tenant mode (HERALD_TENANTS_DIR): every tenant's context loads on its first request
+    app.state.tenant_registry = TenantRegistry.from_env()
+    app.state.herald_prompt = app.state.herald_app = app.state.cv_reloader = None
+
+    if app.state.tenant_registry is None:
+        print("Building the application context...")
+        # "rag" (default) serves tool based retrieval; "basic" embeds the CV in the prompt and never loads ChromaDB
+        api_prompt_option = os.getenv("API_PROMPT_OPTION", "rag")
+        # A prebuilt snapshot (HERALD_SNAPSHOT_PATH) skips PDF conversion, parsing and embedding entirely
+        app.state.herald_prompt = build_context(api_prompt_option)
+        app.state.herald_app = HeraldApp(prompt=app.state.herald_prompt)
+        # Watch the CV and swap in a reindexed context when it changes — sessions survive the swap
+        app.state.cv_reloader = CVReloader(
+            app.state,
+            build_context=lambda previous: build_context(api_prompt_option, previous=previous),
+            fingerprint=context_fingerprint,
+        )
+        await app.state.cv_reloader.start()
     yield
+    if app.state.cv_reloader is not None:
+        await app.state.cv_reloader.stop()
     cleanup_traces_db()
 
 
@@ -101,6 +124,7 @@ herald_app.add_middleware(
 )
 
 herald_app.include_router(herald_router)
+herald_app.include_router(admin_router)
 
 if __name__ == "__main__":
 
@@ -109,14 +133,11 @@ if __name__ == "__main__":
         browser_based = os.getenv("WITH_BROWSER", "no")
         prompt_option = os.getenv("PROMPT_OPTION", "basic")
 
-        if prompt_option == "basic":
-            prompt_type = HeraldBasicPrompter()
-        elif prompt_option == "rag":  # RAG based
-            prompt_type = HeraldRAGContextManager()
-        else:
-            raise ValueError(f"Unsupported PROMPT_OPTION: {prompt_option}. Supported options are 'basic' and 'rag'.")
+        prompt_type = build_context(prompt_option)
 
         if browser_based == "yes":
+            import gradio as gr  # pylint: disable=import-outside-toplevel
+
             # ui_debug()
             gr.ChatInterface(HeraldApp(prompt=prompt_type).run).launch()
 
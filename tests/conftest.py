@@ -5,6 +5,58 @@ import pytest
 from unittest.mock import Mock, MagicMock
 
 
+@pytest.fixture(autouse=True)
+def disable_disk_cache(monkeypatch):
+    """Keep tests from reading or writing the on-disk Herald cache."""
+    monkeypatch.setenv("HERALD_CACHE_DIR", "")
+
+
+@pytest.fixture(autouse=True)
+def disable_guard(monkeypatch):
+    """Keep HeraldApp from classifying messages with the ONNX model; guard tests enable it explicitly."""
+    monkeypatch.setenv("GUARD_ENABLED", "false")
+
+
+@pytest.fixture(autouse=True)
+def disable_preretrieval(monkeypatch):
+    """Keep HeraldApp from pre-retrieving chunks; pre-retrieval tests enable it explicitly."""
+    monkeypatch.setenv("PRERETRIEVAL", "false")
+
+
+@pytest.fixture(autouse=True)
+def disable_singleflight(monkeypatch):
+    """Keep HeraldApp from running opening questions on scratch sessions; coalescing tests enable it explicitly."""
+    monkeypatch.setenv("SINGLEFLIGHT", "false")
+
+
+@pytest.fixture(autouse=True)
+def disable_model_routing(monkeypatch):
+    """Keep HeraldApp answering with the large model's agent; routing tests enable it explicitly."""
+    monkeypatch.setenv("MODEL_ROUTING", "false")
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers(monkeypatch):
+    """Give every test fresh, closed provider circuit breakers."""
+    monkeypatch.setattr("herald.resilience._BREAKERS", {})
+
+
+@pytest.fixture
+def chroma_backend(monkeypatch):
+    """Run the vector store on the ChromaDB index backend."""
+    monkeypatch.setenv("VECTOR_INDEX_BACKEND", "chroma")
+
+
+@pytest.fixture
+def mock_embedding_function():
+    """Mock ChromaDB embedding function returning one fixed-size vector per input text."""
+    mock_ef = MagicMock()
+    mock_ef.name.return_value = "mock-embedder"
+    mock_ef.get_config.return_value = {}
+    mock_ef.side_effect = lambda texts: [[0.1, 0.2, 0.3] for _ in texts]
+    return mock_ef
+
+
 @pytest.fixture
 def sample_cv_content():
     """Sample CV content for testing."""
@@ -0,0 +1,209 @@
+"""Tests for Herald admin API routes."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from herald.admin_route import admin_router
+from herald.resilience import circuit_breaker
+
+
+@pytest.fixture
+def client():
+    """Test client with a mocked CV reloader on the application state."""
+    app = FastAPI()
+    app.include_router(admin_router)
+    app.state.cv_reloader = MagicMock(interval=60.0, current_fingerprint="v1", last_reload=None)
+    app.state.cv_reloader.reload = AsyncMock(return_value={"reloaded": True, "fingerprint": "v2"})
+    return TestClient(app)
+
+
+class TestAdminAuth:
+    """Tests for admin token checks."""
+
+    def test_disabled_without_token(self, client, monkeypatch):
+        monkeypatch.delenv("HERALD_ADMIN_TOKEN", raising=False)
+        response = client.post("/admin/reindex", headers={"X-Admin-Token": "anything"})
+        assert response.status_code == 403
+
+    def test_rejects_wrong_token(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        response = client.post("/admin/reindex", headers={"X-Admin-Token": "wrong"})
+        assert response.status_code == 401
+        client.app.state.cv_reloader.reload.assert_not_called()
+
+
+class TestReindex:
+    """Tests for the reindex endpoints."""
+
+    def test_reindex_forces_reload(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        response = client.post("/admin/reindex", headers={"X-Admin-Token": "secret"})
+
+        assert response.status_code == 200
+        assert response.json() == {"reloaded": True, "fingerprint": "v2"}
+        client.app.state.cv_reloader.reload.assert_awaited_once_with(reason="admin", force=True)
+
+    def test_reindex_failure_returns_500(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.cv_reloader.reload.side_effect = ValueError("broken PDF")
+
+        response = client.post("/admin/reindex", headers={"X-Admin-Token": "secret"})
+
+        assert response.status_code == 500
+        assert "broken PDF" in response.json()["detail"]
+
+    def test_reindex_status(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        response = client.get("/admin/reindex", headers={"X-Admin-Token": "secret"})
+
+        assert response.json() == {"interval_seconds": 60.0, "fingerprint": "v1", "last_reload": None}
+
+
+class TestTenantAdmin:
+    """Tests for the tenant admin endpoints."""
+
+    def test_tenants_not_enabled(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.tenant_registry = None
+        response = client.get("/admin/tenants", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 404
+
+    def test_stats_and_evict(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        registry = MagicMock()
+        registry.stats.return_value = {"loaded": 1}
+        registry.evict.return_value = True
+        client.app.state.tenant_registry = registry
+
+        assert client.get("/admin/tenants", headers={"X-Admin-Token": "secret"}).json() == {"loaded": 1}
+        response = client.delete("/admin/tenants/alice", headers={"X-Admin-Token": "secret"})
+
+        assert response.json() == {"tenant_id": "alice", "evicted": True}
+        registry.evict.assert_called_once_with("alice")
+
+
+
+class TestCacheAdmin:
+    """Tests for the retrieval cache statistics endpoint."""
+
+    def test_cache_stats(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.herald_prompt = MagicMock()
+        vector_store = client.app.state.herald_prompt.context_store
+        vector_store.query_cache.stats.return_value = {"hits": 3, "misses": 1}
+        vector_store.retrieval_cache.stats.return_value = {"hits": 5, "misses": 2}
+        vector_store.retrieval_paths = {"lexical": 4, "hybrid": 2, "vector": 1}
+        client.app.state.herald_app = MagicMock()
+        client.app.state.herald_app.answer_cache.stats.return_value = {"hits": 7, "misses": 3}
+
+        response = client.get("/admin/cache", headers={"X-Admin-Token": "secret"})
+
+        assert response.json() == {
+            "answers": {"hits": 7, "misses": 3},
+            "query_embeddings": {"hits": 3, "misses": 1},
+            "retrieval_results": {"hits": 5, "misses": 2},
+            "retrieval_paths": {"lexical": 4, "hybrid": 2, "vector": 1},
+        }
+
+    def test_cache_stats_without_rag_context(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.herald_prompt = MagicMock(context_store=None)
+        response = client.get("/admin/cache", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 404
+
+
+class TestResilienceAdmin:
+    """Tests for the circuit breaker and hedging endpoint."""
+
+    def test_resilience_stats(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.herald_app = MagicMock()
+        client.app.state.herald_app.hedge_policy.stats.return_value = {"enabled": False}
+        breaker = circuit_breaker("groq")
+        breaker.record_failure()
+
+        response = client.get("/admin/resilience", headers={"X-Admin-Token": "secret"})
+
+        body = response.json()
+        assert body["hedging"] == {"enabled": False}
+        assert body["circuit_breakers"]["groq"]["state"] == "closed"
+        assert body["circuit_breakers"]["groq"]["consecutive_failures"] == 1
+
+
+class TestHistoryAdmin:
+    """Tests for the conversation history statistics endpoint."""
+
+    def test_history_stats(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.herald_app = MagicMock()
+        client.app.state.herald_app.history_policy.stats.return_value = {"tokens_saved": 1200}
+
+        response = client.get("/admin/history", headers={"X-Admin-Token": "secret"})
+
+        assert response.json() == {"tokens_saved": 1200}
+
+    def test_history_stats_without_single_context(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.herald_app = None
+        response = client.get("/admin/history", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 404
+
+
+class TestPreRetrievalAdmin:
+    """Tests for the pre-retrieval savings endpoint."""
+
+    def test_preretrieval_stats(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.herald_app = MagicMock()
+        client.app.state.herald_app.preretrieval.stats.return_value = {"turns_saved_per_request": 0.9}
+
+        response = client.get("/admin/preretrieval", headers={"X-Admin-Token": "secret"})
+
+        assert response.json() == {"turns_saved_per_request": 0.9}
+
+    def test_preretrieval_stats_without_rag_context(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.herald_app = MagicMock(preretrieval=None)
+        response = client.get("/admin/preretrieval", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 404
+
+
+class TestCoalescingAdmin:
+    """Tests for the opening question coalescing endpoint."""
+
+    def test_coalescing_stats(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.herald_app = MagicMock()
+        client.app.state.herald_app.singleflight.stats.return_value = {"coalesced": 7}
+
+        response = client.get("/admin/coalescing", headers={"X-Admin-Token": "secret"})
+
+        assert response.json() == {"coalesced": 7}
+
+    def test_coalescing_stats_when_disabled(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.herald_app = MagicMock(singleflight=None)
+        response = client.get("/admin/coalescing", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 404
+
+
+class TestRoutingAdmin:
+    """Tests for the model routing endpoint."""
+
+    def test_routing_stats(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.herald_app = MagicMock()
+        client.app.state.herald_app.router.stats.return_value = {"max_fast_words": 20}
+
+        response = client.get("/admin/routing", headers={"X-Admin-Token": "secret"})
+
+        assert response.json() == {"max_fast_words": 20}
+
+    def test_routing_stats_when_disabled(self, client, monkeypatch):
+        monkeypatch.setenv("HERALD_ADMIN_TOKEN", "secret")
+        client.app.state.herald_app = MagicMock(router=None)
+        response = client.get("/admin/routing", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 404
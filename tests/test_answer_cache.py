@@ -0,0 +1,122 @@
+"""Tests for the semantic answer cache and its use by HeraldApp."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from herald.answer_cache import SemanticAnswerCache
+from herald.app import HeraldApp
+
+
+class TestSemanticAnswerCache:
+    """Tests for similarity lookup, versioning and eviction."""
+
+    def test_similar_question_hits(self):
+        cache = SemanticAnswerCache(maxsize=4, threshold=0.9)
+        cache.store("v1", "What do you do?", [1.0, 0.0, 0.0], "I build backends.")
+
+        assert cache.lookup("v1", [0.99, 0.05, 0.0]) == "I build backends."
+        assert cache.lookup("v1", [0.0, 1.0, 0.0]) is None
+        assert cache.stats() == {
+            "size": 1, "maxsize": 4, "ttl_seconds": None, "threshold": 0.9, "hits": 1, "misses": 1, "hit_rate": 0.5,
+        }
+
+    def test_new_corpus_version_clears_entries(self):
+        cache = SemanticAnswerCache(maxsize=4, threshold=0.9)
+        cache.store("v1", "What do you do?", [1.0, 0.0], "Old answer.")
+
+        assert cache.lookup("v2", [1.0, 0.0]) is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        cache = SemanticAnswerCache(maxsize=2, threshold=0.9)
+        cache.store("v1", "a", [1.0, 0.0, 0.0], "A")
+        cache.store("v1", "b", [0.0, 1.0, 0.0], "B")
+        cache.lookup("v1", [1.0, 0.0, 0.0])  # b is now least recently used
+        cache.store("v1", "c", [0.0, 0.0, 1.0], "C")
+
+        assert cache.lookup("v1", [0.0, 1.0, 0.0]) is None
+        assert cache.lookup("v1", [1.0, 0.0, 0.0]) == "A"
+
+    def test_defaults_from_env(self, monkeypatch):
+        monkeypatch.setenv("ANSWER_CACHE_SIZE", "0")
+        monkeypatch.setenv("ANSWER_CACHE_THRESHOLD", "0.8")
+        cache = SemanticAnswerCache()
+        cache.store("v1", "a", [1.0], "A")
+        assert cache.threshold == 0.8 and len(cache) == 0
+
+
+def _rag_app():
+    prompt = MagicMock(type="rag_based")
+    prompt.context_store.corpus_version = "v1"
+    prompt.context_store.aembed_query = AsyncMock(return_value=[1.0, 0.0, 0.0])
+    return HeraldApp(prompt=prompt)
+
+
+def _session(history=()):
+    session = MagicMock()
+    session.get_items = AsyncMock(return_value=list(history))
+    session.add_items = AsyncMock()
+    return session
+
+
+async def _ask(app, session):
+    return [answer async for answer in app.run(message="What do you do?", session=session)]
+
+
+@patch('herald.app._build_groq_model')
+@patch('herald.app.Agent')
+@patch('herald.app.Runner')
+class TestHeraldAppAnswerCache:
+    """Tests for serving opening questions from the answer cache."""
+
+    @pytest.mark.asyncio
+    async def test_opening_answer_is_reused_and_recorded(self, mock_runner, *_mocks):
+        mock_runner.run = AsyncMock(return_value=MagicMock(final_output="I build backends."))
+        app = _rag_app()
+        await _ask(app, _session())
+
+        second_session = _session()
+        assert await _ask(app, second_session) == ["I build backends."]
+
+        mock_runner.run.assert_awaited_once()
+        second_session.add_items.assert_awaited_once_with([
+            {"role": "user", "content": "What do you do?"},
+            {"role": "assistant", "content": "I build backends."},
+        ])
+
+    @pytest.mark.asyncio
+    async def test_follow_up_questions_bypass_cache(self, mock_runner, *_mocks):
+        mock_runner.run = AsyncMock(return_value=MagicMock(final_output="I build backends."))
+        app = _rag_app()
+        await _ask(app, _session())
+
+        await _ask(app, _session(history=[{"role": "user", "content": "Hi"}]))
+
+        assert mock_runner.run.await_count == 2
+        assert app.prompt.context_store.aembed_query.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_reindexed_corpus_is_answered_again(self, mock_runner, *_mocks):
+        mock_runner.run = AsyncMock(return_value=MagicMock(final_output="I build backends."))
+        app = _rag_app()
+        await _ask(app, _session())
+
+        app.prompt.context_store.corpus_version = "v2"
+        await _ask(app, _session())
+
+        assert mock_runner.run.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_serves_cached_answer(self, mock_runner, *_mocks):
+        mock_runner.run = AsyncMock(return_value=MagicMock(final_output="I build backends."))
+        app = _rag_app()
+        await _ask(app, _session())
+
+        events = [event async for event in app.run_stream(message="What do you do?", session=_session())]
+
+        assert events == [
+            {"type": "token", "delta": "I build backends."},
+            {"type": "done", "response": "I build backends."},
+        ]
+        mock_runner.run_streamed.assert_not_called()
@@ -2,11 +2,16 @@
 
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
-from openai import APIConnectionError, RateLimitError, APIStatusError
+from openai import APIConnectionError, RateLimitError, APIStatusError, OpenAIError
 from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
-from herald.app import HeraldApp, _GROQ_MODEL, _FALLBACK_MODEL
+from agents.models.openai_responses import OpenAIResponsesModel
+from agents.usage import Usage
+from herald import app as app_module
+from herald.app import HeraldApp, _FALLBACK_MODEL, _build_groq_model
 from herald.context_manager.prompt_based import HeraldBasicPrompter
 from herald.context_manager.rag_based import HeraldRAGContextManager
+from herald.routing import DEFAULT_FAST_MODEL, DEFAULT_LARGE_MODEL
+from herald.usage_tracker import TokenUsage
 
 
 class TestHeraldApp:
@@ -36,7 +41,7 @@ class TestHeraldApp:
     def test_herald_agent_basic(self, mock_agent, mock_build_model):
         """Test herald_agent creation with basic prompt."""
         mock_model = MagicMock(spec=OpenAIChatCompletionsModel)
-        mock_model.model = _GROQ_MODEL
+        mock_model.model = DEFAULT_LARGE_MODEL
         mock_build_model.return_value = mock_model
 
         mock_prompt = MagicMock()
@@ -52,6 +57,7 @@ class TestHeraldApp:
         assert call_kwargs['instructions'] == "Test instructions"
         assert call_kwargs['model'] == mock_model
         assert 'tools' not in call_kwargs
+        mock_build_model.assert_called_once_with(DEFAULT_LARGE_MODEL)
 
     @patch('herald.app._build_groq_model')
     @patch('herald.app.Agent')
@@ -76,9 +82,11 @@ class TestHeraldApp:
         assert 'tools' in call_kwargs
         assert call_kwargs['tools'] == mock_tools
 
+    @patch('herald.app._shared_client')
     @patch('herald.app.Agent')
-    def test_fallback_agent_uses_openai_model(self, mock_agent):
-        """Test that _fallback_agent uses the OpenAI fallback model string."""
+    def test_fallback_agent_uses_openai_model(self, mock_agent, mock_shared_client, monkeypatch):
+        """Test that _fallback_agent uses the OpenAI fallback model on the shared OpenAI client."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-openai-key")
         mock_prompt = MagicMock()
         mock_prompt.type = "basic_prompt"
         mock_prompt.get_system_instructions.return_value = "Instructions"
@@ -88,7 +96,48 @@ class TestHeraldApp:
 
         mock_agent.assert_called_once()
         call_kwargs = mock_agent.call_args[1]
-        assert call_kwargs['model'] == _FALLBACK_MODEL
+        assert isinstance(call_kwargs['model'], OpenAIResponsesModel)
+        assert call_kwargs['model'].model == _FALLBACK_MODEL
+        mock_shared_client.assert_called_once_with("openai", api_key="test-openai-key")
+
+    @patch('herald.app._build_fallback_model')
+    @patch('herald.app._build_groq_model')
+    @patch('herald.app.Agent')
+    def test_agents_are_built_once(self, mock_agent, mock_build_model, mock_build_fallback):
+        """Agents, tools and instructions are built once per HeraldApp and shared by both agents."""
+        mock_prompt = MagicMock()
+        mock_prompt.type = "rag_based"
+
+        app = HeraldApp(prompt=mock_prompt)
+        assert app.herald_agent() is app.herald_agent()
+        assert app._fallback_agent() is app._fallback_agent()
+
+        assert mock_agent.call_count == 2
+        mock_build_model.assert_called_once()
+        mock_build_fallback.assert_called_once()
+        mock_prompt.get_system_instructions.assert_called_once()
+        mock_prompt.context_store.create_tools.assert_called_once()
+
+    @patch('herald.app._build_fallback_model', side_effect=OpenAIError("The api_key client option must be set"))
+    def test_missing_fallback_is_resolved_once(self, mock_build_fallback, caplog):
+        """Without an OpenAI key the fallback is given up on after the first attempt, with one warning."""
+        app = HeraldApp(prompt=MagicMock(type="basic_prompt"))
+
+        assert app._fallback_agent() is None and app._fallback_agent() is None
+
+        mock_build_fallback.assert_called_once()
+        assert [record.message for record in caplog.records].count(
+            "No fallback model (The api_key client option must be set) — answering with Groq only") == 1
+
+    def test_groq_client_is_shared(self, monkeypatch):
+        """Every Groq model reuses one client, and with it one HTTP connection pool."""
+        monkeypatch.setenv("GROQ_API_KEY", "test-key")
+        monkeypatch.setattr(app_module, "_CLIENTS", {})
+
+        first, second = _build_groq_model(DEFAULT_LARGE_MODEL), _build_groq_model(DEFAULT_FAST_MODEL)
+
+        assert first is not second
+        assert first._client is second._client
 
     @patch('herald.app._build_groq_model')
     @patch('herald.app.Runner')
@@ -148,11 +197,12 @@ class TestHeraldApp:
         _, run_kwargs = mock_runner.run.call_args
         assert run_kwargs.get('session') is mock_session
 
+    @patch('herald.app._build_fallback_model')
     @patch('herald.app._build_groq_model')
     @patch('herald.app.Runner')
     @patch('herald.app.Agent')
     @pytest.mark.asyncio
-    async def test_run_falls_back_on_groq_connection_error(self, mock_agent, mock_runner, mock_build_model):
+    async def test_run_falls_back_on_groq_connection_error(self, mock_agent, mock_runner, mock_build_model, _mock_build_fallback):
         """Test that run falls back to OpenAI when Groq raises APIConnectionError."""
         mock_build_model.return_value = MagicMock(spec=OpenAIChatCompletionsModel)
         mock_prompt = MagicMock()
@@ -176,11 +226,30 @@ class TestHeraldApp:
         assert mock_runner.run.call_count == 2
         assert results == ["Fallback response"]
 
+    @patch('herald.app._build_fallback_model')
+    @patch('herald.app._build_groq_model')
+    @patch('herald.app.Runner')
+    @patch('herald.app.Agent', side_effect=lambda **kwargs: MagicMock(model=kwargs["model"]))
+    @pytest.mark.asyncio
+    async def test_run_tags_token_usage_with_answering_model(self, mock_agent, mock_runner, *_mocks):
+        """Test that the tokens of a fallback answer are collected under the fallback model."""
+        app = HeraldApp(prompt=MagicMock(type="basic_prompt"))
+        fallback_result = MagicMock(final_output="Fallback response", last_agent=app._fallback_agent())
+        fallback_result.context_wrapper.usage = Usage(requests=1, input_tokens=120, output_tokens=30)
+        mock_runner.run = AsyncMock(side_effect=[APIConnectionError(request=MagicMock()), fallback_result])
+        usage = TokenUsage()
+
+        results = [chunk async for chunk in app.run(message="Test query", session=MagicMock(), usage=usage)]
+
+        assert results == ["Fallback response"]
+        assert list(usage.by_model) == [_FALLBACK_MODEL] and usage.total_tokens == 150
+
+    @patch('herald.app._build_fallback_model')
     @patch('herald.app._build_groq_model')
     @patch('herald.app.Runner')
     @patch('herald.app.Agent')
     @pytest.mark.asyncio
-    async def test_run_falls_back_on_groq_rate_limit(self, mock_agent, mock_runner, mock_build_model):
+    async def test_run_falls_back_on_groq_rate_limit(self, mock_agent, mock_runner, mock_build_model, _mock_build_fallback):
         """Test that run falls back to OpenAI when Groq raises RateLimitError."""
         mock_build_model.return_value = MagicMock(spec=OpenAIChatCompletionsModel)
         mock_prompt = MagicMock()
@@ -209,3 +278,92 @@ class TestHeraldApp:
 
         assert mock_runner.run.call_count == 2
         assert results == ["Fallback response"]
+
+
+def _streamed_result(events, final_output="Done", error=None):
+    """Stand-in for RunResultStreaming yielding the given stream events."""
+    async def stream_events():
+        for event in events:
+            yield event
+        if error is not None:
+            raise error
+
+    result = MagicMock()
+    result.stream_events = stream_events
+    result.final_output = final_output
+    return result
+
+
+def _delta(text):
+    return MagicMock(type="raw_response_event", data=MagicMock(type="response.output_text.delta", delta=text))
+
+
+def _run_item(event_name, raw_item):
+    # "name" is a MagicMock constructor argument, so it is set afterwards
+    event = MagicMock(type="run_item_stream_event", item=MagicMock(raw_item=raw_item))
+    event.name = event_name
+    return event
+
+
+class TestHeraldAppStreaming:
+    """Test cases for HeraldApp.run_stream."""
+
+    @staticmethod
+    async def _collect(app):
+        return [event async for event in app.run_stream(message="Skills?", session=MagicMock())]
+
+    @patch('herald.app._build_groq_model')
+    @patch('herald.app.Runner')
+    @patch('herald.app.Agent')
+    @pytest.mark.asyncio
+    async def test_run_stream_translates_events(self, mock_agent, mock_runner, _mock_build_model):
+        tool_call = MagicMock(call_id="call_1")
+        tool_call.name = "retrieve_skills_chunks"
+        tool_called = _run_item("tool_called", tool_call)
+        tool_output = _run_item("tool_output", {"call_id": "call_1"})
+        mock_runner.run_streamed.return_value = _streamed_result(
+            [tool_called, tool_output, _delta("I use "), _delta("Python.")], final_output="I use Python."
+        )
+        app = HeraldApp(prompt=MagicMock(type="basic_prompt"))
+
+        events = await self._collect(app)
+
+        assert events == [
+            {"type": "tool_call", "name": "retrieve_skills_chunks"},
+            {"type": "tool_output", "name": "retrieve_skills_chunks"},
+            {"type": "token", "delta": "I use "},
+            {"type": "token", "delta": "Python."},
+            {"type": "done", "response": "I use Python."},
+        ]
+
+    @patch('herald.app._build_fallback_model')
+    @patch('herald.app._build_groq_model')
+    @patch('herald.app.Runner')
+    @patch('herald.app.Agent')
+    @pytest.mark.asyncio
+    async def test_run_stream_falls_back_before_first_event(self, mock_agent, mock_runner, *_mocks):
+        mock_runner.run_streamed.side_effect = [
+            _streamed_result([], error=APIConnectionError(request=MagicMock())),
+            _streamed_result([_delta("Fallback")], final_output="Fallback"),
+        ]
+        app = HeraldApp(prompt=MagicMock(type="basic_prompt"))
+
+        events = await self._collect(app)
+
+        assert events[-1] == {"type": "done", "response": "Fallback"}
+        assert mock_runner.run_streamed.call_count == 2
+
+    @patch('herald.app._build_fallback_model')
+    @patch('herald.app._build_groq_model')
+    @patch('herald.app.Runner')
+    @patch('herald.app.Agent')
+    @pytest.mark.asyncio
+    async def test_run_stream_does_not_fall_back_mid_answer(self, mock_agent, mock_runner, *_mocks):
+        mock_runner.run_streamed.return_value = _streamed_result(
+            [_delta("Partial")], error=APIConnectionError(request=MagicMock())
+        )
+        app = HeraldApp(prompt=MagicMock(type="basic_prompt"))
+
+        with pytest.raises(APIConnectionError):
+            await self._collect(app)
+        assert mock_runner.run_streamed.call_count == 1
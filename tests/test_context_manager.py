@@ -11,7 +11,7 @@ from herald.context_manager.rag_based import HeraldRAGContextManager
 class TestContextInterface:
     """Test cases for ContextInterface."""
 
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     def test_prepare_cv_content_with_file(self, mock_exists, mock_to_markdown, sample_cv_content):
         """Test preparing CV content from PDF file."""
@@ -23,9 +23,9 @@ class TestContextInterface:
         assert result == sample_cv_content
         mock_to_markdown.assert_called_once_with("test.pdf")
 
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
-    @patch('herald.context_manager.icontext.fitz.open')
-    @patch('herald.context_manager.icontext.download_cv_bytes')
+    @patch('pymupdf4llm.to_markdown')
+    @patch('fitz.open')
+    @patch('herald.storage.r2.download_cv_bytes')
     @patch.dict('os.environ', {}, clear=False)
     def test_prepare_cv_content_from_r2(self, mock_download, mock_fitz_open, mock_to_markdown, sample_cv_content):
         """When CV_PATH is absent, CV is downloaded from R2 and converted from bytes."""
@@ -53,7 +53,7 @@ class TestContextInterface:
         with pytest.raises(ValueError, match="does not exist"):
             ContextInterface.prepare_cv_content("nonexistent.pdf")
 
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     @patch.dict(os.environ, {'CV_PATH': '/path/to/cv.pdf'})
     def test_prepare_cv_content_from_env(self, mock_exists, mock_to_markdown, sample_cv_content):
@@ -93,7 +93,7 @@ class TestContextInterface:
 class TestHeraldBasicPrompter:
     """Test cases for HeraldBasicPrompter."""
 
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     def test_init(self, mock_exists, mock_to_markdown, sample_cv_content):
         """Test initialization of HeraldBasicPrompter."""
@@ -105,7 +105,7 @@ class TestHeraldBasicPrompter:
         assert prompter._cv_md_content == sample_cv_content
         assert prompter.type == "basic_prompt"
 
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     @patch.dict(os.environ, {'ME': 'Test User'})
     def test_get_system_instructions(self, mock_exists, mock_to_markdown, sample_cv_content):
@@ -124,7 +124,7 @@ class TestHeraldBasicPrompter:
         assert sample_cv_content in instructions
         assert "Knowledge Base" in instructions
 
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     def test_type_property(self, mock_exists, mock_to_markdown, sample_cv_content):
         """Test type property returns correct value."""
@@ -139,7 +139,7 @@ class TestHeraldRAGContextManager:
     """Test cases for HeraldRAGContextManager."""
 
     @patch('herald.context_manager.rag_based.CVVectorStore')
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     def test_init(self, mock_exists, mock_to_markdown, mock_vector_store, sample_cv_content):
         """Test initialization of RAG context manager."""
@@ -153,7 +153,7 @@ class TestHeraldRAGContextManager:
         assert rag_manager.vector_store is not None
 
     @patch('herald.context_manager.rag_based.CVVectorStore')
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     def test_type_property(self, mock_exists, mock_to_markdown, mock_vector_store, sample_cv_content):
         """Test type property returns correct value."""
@@ -164,7 +164,7 @@ class TestHeraldRAGContextManager:
         assert rag_manager.type == "rag_based"
 
     @patch('herald.context_manager.rag_based.CVVectorStore')
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     def test_context_store_property(self, mock_exists, mock_to_markdown, mock_vector_store, sample_cv_content):
         """Test context_store property returns vector store."""
@@ -175,7 +175,7 @@ class TestHeraldRAGContextManager:
         assert rag_manager.context_store == rag_manager.vector_store
 
     @patch('herald.context_manager.rag_based.CVVectorStore')
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     @patch.dict(os.environ, {'ME': 'Test User'})
     def test_get_system_instructions(self, mock_exists, mock_to_markdown, mock_vector_store, sample_cv_content):
@@ -194,7 +194,7 @@ class TestHeraldRAGContextManager:
 
     @patch('herald.context_manager.rag_based.LinkedInCVParser')
     @patch('herald.context_manager.rag_based.CVVectorStore')
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     def test_prepare_vector_store_called(
         self, mock_exists, mock_to_markdown, mock_vector_store, mock_parser, sample_cv_content
@@ -214,7 +214,7 @@ class TestHeraldRAGContextManager:
         assert rag_manager.vector_store is not None
 
     @patch('herald.context_manager.rag_based.CVVectorStore')
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     @patch.dict(os.environ, {'CV_TYPE': 'pdf'})
     def test_unsupported_cv_type_raises(self, mock_exists, mock_to_markdown, mock_vector_store, sample_cv_content):
@@ -229,7 +229,7 @@ class TestHeraldRAGContextManager:
 class TestCvMdContentProperty:
     """Tests for the cv_md_content property on ContextInterface subclasses."""
 
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     def test_cv_md_content_property(self, mock_exists, mock_to_markdown, sample_cv_content):
         """Test that cv_md_content returns the stored markdown content."""
@@ -238,3 +238,42 @@ class TestCvMdContentProperty:
 
         prompter = HeraldBasicPrompter("test.pdf")
         assert prompter.cv_md_content == sample_cv_content
+
+
+class TestFactory:
+    """Tests for building contexts from the environment."""
+
+    def test_unsupported_prompt_option_raises(self):
+        from herald.context_manager.factory import build_context
+
+        with pytest.raises(ValueError, match="Unsupported PROMPT_OPTION"):
+            build_context("invalid")
+
+    def test_fingerprint_changes_with_local_cv(self, tmp_path, monkeypatch):
+        from herald.context_manager.factory import context_fingerprint
+
+        monkeypatch.delenv("HERALD_SNAPSHOT_PATH", raising=False)
+        cv_file = tmp_path / "cv.pdf"
+        cv_file.write_bytes(b"%PDF-1.4 original")
+        before = context_fingerprint(str(cv_file))
+
+        cv_file.write_bytes(b"%PDF-1.4 updated with more bytes")
+
+        assert context_fingerprint(str(cv_file)) != before
+
+    @patch('pymupdf4llm.to_markdown')
+    def test_persona_name_overrides_env(self, mock_to_markdown, tmp_path, sample_cv_content, monkeypatch):
+        from herald.context_manager.factory import build_context
+
+        monkeypatch.setenv("ME", "Env Person")
+        monkeypatch.setenv("HERALD_SNAPSHOT_PATH", str(tmp_path / "unused.snapshot"))
+        mock_to_markdown.return_value = sample_cv_content
+        cv_file = tmp_path / "cv.pdf"
+        cv_file.write_bytes(b"%PDF-1.4")
+
+        context = build_context("basic", cv_pdf_file=str(cv_file), persona_name="Jane Tenant")
+
+        assert context.persona_name == "Jane Tenant"
+        assert "Jane Tenant" in context.get_system_instructions()
+        assert "Env Person" not in context.get_system_instructions()
+
@@ -232,3 +232,22 @@ Work stuff
 
         topics = [chunk["topic"] for chunk in result]
         assert "miscellaneous" in topics
+
+    def test_iter_chunks_streams_same_chunks_as_parse(self):
+        """iter_chunks yields chunks lazily and matches parse(), storing parsed_cv once exhausted."""
+        cv_content = """# Jane Smith
+
+Experienced engineer.
+
+### Skills
+Python, Go
+"""
+        parser = LinkedInCVParser(cv_content)
+        iterator = parser.iter_chunks()
+
+        first = next(iterator)
+        assert parser.parsed_cv is None
+        streamed = [first] + list(iterator)
+
+        assert streamed == LinkedInCVParser(cv_content).parse()
+        assert parser.parsed_cv == streamed
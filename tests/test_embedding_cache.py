@@ -0,0 +1,61 @@
+"""Tests for the persistent embedding cache."""
+
+from unittest.mock import MagicMock
+
+from herald.storage.cache import cache_path, cache_root
+from herald.storage.embedding_cache import EmbeddingCache, content_hash, embedding_model_id
+
+
+class TestCachePaths:
+    """Tests for the shared cache directory helpers."""
+
+    def test_disabled_when_env_empty(self, monkeypatch):
+        monkeypatch.setenv("HERALD_CACHE_DIR", "")
+        assert cache_root() is None
+        assert cache_path("embeddings.db") is None
+
+    def test_creates_parent_directory(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("HERALD_CACHE_DIR", str(tmp_path / "cache"))
+        path = cache_path("nested", "file.bin")
+        assert path == str(tmp_path / "cache" / "nested" / "file.bin")
+        assert (tmp_path / "cache" / "nested").is_dir()
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache."""
+
+    def test_round_trip(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path / "emb.db"), model_id="model-a")
+        cache.put_many({"chunk one": [0.5, 0.25], "chunk two": [1.0, -1.0]})
+
+        hits = cache.get_many(["chunk one", "chunk two", "unknown"])
+
+        assert hits == {"chunk one": [0.5, 0.25], "chunk two": [1.0, -1.0]}
+
+    def test_persists_across_instances(self, tmp_path):
+        db_path = str(tmp_path / "emb.db")
+        EmbeddingCache(db_path, model_id="model-a").put_many({"chunk": [0.5]})
+
+        assert EmbeddingCache(db_path, model_id="model-a").get_many(["chunk"]) == {"chunk": [0.5]}
+
+    def test_keys_include_model_identity(self, tmp_path):
+        db_path = str(tmp_path / "emb.db")
+        EmbeddingCache(db_path, model_id="model-a").put_many({"chunk": [0.5]})
+
+        assert EmbeddingCache(db_path, model_id="model-b").get_many(["chunk"]) == {}
+        assert content_hash("chunk", "model-a") != content_hash("chunk", "model-b")
+
+    def test_from_env_disabled(self, monkeypatch):
+        monkeypatch.setenv("HERALD_CACHE_DIR", "")
+        assert EmbeddingCache.from_env("model-a") is None
+
+    def test_from_env_enabled(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("HERALD_CACHE_DIR", str(tmp_path))
+        cache = EmbeddingCache.from_env("model-a")
+        assert cache.db_path == str(tmp_path / "embeddings.db")
+
+    def test_model_id_for_default_embedding_function(self):
+        ef = MagicMock()
+        ef.name.return_value = "default"
+        ef.get_config.return_value = {}
+        assert embedding_model_id(ef) == "onnx/all-MiniLM-L6-v2[]"
@@ -1,10 +1,14 @@
 """Tests for Herald API routes."""
 
+import json
+
 import pytest
-from unittest.mock import MagicMock, patch
-from fastapi import FastAPI
+from unittest.mock import AsyncMock, MagicMock, patch
+from agents.usage import Usage
+from fastapi import FastAPI, HTTPException
 from fastapi.testclient import TestClient
 
+from herald.guard import OFF_TOPIC, REFUSALS, Refusal
 from herald.herald_route import (
     herald_router,
     get_herald_prompt,
@@ -13,7 +17,8 @@ from herald.herald_route import (
     _get_or_create_session,
     SESSION_TTL_SECONDS,
 )
-from herald.usage_tracker import DAILY_MESSAGE_LIMIT
+from herald.tenants import UnknownTenantError
+from herald.usage_tracker import DAILY_MESSAGE_LIMIT, ModelTokens
 
 
 class TestDependencies:
@@ -91,6 +96,8 @@ class TestRoutes:
             usage_tracker = MagicMock()
             usage_tracker.check_quota.return_value = (0, DAILY_MESSAGE_LIMIT)
             usage_tracker.increment.return_value = 1
+            usage_tracker.record_tokens.return_value = 0
+            usage_tracker.token_limit = 0
         app.state.usage_tracker = usage_tracker
         return app
 
@@ -104,7 +111,7 @@ class TestRoutes:
     def test_ask_api_returns_first_chunk(self, mock_sqlite_session):
         mock_sqlite_session.return_value = MagicMock()
 
-        async def mock_run(message, session):
+        async def mock_run(message, session, usage=None):
             yield "Test response"
 
         mock_herald_app = MagicMock()
@@ -119,5 +126,187 @@ class TestRoutes:
         assert response.status_code == 200
         assert response.json() == {
             "response": "Test response",
-            "usage": {"used": 1, "limit": DAILY_MESSAGE_LIMIT, "remaining": DAILY_MESSAGE_LIMIT - 1},
+            "usage": {
+                "used": 1,
+                "limit": DAILY_MESSAGE_LIMIT,
+                "remaining": DAILY_MESSAGE_LIMIT - 1,
+                "tokens": {"used": 0, "limit": None, "remaining": None},
+            },
+        }
+
+    @patch("herald.herald_route.SQLiteSession")
+    def test_ask_api_records_token_usage(self, mock_sqlite_session):
+
+        async def mock_run(message, session, usage=None):
+            usage.add("openai/gpt-oss-120b", Usage(requests=2, input_tokens=300, output_tokens=50))
+            yield "Test response"
+
+        mock_herald_app = MagicMock()
+        mock_herald_app.run = mock_run
+        app = self._make_app(herald_app=mock_herald_app)
+        app.state.usage_tracker.record_tokens.return_value = 350
+        app.state.usage_tracker.token_limit = 1000
+
+        response = TestClient(app).post("/ai/ask", json={"message": "Hello", "session_id": "sess_1"})
+
+        assert response.json()["usage"]["tokens"] == {"used": 350, "limit": 1000, "remaining": 650}
+        user_id, token_usage = app.state.usage_tracker.record_tokens.call_args.args
+        assert user_id == "anonymous" and token_usage.total_tokens == 350
+
+    def test_usage_reports_messages_and_tokens(self):
+        app = self._make_app()
+        app.state.usage_tracker.get_count.return_value = 2
+        app.state.usage_tracker.get_token_usage.return_value = {
+            "openai/gpt-oss-120b": ModelTokens(requests=2, input_tokens=300, output_tokens=50, cached_tokens=100),
+            "gpt-5-nano": ModelTokens(requests=1, input_tokens=200, output_tokens=20),
         }
+
+        usage = TestClient(app).get("/ai/usage").json()
+
+        assert usage["used"] == 2 and usage["remaining"] == DAILY_MESSAGE_LIMIT - 2
+        assert usage["tokens"]["used"] == 570
+        assert (usage["tokens"]["input_tokens"], usage["tokens"]["cached_tokens"]) == (500, 100)
+        assert usage["tokens"]["by_model"]["gpt-5-nano"] == {
+            "requests": 1, "input_tokens": 200, "output_tokens": 20, "cached_tokens": 0,
+        }
+
+    @pytest.mark.parametrize("count_refusals, increments", [("false", 0), ("true", 1)])
+    @patch("herald.herald_route.SQLiteSession")
+    def test_guard_refusal_quota_is_configurable(self, mock_sqlite_session, monkeypatch, count_refusals, increments):
+        monkeypatch.setenv("GUARD_REFUSALS_COUNT_QUOTA", count_refusals)
+
+        async def mock_run(message, session, usage=None):
+            yield Refusal(REFUSALS[OFF_TOPIC], OFF_TOPIC)
+
+        mock_herald_app = MagicMock()
+        mock_herald_app.run = mock_run
+        app = self._make_app(herald_app=mock_herald_app)
+        app.state.usage_tracker.get_count.return_value = 0
+
+        response = TestClient(app).post("/ai/ask", json={"message": "Tell me a joke", "session_id": "s1"})
+
+        assert response.json()["response"] == REFUSALS[OFF_TOPIC]
+        assert app.state.usage_tracker.increment.call_count == increments
+
+    @staticmethod
+    def _parse_sse(body: str) -> list:
+        events = []
+        for message in body.strip().split("\n\n"):
+            name, data = message.split("\n")
+            events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+        return events
+
+    @patch("herald.herald_route.SQLiteSession")
+    def test_ask_stream_forwards_events_and_counts_on_done(self, mock_sqlite_session):
+        async def mock_run_stream(message, session, usage=None):
+            yield {"type": "tool_call", "name": "retrieve_skills_chunks"}
+            yield {"type": "token", "delta": "I use "}
+            yield {"type": "token", "delta": "Python."}
+            yield {"type": "done", "response": "I use Python."}
+
+        mock_herald_app = MagicMock()
+        mock_herald_app.run_stream = mock_run_stream
+        app = self._make_app(herald_app=mock_herald_app)
+
+        response = TestClient(app).post("/ai/ask/stream", json={"message": "Skills?", "session_id": "s1"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = self._parse_sse(response.text)
+        assert [name for name, _ in events] == ["tool_call", "token", "token", "done"]
+        assert events[-1][1]["response"] == "I use Python."
+        assert events[-1][1]["usage"]["used"] == 1
+        app.state.usage_tracker.increment.assert_called_once_with("anonymous")
+
+    @patch("herald.herald_route.SQLiteSession")
+    def test_ask_stream_failure_is_reported_in_band(self, mock_sqlite_session):
+        async def mock_run_stream(message, session, usage=None):
+            yield {"type": "token", "delta": "I "}
+            raise RuntimeError("model went away")
+
+        mock_herald_app = MagicMock()
+        mock_herald_app.run_stream = mock_run_stream
+        app = self._make_app(herald_app=mock_herald_app)
+
+        response = TestClient(app).post("/ai/ask/stream", json={"message": "Hi", "session_id": "s1"})
+
+        assert [name for name, _ in self._parse_sse(response.text)] == ["token", "error"]
+        app.state.usage_tracker.increment.assert_not_called()
+
+    def test_ask_stream_checks_quota_before_streaming(self):
+        usage_tracker = MagicMock()
+        usage_tracker.check_quota.side_effect = HTTPException(status_code=429, detail="limit")
+        app = self._make_app(usage_tracker=usage_tracker)
+
+        response = TestClient(app).post("/ai/ask/stream", json={"message": "Hi", "session_id": "s1"})
+
+        assert response.status_code == 429
+        app.state.herald_app.run_stream.assert_not_called()
+
+
+class TestTenantRoutes:
+    """Tests for tenant resolution on the chat routes."""
+
+    def _make_app(self, registry, herald_app=None):
+        app = FastAPI()
+        app.include_router(herald_router)
+        app.state.herald_prompt = None
+        app.state.herald_app = herald_app
+        app.state.session_store = {}
+        app.state.tenant_registry = registry
+        usage_tracker = MagicMock()
+        usage_tracker.check_quota.return_value = (0, DAILY_MESSAGE_LIMIT)
+        usage_tracker.increment.return_value = 1
+        usage_tracker.record_tokens.return_value = 0
+        usage_tracker.token_limit = 0
+        app.state.usage_tracker = usage_tracker
+        return app
+
+    @staticmethod
+    def _registry(reply="Tenant response"):
+        async def mock_run(message, session, usage=None):
+            yield reply
+
+        tenant = MagicMock()
+        tenant.app.run = mock_run
+        registry = MagicMock()
+        registry.get = AsyncMock(return_value=tenant)
+        return registry
+
+    @patch("herald.herald_route.SQLiteSession")
+    def test_path_and_header_select_tenant(self, mock_sqlite_session):
+        registry = self._registry()
+        app = self._make_app(registry)
+        client = TestClient(app)
+
+        by_path = client.post("/t/alice/ai/ask", json={"message": "Hi", "session_id": "s1"})
+        by_header = client.post("/ai/ask", json={"message": "Hi", "session_id": "s1"}, headers={"X-Tenant-Id": "bob"})
+
+        assert by_path.json()["response"] == by_header.json()["response"] == "Tenant response"
+        assert [call.args[0] for call in registry.get.await_args_list] == ["alice", "bob"]
+        # sessions and quotas are scoped per tenant
+        assert set(app.state.session_store) == {"alice/s1", "bob/s1"}
+        app.state.usage_tracker.check_quota.assert_any_call("alice/anonymous")
+
+    def test_unknown_tenant_returns_404(self):
+        registry = self._registry()
+        registry.get.side_effect = UnknownTenantError("nobody")
+        client = TestClient(self._make_app(registry))
+
+        response = client.post("/t/nobody/ai/ask", json={"message": "Hi", "session_id": "s1"})
+
+        assert response.status_code == 404
+
+    def test_tenant_required_in_multi_tenant_mode(self):
+        client = TestClient(self._make_app(self._registry()))
+
+        response = client.post("/ai/ask", json={"message": "Hi", "session_id": "s1"})
+
+        assert response.status_code == 400
+
+    def test_tenant_header_without_registry_returns_404(self):
+        client = TestClient(self._make_app(None, herald_app=MagicMock()))
+
+        response = client.post("/ai/ask", json={"message": "Hi", "session_id": "s1"}, headers={"X-Tenant-Id": "bob"})
+
+        assert response.status_code == 404
@@ -0,0 +1,119 @@
+"""Tests for the conversation history policy."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from agents.run_config import ModelInputData
+
+from herald.app import HeraldApp
+from herald.history import HistoryPolicy, SUMMARY_HEADER, render_transcript, split_turns
+
+
+def _turn(number):
+    return [
+        {"role": "user", "content": f"question {number}"},
+        {"type": "function_call", "name": "retrieve_skills_chunks", "call_id": f"call_{number}", "arguments": "{}"},
+        {"type": "function_call_output", "call_id": f"call_{number}", "output": "chunk " * 20},
+        {"type": "message", "role": "assistant", "content": [{"type": "output_text", "text": f"answer {number}"}]},
+    ]
+
+
+def _conversation(turns):
+    items = [item for number in range(turns) for item in _turn(number)]
+    return items + [{"role": "user", "content": "new question"}]
+
+
+def test_split_turns_starts_at_user_messages():
+    turns = split_turns(_conversation(2))
+    assert [len(turn) for turn in turns] == [4, 4, 1]
+
+
+def test_render_transcript_leaves_out_tool_traffic():
+    assert render_transcript(split_turns(_turn(1))) == "Visitor: question 1\nHerald: answer 1"
+
+
+class TestHistoryPolicy:
+    """Tests for windowing, summaries and the token cap."""
+
+    def test_window_drops_old_turns_without_summary(self):
+        policy = HistoryPolicy(max_turns=2, max_tokens=0, summarize=False)
+
+        sent = policy.apply("s1", ModelInputData(input=_conversation(5), instructions="Be brief."))
+
+        assert sent.input == _conversation(5)[12:]
+        assert sent.instructions == "Be brief."
+        stats = policy.stats()
+        assert stats["tokens_saved"] == stats["history_tokens"] - stats["sent_tokens"] > 0
+
+    def test_unsummarized_turns_stay_verbatim(self):
+        policy = HistoryPolicy(max_turns=2, max_tokens=0, summarize=True)
+
+        sent = policy.apply("s1", ModelInputData(input=_conversation(5), instructions="Be brief."))
+
+        assert sent.input == _conversation(5)
+        assert policy.stats()["tokens_saved"] == 0
+
+    @pytest.mark.asyncio
+    async def test_summary_replaces_turns_outside_window(self):
+        policy = HistoryPolicy(max_turns=2, max_tokens=0, summarize=True)
+        policy.apply("s1", ModelInputData(input=_conversation(5), instructions="Be brief."))
+        session = MagicMock(session_id="s1")
+        session.get_items = AsyncMock(return_value=_conversation(5)[:-1] + _turn(5)[1:])
+        summarize = AsyncMock(return_value="Visitor asked about questions 0 to 3.")
+
+        await policy.schedule_summary(session, summarize)
+        sent = policy.apply("s1", ModelInputData(input=_conversation(6), instructions="Be brief."))
+
+        # after the fifth answer, turns 0-3 left the two-turn window
+        assert summarize.await_args.args[0] == ""
+        assert summarize.await_args.args[1].splitlines()[0] == "Visitor: question 0"
+        assert "question 4" not in summarize.await_args.args[1]
+        assert sent.input == _conversation(6)[16:]
+        assert sent.instructions == f"Be brief.{SUMMARY_HEADER}Visitor asked about questions 0 to 3."
+        assert policy.stats()["summaries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_summary_keeps_turns_verbatim(self):
+        policy = HistoryPolicy(max_turns=1, max_tokens=0, summarize=True)
+        policy.apply("s1", ModelInputData(input=_conversation(3), instructions=None))
+        session = MagicMock(session_id="s1")
+        session.get_items = AsyncMock(return_value=_conversation(3))
+
+        await policy.schedule_summary(session, AsyncMock(side_effect=RuntimeError("model down")))
+
+        assert policy.apply("s1", ModelInputData(input=_conversation(3), instructions=None)).input == _conversation(3)
+
+    def test_summary_is_only_scheduled_when_due(self):
+        policy = HistoryPolicy(max_turns=6, max_tokens=0, summarize=True)
+        policy.apply("s1", ModelInputData(input=_conversation(2), instructions=None))
+        assert policy.schedule_summary(MagicMock(session_id="s1"), AsyncMock()) is None
+
+    def test_token_cap_drops_oldest_turns(self):
+        policy = HistoryPolicy(max_turns=0, max_tokens=120, summarize=False)
+
+        sent = policy.apply("s1", ModelInputData(input=_conversation(5), instructions=None))
+
+        assert sent.input[-1] == {"role": "user", "content": "new question"}
+        assert sent.input[0] == {"role": "user", "content": "question 4"}
+
+    def test_defaults_from_env(self, monkeypatch):
+        monkeypatch.setenv("HISTORY_MAX_TURNS", "0")
+        monkeypatch.setenv("HISTORY_MAX_TOKENS", "0")
+        policy = HistoryPolicy()
+        assert not policy.enabled and not policy.summarize
+
+
+@patch('herald.app._build_groq_model')
+@patch('herald.app.Agent')
+@patch('herald.app.Runner')
+@pytest.mark.asyncio
+async def test_runs_apply_history_policy(mock_runner, *_mocks):
+    mock_runner.run = AsyncMock(return_value=MagicMock(final_output="answer"))
+    app = HeraldApp(prompt=MagicMock(type="basic_prompt"))
+
+    [_ async for _ in app.run(message="Skills?", session=MagicMock(session_id="s1"))]
+
+    run_filter = mock_runner.run.await_args.kwargs["run_config"].call_model_input_filter
+    sent = run_filter(MagicMock(model_data=ModelInputData(input=_conversation(1), instructions="x")))
+    assert sent.input == _conversation(1)
+    assert app.history_policy.stats()["model_calls"] == 1
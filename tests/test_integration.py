@@ -1,13 +1,23 @@
 """Integration tests for Herald application."""
 
+import zlib
+
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import AsyncMock, Mock, MagicMock, patch
+
+from agents import SQLiteSession
+from agents.run_config import ModelInputData
+from agents.usage import Usage
+
+from herald.app import HeraldApp
+from herald.guard import OFF_TOPIC, REFUSALS
+from herald.routing import FAST
 
 
 class TestIntegration:
     """Integration tests combining multiple components."""
 
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     def test_basic_prompter_end_to_end(self, mock_exists, mock_to_markdown):
         """Test basic prompter from initialization to instruction generation."""
@@ -27,7 +37,7 @@ class TestIntegration:
 
     @patch('herald.context_manager.rag_based.CVVectorStore')
     @patch('herald.context_manager.rag_based.LinkedInCVParser')
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     def test_rag_manager_end_to_end(self, mock_exists, mock_to_markdown, mock_parser, mock_vector_store):
         """Test RAG manager from initialization to instruction generation."""
@@ -57,7 +67,7 @@ class TestIntegration:
     @patch('herald.app._build_groq_model')
     @patch('herald.app.Runner')
     @patch('herald.app.Agent')
-    @patch('herald.context_manager.icontext.pymupdf4llm.to_markdown')
+    @patch('pymupdf4llm.to_markdown')
     @patch('os.path.exists')
     @pytest.mark.asyncio
     async def test_full_query_flow_basic(
@@ -91,8 +101,9 @@ class TestIntegration:
             assert len(results) == 1
             assert "Python experience" in results[0]
 
-    @patch('herald.context_manager.rag.chromadb.Client')
-    def test_vector_store_workflow(self, mock_chromadb):
+    @pytest.mark.usefixtures("chroma_backend")
+    @patch('herald.context_manager.vector_index.chromadb.Client')
+    def test_vector_store_workflow(self, mock_chromadb, mock_embedding_function):
         """Test vector store creation and retrieval workflow."""
         from herald.context_manager.rag import CVVectorStore
 
@@ -113,10 +124,86 @@ class TestIntegration:
         ]
 
         with patch('herald.context_manager.rag.tqdm.tqdm', lambda x, **kwargs: x):
-            vector_store = CVVectorStore(chunks)
+            vector_store = CVVectorStore(chunks, embedding_function=mock_embedding_function)
             vector_store.vectorize_chunks()
             results = vector_store.retrieve_relevant_chunks("Python skills", top_k=1)
 
-        # ChromaDB handles embedding — verify each chunk was stored and results returned
-        assert mock_collection.add.call_count == len(chunks)
+        # Chunks are embedded up front — verify each chunk was stored and results returned
+        assert len(mock_collection.upsert.call_args[1]['documents']) == len(chunks)
         assert isinstance(results, list)
+
+
+def _embed_words(text, dimensions=64):
+    """Embed a text as its normalized bag of words, hashed into a fixed number of dimensions."""
+    vector = [0.0] * dimensions
+    for word in "".join(c if c.isalnum() else " " for c in text.lower()).split():
+        vector[zlib.crc32(word.encode("utf-8")) % dimensions] += 1.0
+    norm = sum(value * value for value in vector) ** 0.5 or 1.0
+    return [value / norm for value in vector]
+
+
+@patch('herald.app._build_groq_model', side_effect=lambda model: model)
+@patch('herald.app.Agent', side_effect=lambda **options: MagicMock(model=options["model"]))
+@patch('herald.app.Runner')
+class TestDefaultPipeline:
+    """Integration test answering through the optimizations HeraldApp runs by default."""
+
+    @pytest.fixture(autouse=True)
+    def default_features(self, monkeypatch):
+        """Undo the conftest fixtures switching the optimizations off."""
+        for name in ("GUARD_ENABLED", "PRERETRIEVAL", "SINGLEFLIGHT", "MODEL_ROUTING"):
+            monkeypatch.delenv(name)
+        monkeypatch.setenv("PRERETRIEVAL_HOLDOUT", "0")
+
+    @staticmethod
+    def _rag_prompt():
+        store = MagicMock(corpus_version="cv-1")
+        store.embed_documents = MagicMock(side_effect=lambda texts: [_embed_words(text) for text in texts])
+        store.aembed_query = AsyncMock(side_effect=_embed_words)
+        store.aretrieve_many = AsyncMock(side_effect=lambda queries: [["Python, Go and AWS."] for _ in queries])
+        store.create_tools.return_value = []
+        return MagicMock(type="rag_based", context_store=store, cv_md_content="# CV")
+
+    @pytest.mark.asyncio
+    async def test_opening_question_runs_every_stage(self, mock_runner, *_mocks):
+        sent = []
+
+        async def fake_run(agent, message, session=None, run_config=None, **_kwargs):
+            data = MagicMock(model_data=ModelInputData(input=[{"role": "user", "content": message}], instructions=""))
+            sent.append((agent.model, run_config.call_model_input_filter(data)))
+            await session.add_items([{"role": "user", "content": message},
+                                     {"role": "assistant", "content": "I know Python, Go and AWS."}])
+            return MagicMock(final_output="I know Python, Go and AWS.", last_agent=agent,
+                             context_wrapper=MagicMock(usage=Usage(requests=1, input_tokens=100, output_tokens=10)))
+
+        mock_runner.run = AsyncMock(side_effect=fake_run)
+        app = HeraldApp(prompt=self._rag_prompt())
+        question = "What programming languages do you know?"
+        first, second, third = SQLiteSession("visitor-1"), SQLiteSession("visitor-2"), SQLiteSession("visitor-3")
+        try:
+            assert [answer async for answer in app.run(message=question, session=first)] == [
+                "I know Python, Go and AWS."]
+            assert [answer async for answer in app.run(message=question, session=second)] == [
+                "I know Python, Go and AWS."]
+
+            # one agent run, on the fast tier, with the pre-retrieved chunks in front of the question
+            assert len(sent) == 1
+            model, model_data = sent[0]
+            assert model == "openai/gpt-oss-20b"
+            assert "Python, Go and AWS." in model_data.input[0]["content"]
+            assert model_data.input[1] == {"role": "user", "content": question}
+            # the scratch session's turn lands in the visitor's session; the cached answer in the next one
+            for session in (first, second):
+                assert [item["role"] for item in await session.get_items()] == ["user", "assistant"]
+            # the guard answers an off-topic question without a run
+            assert [answer async for answer in app.run(message="Tell me a joke.", session=third)] == [
+                REFUSALS[OFF_TOPIC]]
+            assert len(sent) == 1
+        finally:
+            for session in (first, second, third):
+                session.close()
+
+        assert app.singleflight.stats()["leaders"] == 1
+        assert app.preretrieval.stats()["prefetched"]["runs"] == 1
+        assert app.router.stats()["routes"][FAST]["requests"] == 1
+        assert app.answer_cache.stats()["hits"] == 1
@@ -0,0 +1,117 @@
+"""Tests for the BM25 lexical index and hybrid retrieval."""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from herald.context_manager.lexical import BM25Index, tokenize
+from herald.context_manager.rag import CVVectorStore, _reciprocal_rank_fusion
+
+DOCUMENTS = [
+    "### CV Section: Experience\n\ntitle: Backend Engineer\ncompany: Acme Corp\ndescription: Python services",
+    "### CV Section: Experience\n\ntitle: Data Engineer\ncompany: Globex\ndescription: Spark pipelines",
+    "### CV Section: Skills\n\nPython, Go, Kubernetes, C++",
+    "### CV Section: Education\n\nMSc Computer Science, University of Oxford",
+]
+TOPICS = ["Experience", "Experience", "Skills", "Education"]
+
+
+@pytest.fixture
+def lexical_index():
+    index = BM25Index(confidence_margin=1.5)
+    index.add(DOCUMENTS, TOPICS)
+    return index
+
+
+def test_tokenize_keeps_technology_tokens():
+    assert tokenize("Have you used C++, C# or Node.js at Acme?") == ["used", "c++", "c#", "node.js", "acme"]
+
+
+class TestBM25Index:
+    """Tests for ranking and the confidence decision."""
+
+    def test_exact_company_name_is_confident(self, lexical_index):
+        result = lexical_index.search("work at Globex")
+
+        assert result.documents == [DOCUMENTS[1]] and result.confident
+
+    def test_mostly_unknown_query_is_not_confident(self, lexical_index):
+        # only one of four terms is in the index, so the query's meaning is left to the embeddings
+        assert not lexical_index.search("Globex team culture values").confident
+
+    def test_ambiguous_term_is_not_confident(self, lexical_index):
+        result = lexical_index.search("python")
+
+        assert set(result.documents) == {DOCUMENTS[0], DOCUMENTS[2]}
+        assert not result.confident
+
+    def test_topic_filter(self, lexical_index):
+        result = lexical_index.search("python", topic="Skills")
+        assert result.documents == [DOCUMENTS[2]] and result.confident
+
+    def test_common_term_alone_is_not_confident(self, lexical_index):
+        # "section" occurs in every chunk, so it cannot single one out
+        assert not lexical_index.search("cv section").confident
+
+    def test_unknown_terms(self, lexical_index):
+        result = lexical_index.search("salary expectations")
+        assert result.documents == [] and not result.confident
+
+
+def test_reciprocal_rank_fusion_promotes_agreement():
+    fused = _reciprocal_rank_fusion(["a", "b", "c", "d"], ["c", "x"], top_k=3)
+    assert fused == ["c", "a", "b"]
+
+
+@pytest.fixture
+def hybrid_store(mock_embedding_function, monkeypatch):
+    monkeypatch.setenv("RETRIEVAL_MODE", "hybrid")
+    store = CVVectorStore([], embedding_function=mock_embedding_function, index_backend="numpy")
+    store.load_index(DOCUMENTS, [[float(idx), 1.0, 0.5] for idx in range(len(DOCUMENTS))], TOPICS)
+    return store
+
+
+class TestHybridRetrieval:
+    """Tests for the lexical fast path and rank fusion in CVVectorStore."""
+
+    def test_confident_query_skips_embedding(self, hybrid_store, mock_embedding_function):
+        results = hybrid_store.retrieve_relevant_chunks("Kubernetes", top_k=3)
+
+        mock_embedding_function.assert_not_called()
+        assert results == [DOCUMENTS[2]]
+        assert hybrid_store.retrieval_paths == {"lexical": 1, "hybrid": 0, "vector": 0}
+
+    def test_ambiguous_query_is_fused(self, hybrid_store, mock_embedding_function):
+        with patch("herald.context_manager.vector_index.NumpyVectorIndex.query_many",
+                   return_value=[[DOCUMENTS[3], DOCUMENTS[2], DOCUMENTS[1], DOCUMENTS[0]]]) as mock_query:
+            results = hybrid_store.retrieve_relevant_chunks("python", top_k=2)
+
+        mock_embedding_function.assert_called_once_with(["python"])
+        assert mock_query.call_args[0][1] == [4]  # deeper vector ranking for fusion
+        # both lexical matches outrank the vector-only top hit
+        assert results == [DOCUMENTS[2], DOCUMENTS[0]]
+        assert hybrid_store.retrieval_paths["hybrid"] == 1
+
+    def test_paths_are_counted_across_threads(self, hybrid_store):
+        # distinct top_k values keep every query out of the retrieval cache
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda top_k: hybrid_store.retrieve_relevant_chunks("Kubernetes", top_k=top_k),
+                          range(1, 401)))
+
+        assert hybrid_store.retrieval_paths["lexical"] == 400
+
+    def test_vector_mode_disables_lexical_index(self, mock_embedding_function, monkeypatch):
+        monkeypatch.setenv("RETRIEVAL_MODE", "vector")
+        store = CVVectorStore([], embedding_function=mock_embedding_function, index_backend="numpy")
+        store.load_index(DOCUMENTS, [[1.0, 0.0, 0.0]] * len(DOCUMENTS), TOPICS)
+
+        store.retrieve_relevant_chunks("Kubernetes", top_k=1)
+
+        mock_embedding_function.assert_called_once_with(["Kubernetes"])
+        assert store.retrieval_paths == {"lexical": 0, "hybrid": 0, "vector": 1}
+
+    def test_unsupported_mode_raises(self, monkeypatch):
+        monkeypatch.setenv("RETRIEVAL_MODE", "keyword")
+        with pytest.raises(ValueError, match="Unsupported RETRIEVAL_MODE"):
+            CVVectorStore([], embedding_function=lambda texts: [[0.0] for _ in texts])
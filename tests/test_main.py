@@ -10,7 +10,7 @@ class TestMainModule:
     """Test cases for main.py module."""
 
     @patch('main.HeraldApp')
-    @patch('main.gr.ChatInterface')
+    @patch('gradio.ChatInterface')
     @patch('main.dotenv.load_dotenv')
     @patch.dict(os.environ, {
         'WITH_BROWSER': 'yes',
@@ -81,6 +81,23 @@ class TestMainModule:
                 )
 
 
+    def test_api_import_defers_heavy_modules(self):
+        """Importing main for the HTTP API must not load the UI, PDF or vector-store modules."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, main; "
+            "print(','.join(m for m in ('gradio', 'chromadb', 'fitz', 'pymupdf4llm', 'boto3') if m in sys.modules))"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True,
+            env={**os.environ, "GROQ_API_KEY": "test"},
+        )
+        assert result.stdout.strip() == ""
+
+
 class TestTerminalUI:
     """Test terminal UI functionality."""
 
@@ -95,8 +112,8 @@ class TestTerminalUI:
 
     @pytest.mark.asyncio
     @patch('main.HeraldApp')
-    @patch('main.Prompt.ask')
-    @patch('main.Console')
+    @patch('rich.prompt.Prompt.ask')
+    @patch('rich.console.Console')
     async def test_terminal_ui_query_flow(self, mock_console, mock_prompt_ask, mock_herald_app):
         """Test terminal UI query handling."""
         # Mock the prompt responses
@@ -0,0 +1,125 @@
+"""Tests for the PDF-to-markdown conversion cache."""
+
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+from herald.cli import main as cli_main
+from herald.context_manager.icontext import ContextInterface
+from herald.storage.markdown_cache import MarkdownCache, pdf_sha256
+
+
+class TestMarkdownCache:
+    """Tests for MarkdownCache."""
+
+    def test_round_trip(self, tmp_path):
+        cache = MarkdownCache(str(tmp_path), converter_version="1.0")
+        assert cache.get("abc") is None
+
+        cache.put("abc", "# CV")
+
+        assert cache.get("abc") == "# CV"
+        assert (tmp_path / "1.0" / "abc.md").exists()
+
+    def test_entries_most_recent_first(self, tmp_path):
+        cache = MarkdownCache(str(tmp_path), converter_version="1.0")
+        cache.put("old", "# Old")
+        cache.put("new", "# New")
+        os.utime(tmp_path / "1.0" / "old.md", (time.time() - 100, time.time() - 100))
+
+        entries = cache.entries()
+
+        assert [entry["key"] for entry in entries] == ["new", "old"]
+        assert entries[0]["size"] == len("# New")
+
+    def test_prune_by_age(self, tmp_path):
+        cache = MarkdownCache(str(tmp_path), converter_version="1.0")
+        cache.put("stale", "# Stale")
+        cache.put("fresh", "# Fresh")
+        ten_days_ago = time.time() - 10 * 86400
+        os.utime(tmp_path / "1.0" / "stale.md", (ten_days_ago, ten_days_ago))
+
+        assert cache.prune(max_age_days=7) == 1
+        assert [entry["key"] for entry in cache.entries()] == ["fresh"]
+
+    def test_prune_by_count(self, tmp_path):
+        cache = MarkdownCache(str(tmp_path), converter_version="1.0")
+        for idx in range(3):
+            cache.put(f"key{idx}", "# CV")
+            os.utime(tmp_path / "1.0" / f"key{idx}.md", (time.time() + idx, time.time() + idx))
+
+        assert cache.prune(max_entries=1) == 2
+        assert [entry["key"] for entry in cache.entries()] == ["key2"]
+
+    def test_prune_removes_other_converter_versions(self, tmp_path):
+        MarkdownCache(str(tmp_path), converter_version="0.9").put("abc", "# CV")
+        cache = MarkdownCache(str(tmp_path), converter_version="1.0")
+
+        assert cache.prune() == 1
+        assert not (tmp_path / "0.9").exists()
+
+    def test_prune_skips_stray_files(self, tmp_path):
+        cache = MarkdownCache(str(tmp_path), converter_version="1.0")
+        cache.put("abc", "# CV")
+        (tmp_path / ".DS_Store").write_bytes(b"")
+
+        assert cache.prune() == 0
+        assert [entry["key"] for entry in cache.entries()] == ["abc"]
+
+    def test_from_env_disabled(self, monkeypatch):
+        monkeypatch.setenv("HERALD_CACHE_DIR", "")
+        assert MarkdownCache.from_env() is None
+
+
+class TestPrepareCvContentCache:
+    """Tests for the cache integration in ContextInterface.prepare_cv_content."""
+
+    @patch('pymupdf4llm.to_markdown')
+    def test_local_pdf_converted_once(self, mock_to_markdown, monkeypatch, tmp_path):
+        monkeypatch.setenv("HERALD_CACHE_DIR", str(tmp_path / "cache"))
+        pdf = tmp_path / "cv.pdf"
+        pdf.write_bytes(b"%PDF-1.4 cv")
+        mock_to_markdown.return_value = "# CV"
+
+        assert ContextInterface.prepare_cv_content(str(pdf)) == "# CV"
+        assert ContextInterface.prepare_cv_content(str(pdf)) == "# CV"
+        mock_to_markdown.assert_called_once_with(str(pdf))
+
+        # A changed PDF is converted again
+        pdf.write_bytes(b"%PDF-1.4 updated cv")
+        mock_to_markdown.return_value = "# Updated CV"
+        assert ContextInterface.prepare_cv_content(str(pdf)) == "# Updated CV"
+        assert mock_to_markdown.call_count == 2
+
+    @patch('pymupdf4llm.to_markdown')
+    @patch('herald.storage.r2.download_cv_file')
+    def test_r2_pdf_served_from_cache(self, mock_download_file, mock_to_markdown, monkeypatch, tmp_path):
+        monkeypatch.setenv("HERALD_CACHE_DIR", str(tmp_path))
+        monkeypatch.delenv("CV_PATH", raising=False)
+        synced_pdf = tmp_path / "r2" / "cv.pdf"
+        synced_pdf.parent.mkdir()
+        synced_pdf.write_bytes(b"%PDF-1.4 r2")
+        mock_download_file.return_value = str(synced_pdf)
+        MarkdownCache.from_env().put(pdf_sha256(b"%PDF-1.4 r2"), "# Cached CV")
+
+        assert ContextInterface.prepare_cv_content() == "# Cached CV"
+        mock_to_markdown.assert_not_called()
+
+
+class TestCacheCommands:
+    """Tests for the herald cache CLI commands."""
+
+    def test_list_and_prune(self, monkeypatch, tmp_path, capsys):
+        monkeypatch.setenv("HERALD_CACHE_DIR", str(tmp_path))
+        MarkdownCache.from_env().put("0123456789abcdef0123", "# CV")
+
+        assert cli_main(["cache", "list"]) == 0
+        assert "0123456789abcdef" in capsys.readouterr().out
+
+        assert cli_main(["cache", "prune", "--max-entries", "0"]) == 0
+        assert "Removed 1" in capsys.readouterr().out
+        assert MarkdownCache.from_env().entries() == []
+
+    def test_disabled_cache(self, capsys):
+        assert cli_main(["cache", "list"]) == 0
+        assert "disabled" in capsys.readouterr().out
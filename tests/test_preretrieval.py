@@ -0,0 +1,180 @@
+"""Tests for speculative pre-retrieval of CV chunks."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from agents.run_config import ModelInputData
+
+from herald.app import HeraldApp
+from herald.preretrieval import EXCERPTS_HEADER, PROFILE, TOPIC_EXEMPLARS, PreRetrieval, PreRetrievedTurn
+
+TOPICS = list(TOPIC_EXEMPLARS)
+
+
+def _axis(topic, weight=1.0):
+    return [weight if label == topic else 0.0 for label in TOPICS]
+
+
+def _embed_texts(texts):
+    """Embed every exemplar on the axis of its section."""
+    topics = {question: topic for topic, questions in TOPIC_EXEMPLARS.items() for question in questions}
+    return [_axis(topics[text]) for text in texts]
+
+
+def _store(query_embedding):
+    store = MagicMock()
+    store.aembed_query = AsyncMock(return_value=query_embedding)
+    store.embed_documents = MagicMock(side_effect=_embed_texts)
+    store.aretrieve_many = AsyncMock(side_effect=lambda queries: [[f"{topic} chunk", "shared chunk"]
+                                                                  for _, topic, _ in queries])
+    return store
+
+
+class TestPreRetrieval:
+    """Tests for topic prediction, fetching and the savings report."""
+
+    @pytest.mark.asyncio
+    async def test_predicts_sections_within_margin(self):
+        embedding = [a + b for a, b in zip(_axis("Skills"), _axis("Experience", 0.97))]
+        preretrieval = PreRetrieval(_store(embedding), max_topics=3, topic_margin=0.05, holdout=0)
+
+        assert await preretrieval.predict_topics("Where did you use Python?") == ["Skills", "Experience"]
+
+    @pytest.mark.asyncio
+    async def test_prepare_fetches_top_chunks_per_section(self):
+        store = _store(_axis(PROFILE))
+        preretrieval = PreRetrieval(store, top_k=2, topic_margin=0.05, holdout=0)
+
+        turn = await preretrieval.prepare("Tell me about yourself")
+
+        # the profile searches every section
+        store.aretrieve_many.assert_awaited_once_with([("Tell me about yourself", None, 2)])
+        assert turn.topics == [PROFILE] and not turn.holdout
+        assert turn.chunks == ["None chunk", "shared chunk"]
+
+    @pytest.mark.asyncio
+    async def test_holdout_skips_fetch(self):
+        store = _store(_axis("Skills"))
+        turn = await PreRetrieval(store, holdout=1).prepare("Skills?")
+
+        assert turn.holdout and turn.chunks == []
+        store.aretrieve_many.assert_not_called()
+
+    def test_stats_compare_both_groups(self):
+        preretrieval = PreRetrieval(_store(_axis("Skills")), holdout=0.5)
+        prefetched = PreRetrievedTurn(topics=["Skills"], started=0.0)
+        baseline = PreRetrievedTurn(holdout=True, started=0.0)
+        prefetched.model_calls, baseline.model_calls = 1, 2
+        with patch("herald.preretrieval.time.perf_counter", return_value=1.0):
+            preretrieval.record(prefetched)
+        with patch("herald.preretrieval.time.perf_counter", return_value=2.5):
+            preretrieval.record(baseline)
+
+        stats = preretrieval.stats()
+
+        assert stats["turns_saved_per_request"] == 1.0
+        assert stats["seconds_saved_per_request"] == 1.5
+        assert stats["prefetched"]["single_call_share"] == 1.0
+        assert stats["topics"]["Skills"] == 1
+
+    def test_savings_unknown_without_holdout_runs(self):
+        preretrieval = PreRetrieval(_store(_axis("Skills")), holdout=0)
+        preretrieval.record(PreRetrievedTurn(model_calls=1))
+        assert preretrieval.stats()["turns_saved_per_request"] is None
+
+
+def test_turn_inserts_chunks_before_visitor_message():
+    turn = PreRetrievedTurn(chunks=["Python, AWS"])
+    model_data = ModelInputData(
+        input=[{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello"},
+               {"role": "user", "content": "Skills?"}, {"type": "function_call", "call_id": "1"}],
+        instructions="system prompt",
+    )
+
+    sent = turn.apply(model_data)
+
+    assert sent.input[2]["role"] == "system" and sent.input[2]["content"].startswith(EXCERPTS_HEADER)
+    assert "Python, AWS" in sent.input[2]["content"]
+    assert sent.input[3] == {"role": "user", "content": "Skills?"}
+    assert sent.instructions == "system prompt" and len(model_data.input) == 4
+
+
+@patch('herald.app._build_groq_model')
+@patch('herald.app.Agent')
+@patch('herald.app.Runner')
+class TestHeraldAppPreRetrieval:
+    """Tests for HeraldApp sending pre-retrieved chunks with the visitor's message."""
+
+    @staticmethod
+    def _app(store):
+        prompt = MagicMock(type="rag_based")
+        prompt.context_store = store
+        with pytest.MonkeyPatch.context() as env:
+            env.setenv("PRERETRIEVAL", "true")
+            env.setenv("PRERETRIEVAL_HOLDOUT", "0")
+            env.setenv("ANSWER_CACHE_SIZE", "0")
+            return HeraldApp(prompt=prompt)
+
+    @pytest.mark.asyncio
+    async def test_chunks_reach_every_model_call_and_run_is_recorded(self, mock_runner, *_mocks):
+        app = self._app(_store(_axis("Skills")))
+        sent = []
+
+        async def fake_run(_agent, message, **kwargs):
+            data = MagicMock(model_data=ModelInputData(input=[{"role": "user", "content": message}], instructions=""))
+            sent.append(kwargs["run_config"].call_model_input_filter(data))
+            return MagicMock(final_output="I know Python.", raw_responses=[MagicMock()])
+
+        mock_runner.run = AsyncMock(side_effect=fake_run)
+        session = MagicMock(session_id="visitor")
+
+        answers = [answer async for answer in app.run(message="Skills?", session=session)]
+
+        assert answers == ["I know Python."]
+        assert "Skills chunk" in sent[0].input[0]["content"]
+        assert app.preretrieval.stats()["prefetched"]["model_calls_per_run"] == 1
+
+    @pytest.mark.asyncio
+    @patch('herald.app._build_fallback_model')
+    async def test_only_the_winning_hedge_run_is_counted(self, _mock_fallback, mock_runner, mock_agent, _mock_build):
+        mock_agent.side_effect = lambda **options: MagicMock(model=options["model"])
+        with pytest.MonkeyPatch.context() as env:
+            env.setenv("HEDGE_DELAY", "0.01")
+            app = self._app(_store(_axis("Skills")))
+        primary = app.herald_agent()
+
+        async def fake_run(agent, _run_input, **kwargs):
+            data = MagicMock(model_data=ModelInputData(input=[{"role": "user", "content": "Skills?"}], instructions=""))
+            if agent is primary:
+                # the primary's tool call round trip goes through the filter before the fallback wins
+                kwargs["run_config"].call_model_input_filter(data)
+                kwargs["run_config"].call_model_input_filter(data)
+                await asyncio.sleep(10)
+            kwargs["run_config"].call_model_input_filter(data)
+            return MagicMock(final_output="I know Python.", last_agent=agent, raw_responses=[MagicMock()])
+
+        mock_runner.run = AsyncMock(side_effect=fake_run)
+        session = MagicMock(session_id="visitor", get_items=AsyncMock(return_value=[]), add_items=AsyncMock())
+
+        answers = [answer async for answer in app.run(message="Skills?", session=session)]
+
+        assert answers == ["I know Python."]
+        assert app.preretrieval.stats()["prefetched"]["model_calls_per_run"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_leaves_retrieval_to_tools(self, mock_runner, *_mocks):
+        store = _store(_axis("Skills"))
+        store.aretrieve_many.side_effect = RuntimeError("index closed")
+        app = self._app(store)
+        mock_runner.run = AsyncMock(return_value=MagicMock(final_output="answer"))
+
+        answers = [answer async for answer in app.run(message="Skills?", session=MagicMock(session_id="visitor"))]
+
+        assert answers == ["answer"]
+        assert app.preretrieval.stats()["prefetched"]["runs"] == 0
+
+    def test_disabled_for_basic_prompt(self, *_mocks):
+        with pytest.MonkeyPatch.context() as env:
+            env.setenv("PRERETRIEVAL", "true")
+            assert HeraldApp(prompt=MagicMock(type="basic_prompt")).preretrieval is None
@@ -0,0 +1,144 @@
+"""Tests for the query embedding and retrieval result caches."""
+
+from unittest.mock import patch
+
+import pytest
+
+from herald.context_manager.query_cache import QueryEmbeddingCache, RetrievalCache
+from herald.context_manager.rag import CVVectorStore
+
+
+class TestQueryEmbeddingCache:
+    """Tests for the LRU cache itself."""
+
+    def test_hits_and_misses(self):
+        cache = QueryEmbeddingCache(maxsize=4)
+        assert cache.get("degree university") is None
+        cache.put("degree university", [0.1, 0.2])
+
+        assert cache.get("degree university") == [0.1, 0.2]
+        assert cache.stats() == {
+            "size": 1, "maxsize": 4, "ttl_seconds": None, "hits": 1, "misses": 1, "hit_rate": 0.5,
+        }
+
+    def test_least_recently_used_is_evicted(self):
+        cache = QueryEmbeddingCache(maxsize=2)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        cache.get("a")  # b is now least recently used
+        cache.put("c", [3.0])
+
+        assert "a" in cache and "c" in cache and "b" not in cache
+        assert len(cache) == 2
+
+    def test_size_zero_disables_caching(self):
+        cache = QueryEmbeddingCache(maxsize=0)
+        cache.put("a", [1.0])
+        assert cache.get("a") is None and len(cache) == 0
+
+    def test_size_from_env(self, monkeypatch):
+        monkeypatch.setenv("QUERY_EMBEDDING_CACHE_SIZE", "8")
+        assert QueryEmbeddingCache().maxsize == 8
+
+
+class TestRetrievalCache:
+    """Tests for TTL expiry of retrieval results."""
+
+    def test_entries_expire_after_ttl(self):
+        cache = RetrievalCache(maxsize=4, ttl=10)
+        with patch("herald.context_manager.query_cache.time.monotonic", return_value=100.0):
+            cache.put("key", ("doc",))
+        with patch("herald.context_manager.query_cache.time.monotonic", return_value=109.0):
+            assert cache.get("key") == ("doc",)
+        with patch("herald.context_manager.query_cache.time.monotonic", return_value=110.0):
+            assert cache.get("key") is None
+        assert len(cache) == 0 and cache.stats()["misses"] == 1
+
+    def test_defaults_from_env(self, monkeypatch):
+        monkeypatch.setenv("RETRIEVAL_CACHE_SIZE", "16")
+        monkeypatch.setenv("RETRIEVAL_CACHE_TTL", "0")
+        cache = RetrievalCache()
+        assert cache.maxsize == 16 and cache.ttl is None
+
+
+@pytest.fixture
+def vector_store(sample_cv_chunks, mock_embedding_function):
+    """Indexed store on the NumPy backend."""
+    with patch('herald.context_manager.rag.tqdm.tqdm', lambda x, **kwargs: x):
+        store = CVVectorStore(sample_cv_chunks, embedding_function=mock_embedding_function, index_backend="numpy")
+        store.vectorize_chunks()
+    mock_embedding_function.reset_mock()
+    return store
+
+
+class TestVectorStoreQueryCache:
+    """Tests for query embedding caching in CVVectorStore."""
+
+    def test_repeated_query_is_embedded_once(self, vector_store, mock_embedding_function):
+        first = vector_store.retrieve_relevant_chunks("Python experience", top_k=2, topic="Skills")
+        second = vector_store.retrieve_relevant_chunks("Python experience", top_k=4)
+
+        mock_embedding_function.assert_called_once_with(["Python experience"])
+        assert first and second
+        assert vector_store.query_cache.stats()["hits"] == 1
+
+    def test_warm_query_cache(self, vector_store, mock_embedding_function):
+        assert vector_store.warm_query_cache(["degree university", "university", "degree university"]) == 2
+        assert vector_store.warm_query_cache(["university"]) == 0
+
+        vector_store.retrieve_relevant_chunks("university")
+
+        mock_embedding_function.assert_called_once_with(["degree university", "university"])
+        assert vector_store.query_cache.stats()["misses"] == 0
+
+    def test_reindexed_store_keeps_warm_cache(self, vector_store, sample_cv_chunks, mock_embedding_function):
+        vector_store.warm_query_cache(["degree university"])
+
+        reindexed = CVVectorStore(
+            sample_cv_chunks, embedding_function=mock_embedding_function, previous_store=vector_store,
+        )
+
+        assert reindexed.query_cache is vector_store.query_cache
+
+
+class TestVectorStoreRetrievalCache:
+    """Tests for retrieval result caching in CVVectorStore."""
+
+    def test_repeated_retrieval_skips_embedding_and_index(self, vector_store, mock_embedding_function):
+        first = vector_store.retrieve_relevant_chunks("Python experience", top_k=2)
+        with patch("herald.context_manager.vector_index.NumpyVectorIndex.query_many") as mock_query:
+            second = vector_store.retrieve_relevant_chunks("Python experience", top_k=2)
+
+        mock_query.assert_not_called()
+        assert mock_embedding_function.call_count == 1
+        assert second == first and second is not first
+        assert vector_store.retrieval_cache.stats()["hits"] == 1
+
+    def test_chunks_by_topic_are_cached(self, vector_store):
+        first = vector_store.get_all_chunks_by_topic("Skills")
+        with patch("herald.context_manager.vector_index.NumpyVectorIndex.documents_by_topic") as mock_by_topic:
+            assert vector_store.get_all_chunks_by_topic("Skills") == first
+        mock_by_topic.assert_not_called()
+
+    def test_index_change_invalidates_results(self, vector_store):
+        version = vector_store.corpus_version
+        assert len(vector_store.get_all_chunks_by_topic("Skills")) == 1
+
+        with patch('herald.context_manager.rag.tqdm.tqdm', lambda x, **kwargs: x):
+            vector_store.vectorize_chunks([{"topic": "Skills", "content": "Rust, Go"}])
+
+        assert vector_store.corpus_version != version
+        assert len(vector_store.get_all_chunks_by_topic("Skills")) == 2
+
+    def test_reindexed_store_shares_results_of_identical_corpus(self, vector_store, sample_cv_chunks,
+                                                               mock_embedding_function):
+        expected = vector_store.retrieve_relevant_chunks("Python experience")
+        with patch('herald.context_manager.rag.tqdm.tqdm', lambda x, **kwargs: x):
+            reindexed = CVVectorStore(
+                sample_cv_chunks, embedding_function=mock_embedding_function, previous_store=vector_store,
+            )
+            reindexed.vectorize_chunks()
+
+        assert reindexed.corpus_version == vector_store.corpus_version
+        assert reindexed.retrieve_relevant_chunks("Python experience") == expected
+        assert reindexed.retrieval_cache.stats()["hits"] == 1
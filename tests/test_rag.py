@@ -1,14 +1,31 @@
 """Tests for RAG vector store module."""
 
+import threading
+
+import numpy as np
 import pytest
+from chromadb.api.types import EmbeddingFunction
 from unittest.mock import MagicMock, patch
+from herald.context_manager import rag
 from herald.context_manager.rag import CVVectorStore
+from herald.storage.embedding_cache import EmbeddingCache
+
+
+class _FixedEmbedding(EmbeddingFunction):
+    """Real ChromaDB embedding function returning one fixed vector per text, no model download."""
+
+    def __init__(self):
+        pass
 
+    def __call__(self, input):  # pylint: disable=redefined-builtin
+        return [np.array([0.1, 0.2, 0.3], dtype=np.float32) for _ in input]
 
+
+@pytest.mark.usefixtures("chroma_backend")
 class TestCVVectorStore:
-    """Test cases for CVVectorStore."""
+    """Test cases for CVVectorStore on the ChromaDB backend."""
 
-    @patch('herald.context_manager.rag.chromadb.Client')
+    @patch('herald.context_manager.vector_index.chromadb.Client')
     def test_init(self, mock_chromadb, sample_cv_chunks):
         """Test initialization of CVVectorStore."""
         mock_client = MagicMock()
@@ -20,11 +37,11 @@ class TestCVVectorStore:
 
         assert vector_store._CVVectorStore__cv_chunks == sample_cv_chunks
         mock_chromadb.assert_called_once()
-        # collection must be created with the cv_lookup name
+        # collection must be created with a unique cv_lookup name
         call_kwargs = mock_client.create_collection.call_args[1]
-        assert call_kwargs['name'] == "cv_lookup"
+        assert call_kwargs['name'].startswith("cv_lookup_")
 
-    @patch('herald.context_manager.rag.chromadb.Client')
+    @patch('herald.context_manager.vector_index.chromadb.Client')
     def test_init_uses_in_memory_client(self, mock_chromadb, sample_cv_chunks):
         """CVVectorStore uses an in-memory ChromaDB client (no persist_directory)."""
         mock_client = MagicMock()
@@ -40,7 +57,7 @@ class TestCVVectorStore:
         """Test chunk normalization with string content."""
         chunk = {"topic": "Skills", "content": "Python, AWS, Docker"}
 
-        with patch('herald.context_manager.rag.chromadb.Client'):
+        with patch('herald.context_manager.vector_index.chromadb.Client'):
             vector_store = CVVectorStore([])
             normalized = vector_store._CVVectorStore__normalize_chunk(chunk)
 
@@ -59,7 +76,7 @@ class TestCVVectorStore:
             }
         }
 
-        with patch('herald.context_manager.rag.chromadb.Client'):
+        with patch('herald.context_manager.vector_index.chromadb.Client'):
             vector_store = CVVectorStore([])
             normalized = vector_store._CVVectorStore__normalize_chunk(chunk)
 
@@ -68,8 +85,8 @@ class TestCVVectorStore:
         assert "Company A" in normalized
 
     @patch('herald.context_manager.rag.tqdm.tqdm')
-    @patch('herald.context_manager.rag.chromadb.Client')
-    def test_vectorize_chunks(self, mock_chromadb, mock_tqdm, sample_cv_chunks):
+    @patch('herald.context_manager.vector_index.chromadb.Client')
+    def test_vectorize_chunks(self, mock_chromadb, mock_tqdm, sample_cv_chunks, mock_embedding_function):
         """Test vectorizing and storing CV chunks."""
         mock_client = MagicMock()
         mock_collection = MagicMock()
@@ -79,14 +96,118 @@ class TestCVVectorStore:
         # Make tqdm return the input iterable
         mock_tqdm.side_effect = lambda x, **kwargs: x
 
-        vector_store = CVVectorStore(sample_cv_chunks)
+        vector_store = CVVectorStore(sample_cv_chunks, embedding_function=mock_embedding_function)
         vector_store.vectorize_chunks()
 
-        # ChromaDB handles embedding internally — just verify each chunk was stored
-        assert mock_collection.add.call_count == len(sample_cv_chunks)
+        # All chunks fit in one batch: one embedding call and one bulk upsert
+        mock_embedding_function.assert_called_once()
+        mock_collection.upsert.assert_called_once()
+        call_kwargs = mock_collection.upsert.call_args[1]
+        assert len(call_kwargs['documents']) == len(sample_cv_chunks)
+        assert len(call_kwargs['embeddings']) == len(sample_cv_chunks)
+        assert call_kwargs['ids'] == [f"chunk_{idx}" for idx in range(len(sample_cv_chunks))]
+
+    @patch('herald.context_manager.rag.tqdm.tqdm', lambda x, **kwargs: x)
+    @patch('herald.context_manager.vector_index.chromadb.Client')
+    def test_vectorize_chunks_in_batches(self, mock_chromadb, sample_cv_chunks, mock_embedding_function):
+        """Chunks are streamed, embedded and upserted in configurable batch sizes."""
+        mock_collection = MagicMock()
+        mock_chromadb.return_value.create_collection.return_value = mock_collection
+
+        # A generator works as the chunk source — it is consumed one batch at a time
+        vector_store = CVVectorStore((chunk for chunk in sample_cv_chunks), embedding_function=mock_embedding_function)
+        stats = vector_store.vectorize_chunks(batch_size=3)
+
+        assert mock_embedding_function.call_count == 2
+        assert mock_collection.upsert.call_count == 2
+        assert mock_collection.upsert.call_args_list[1][1]['ids'] == ["chunk_3"]
+        assert stats.chunks == 4 and stats.batches == 2 and stats.embedded == 4 and stats.cached == 0
+        assert vector_store.cv_chunks == sample_cv_chunks
+        assert vector_store.ingest_stats is stats
+
+    @patch('herald.context_manager.rag.tqdm.tqdm', lambda x, **kwargs: x)
+    @patch('herald.context_manager.vector_index.chromadb.Client')
+    def test_vectorize_chunks_appends_documents(self, mock_chromadb, sample_cv_chunks, mock_embedding_function):
+        """Indexing a second set of chunks appends to the existing index."""
+        mock_collection = MagicMock()
+        mock_chromadb.return_value.create_collection.return_value = mock_collection
+
+        vector_store = CVVectorStore(sample_cv_chunks[:2], embedding_function=mock_embedding_function)
+        vector_store.vectorize_chunks()
+        vector_store.vectorize_chunks(chunks=sample_cv_chunks[2:])
+
+        assert mock_collection.upsert.call_args[1]['ids'] == ["chunk_2", "chunk_3"]
+        assert len(vector_store.export_index()[0]) == 4
+        assert vector_store.cv_chunks == sample_cv_chunks
+
+    @patch('herald.context_manager.rag.tqdm.tqdm', lambda x, **kwargs: x)
+    def test_vectorize_chunks_twice_does_not_duplicate(self, sample_cv_chunks, mock_embedding_function, monkeypatch):
+        """Re-ingesting the store's own chunks replaces the index instead of appending to it."""
+        monkeypatch.setenv("RETRIEVAL_MODE", "vector")
+        vector_store = CVVectorStore(
+            sample_cv_chunks[:2], embedding_function=mock_embedding_function, index_backend="numpy"
+        )
+        vector_store.vectorize_chunks()
+        vector_store.vectorize_chunks()
 
-    @patch('herald.context_manager.rag.chromadb.Client')
-    def test_retrieve_relevant_chunks(self, mock_chromadb, sample_cv_chunks):
+        # the second run reuses the embeddings of the first
+        mock_embedding_function.assert_called_once()
+        assert len(vector_store.export_index()[0]) == 2
+        assert len(vector_store.retrieve_relevant_chunks("John", top_k=4)) == 2
+
+    @patch('herald.context_manager.rag.tqdm.tqdm', lambda x, **kwargs: x)
+    @patch('herald.context_manager.vector_index.chromadb.Client')
+    def test_vectorize_chunks_uses_embedding_cache(
+        self, mock_chromadb, sample_cv_chunks, mock_embedding_function, tmp_path
+    ):
+        """Unchanged chunks are served from the embedding cache on the next start."""
+        mock_chromadb.return_value.create_collection.return_value = MagicMock()
+        cache = EmbeddingCache(str(tmp_path / "embeddings.db"), model_id="mock-embedder")
+
+        CVVectorStore(sample_cv_chunks, mock_embedding_function, cache).vectorize_chunks()
+        assert mock_embedding_function.call_count == 1
+
+        # Second start with one edited chunk: only that chunk is embedded again
+        edited = sample_cv_chunks[:-1] + [{"topic": "Skills", "content": "Python, AWS, Docker, Rust"}]
+        stats = CVVectorStore(edited, mock_embedding_function, cache).vectorize_chunks()
+
+        assert mock_embedding_function.call_count == 2
+        assert len(mock_embedding_function.call_args[0][0]) == 1
+        assert "Rust" in mock_embedding_function.call_args[0][0][0]
+        assert stats.embedded == 1 and stats.cached == 3
+
+    @patch('herald.context_manager.rag.tqdm.tqdm', lambda x, **kwargs: x)
+    @patch('herald.context_manager.vector_index.chromadb.Client')
+    def test_previous_store_embeddings_are_reused(self, mock_chromadb, sample_cv_chunks, mock_embedding_function):
+        """A reindexed store only embeds chunks the previous store did not already index."""
+        mock_chromadb.return_value.create_collection.return_value = MagicMock()
+        previous = CVVectorStore(sample_cv_chunks, embedding_function=mock_embedding_function)
+        previous.vectorize_chunks()
+
+        edited = sample_cv_chunks[:-1] + [{"topic": "Skills", "content": "Python, AWS, Docker, Rust"}]
+        store = CVVectorStore(edited, embedding_function=mock_embedding_function, previous_store=previous)
+        stats = store.vectorize_chunks()
+
+        assert mock_embedding_function.call_args[0][0] == [store.export_index()[0][-1]]
+        assert stats.embedded == 1 and stats.cached == 3
+        assert store.corpus_version != previous.corpus_version
+
+    def test_stores_coexist_and_close(self, sample_cv_chunks):
+        """Two stores can be alive at once (e.g. during a reindex) and closing one leaves the other usable."""
+        old = CVVectorStore(sample_cv_chunks, embedding_function=_FixedEmbedding())
+        new = CVVectorStore(sample_cv_chunks, embedding_function=_FixedEmbedding())
+        old.vectorize_chunks()
+        new.vectorize_chunks()
+
+        old.close()
+        old.close()  # closing twice is harmless
+
+        assert len(new.get_all_chunks_by_topic("Skills")) == 1
+        assert new.corpus_version == old.corpus_version
+        new.close()
+
+    @patch('herald.context_manager.vector_index.chromadb.Client')
+    def test_retrieve_relevant_chunks(self, mock_chromadb, sample_cv_chunks, mock_embedding_function):
         """Test retrieving relevant chunks based on query."""
         mock_client = MagicMock()
         mock_collection = MagicMock()
@@ -99,18 +220,19 @@ class TestCVVectorStore:
             'metadatas': [[{'topic': 'Skills'}, {'topic': 'Experience'}]]
         }
 
-        vector_store = CVVectorStore(sample_cv_chunks)
+        vector_store = CVVectorStore(sample_cv_chunks, embedding_function=mock_embedding_function)
         results = vector_store.retrieve_relevant_chunks("Python experience", top_k=2)
 
-        # Verify collection was queried with query_texts (ChromaDB embeds internally)
+        # The query is embedded by the store and the collection is searched with that embedding
+        mock_embedding_function.assert_called_once_with(["Python experience"])
         mock_collection.query.assert_called_once()
         call_kwargs = mock_collection.query.call_args[1]
-        assert call_kwargs['query_texts'] == ["Python experience"]
+        assert call_kwargs['query_embeddings'] == [[0.1, 0.2, 0.3]]
 
         assert isinstance(results, list)
 
-    @patch('herald.context_manager.rag.chromadb.Client')
-    def test_retrieve_relevant_chunks_custom_top_k(self, mock_chromadb, sample_cv_chunks):
+    @patch('herald.context_manager.vector_index.chromadb.Client')
+    def test_retrieve_relevant_chunks_custom_top_k(self, mock_chromadb, sample_cv_chunks, mock_embedding_function):
         """Test retrieving chunks with custom top_k value."""
         mock_client = MagicMock()
         mock_collection = MagicMock()
@@ -123,7 +245,7 @@ class TestCVVectorStore:
             'metadatas': [[{'topic': 'A'}, {'topic': 'B'}, {'topic': 'C'}]]
         }
 
-        vector_store = CVVectorStore(sample_cv_chunks)
+        vector_store = CVVectorStore(sample_cv_chunks, embedding_function=mock_embedding_function)
         vector_store.retrieve_relevant_chunks("test query", top_k=3)
 
         call_kwargs = mock_collection.query.call_args[1]
@@ -131,7 +253,7 @@ class TestCVVectorStore:
 
     @patch('herald.context_manager.rag.FunctionTool')
     @patch('herald.context_manager.rag.function_tool')
-    @patch('herald.context_manager.rag.chromadb.Client')
+    @patch('herald.context_manager.vector_index.chromadb.Client')
     def test_create_tools(self, mock_chromadb, mock_function_tool, mock_function_tool_cls, sample_cv_chunks):
         """Test creating topic-specific tools for agent use."""
         mock_client = MagicMock()
@@ -146,14 +268,15 @@ class TestCVVectorStore:
         tools = vector_store.create_tools()
 
         # list_all_experience_chunks uses FunctionTool directly (no-arg tool needs explicit schema)
-        # the remaining 5 tools use the function_tool decorator
+        # the remaining 6 tools use the function_tool decorator
         assert mock_function_tool_cls.call_count == 1
-        assert mock_function_tool.call_count == 5
+        assert mock_function_tool.call_count == 6
         assert isinstance(tools, list)
-        assert len(tools) == 6
+        assert len(tools) == 7
 
-    @patch('herald.context_manager.rag.chromadb.Client')
-    def test_create_tools_inner_function_delegates(self, mock_chromadb, sample_cv_chunks):
+    @pytest.mark.asyncio
+    @patch('herald.context_manager.vector_index.chromadb.Client')
+    async def test_create_tools_inner_function_delegates(self, mock_chromadb, sample_cv_chunks, mock_embedding_function):
         """Test that calling an inner tool function delegates to retrieve_relevant_chunks."""
         mock_client = MagicMock()
         mock_collection = MagicMock()
@@ -168,10 +291,60 @@ class TestCVVectorStore:
 
         # Use function_tool as identity so the inner fns are directly callable
         with patch('herald.context_manager.rag.function_tool', side_effect=lambda f: f):
-            vector_store = CVVectorStore(sample_cv_chunks)
+            vector_store = CVVectorStore(sample_cv_chunks, embedding_function=mock_embedding_function)
             tools = vector_store.create_tools()
             # retrieve_experience_chunks is the second tool (index 1)
             retrieve_experience = tools[1]
-            result = retrieve_experience(query="Python skills", top_k=1)
+            result = await retrieve_experience(query="Python skills", top_k=1)
 
         assert result == ['Relevant chunk']
+
+
+class TestAsyncRetrieval:
+    """Tests for the async retrieval variants and the bounded retrieval pool."""
+
+    @pytest.fixture
+    def vector_store(self, sample_cv_chunks, monkeypatch):
+        monkeypatch.setenv("RETRIEVAL_MODE", "vector")
+        threads = []
+
+        def embed(texts):
+            threads.append(threading.current_thread().name)
+            return [[0.1, 0.2, 0.3] for _ in texts]
+
+        with patch('herald.context_manager.rag.tqdm.tqdm', lambda x, **kwargs: x):
+            store = CVVectorStore(sample_cv_chunks, embedding_function=embed, index_backend="numpy")
+            store.vectorize_chunks()
+        threads.clear()
+        store.embedding_threads = threads
+        return store
+
+    @pytest.mark.asyncio
+    async def test_uncached_query_runs_in_retrieval_pool(self, vector_store):
+        results = await vector_store.aretrieve_relevant_chunks("Python", top_k=2)
+
+        assert results == vector_store.retrieve_relevant_chunks("Python", top_k=2)
+        assert len(vector_store.embedding_threads) == 1
+        assert vector_store.embedding_threads[0].startswith("herald-retrieval")
+
+    @pytest.mark.asyncio
+    async def test_cached_results_skip_the_pool(self, vector_store):
+        await vector_store.aretrieve_many([("Python", None, 2)])
+        expected = vector_store.get_all_chunks_by_topic("Skills")
+
+        with patch('herald.context_manager.rag.retrieval_executor') as mock_executor:
+            assert await vector_store.aretrieve_many([("Python", None, 2)]) == [
+                vector_store.retrieve_relevant_chunks("Python", top_k=2)
+            ]
+            assert await vector_store.aget_all_chunks_by_topic("Skills") == expected
+
+        mock_executor.assert_not_called()
+
+    def test_pool_size_from_env(self, monkeypatch):
+        monkeypatch.setenv("RETRIEVAL_CONCURRENCY", "2")
+        monkeypatch.setattr(rag, "_EXECUTOR", None)
+
+        executor = rag.retrieval_executor()
+
+        assert executor._max_workers == 2 and rag.retrieval_executor() is executor
+        executor.shutdown()
@@ -0,0 +1,88 @@
+"""Tests for live CV hot-reload."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from herald.reloader import CVReloader
+
+
+def _rag_context(documents):
+    """Mock RAG context indexing the given documents."""
+    context = MagicMock()
+    context.type = "rag_based"
+    context.context_store.export_index.return_value = (list(documents), [], [])
+    return context
+
+
+@pytest.fixture
+def state():
+    """Application state serving a context built from the first CV version."""
+    return SimpleNamespace(herald_prompt=_rag_context(["a", "b", "c"]), herald_app=MagicMock())
+
+
+class TestCVReloader:
+    """Tests for CVReloader."""
+
+    @pytest.mark.asyncio
+    @patch("herald.reloader.HeraldApp")
+    async def test_unchanged_fingerprint_is_a_no_op(self, mock_herald_app, state):
+        build_context = MagicMock()
+        reloader = CVReloader(state, build_context, fingerprint=lambda: "v1", interval=0)
+        await reloader.start()
+
+        result = await reloader.reload()
+
+        assert result == {"reloaded": False, "fingerprint": "v1"}
+        build_context.assert_not_called()
+        mock_herald_app.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("herald.reloader.HeraldApp")
+    async def test_changed_cv_is_swapped_in(self, mock_herald_app, state):
+        fingerprints = iter(["v1", "v2"])
+        old_prompt, new_prompt = state.herald_prompt, _rag_context(["a", "b", "d", "e"])
+        build_context = MagicMock(return_value=new_prompt)
+        reloader = CVReloader(state, build_context, fingerprint=lambda: next(fingerprints), interval=0)
+        await reloader.start()
+
+        result = await reloader.reload(reason="test")
+
+        build_context.assert_called_once_with(old_prompt)
+        assert state.herald_prompt is new_prompt
+        assert state.herald_app is mock_herald_app.return_value
+        assert result["reloaded"] is True
+        assert (result["chunks"], result["added"], result["removed"]) == (4, 2, 1)
+        assert reloader.current_fingerprint == "v2"
+        assert reloader.last_reload["reason"] == "test"
+
+    @pytest.mark.asyncio
+    @patch("herald.reloader.HeraldApp")
+    async def test_failed_rebuild_keeps_serving_old_context(self, mock_herald_app, state):
+        old_prompt, old_app = state.herald_prompt, state.herald_app
+        build_context = MagicMock(side_effect=ValueError("broken PDF"))
+        reloader = CVReloader(state, build_context, fingerprint=lambda: "v1", interval=0)
+
+        with pytest.raises(ValueError):
+            await reloader.reload(force=True)
+
+        assert state.herald_prompt is old_prompt and state.herald_app is old_app
+        mock_herald_app.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("herald.reloader.HeraldApp")
+    async def test_watcher_polls_and_reloads(self, mock_herald_app, state):
+        fingerprints = iter(["v1"] + ["v2"] * 100)
+        new_prompt = _rag_context(["a"])
+        reloader = CVReloader(state, MagicMock(return_value=new_prompt), lambda: next(fingerprints), interval=0.01)
+        await reloader.start()
+
+        for _ in range(100):
+            if state.herald_prompt is new_prompt:
+                break
+            await asyncio.sleep(0.01)
+        await reloader.stop()
+
+        assert state.herald_prompt is new_prompt
@@ -0,0 +1,264 @@
+"""Tests for hedging and circuit breaking around the model providers."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from openai import APIConnectionError, OpenAIError
+
+from herald.app import HeraldApp
+from herald.resilience import (
+    MIN_LATENCY_SAMPLES, CircuitBreaker, HedgePolicy, LatencyTracker, circuit_breaker, first_successful,
+)
+
+
+class TestHedgePolicy:
+    """Tests for the hedge delay configuration."""
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("HEDGE_DELAY", raising=False)
+        policy = HedgePolicy()
+        assert not policy.enabled and policy.delay() is None
+
+    def test_fixed_delay(self):
+        assert HedgePolicy("1.5").delay() == 1.5
+
+    def test_percentile_delay_waits_for_samples(self):
+        policy = HedgePolicy("p90")
+        for sample in range(1, MIN_LATENCY_SAMPLES):
+            policy.latency().record(float(sample))
+        assert policy.enabled and policy.delay() is None
+
+        policy.latency().record(float(MIN_LATENCY_SAMPLES))
+        assert policy.delay() == 18.0
+
+    def test_latency_is_tracked_per_primary(self):
+        policy = HedgePolicy("p90")
+        for _ in range(MIN_LATENCY_SAMPLES):
+            policy.latency("fast").record(0.5)
+            policy.latency("large").record(4.0)
+
+        assert (policy.delay("fast"), policy.delay("large")) == (0.5, 4.0)
+        assert policy.stats()["samples"] == {"fast": MIN_LATENCY_SAMPLES, "large": MIN_LATENCY_SAMPLES}
+
+    def test_invalid_delay_raises(self):
+        with pytest.raises(ValueError, match="Unsupported HEDGE_DELAY"):
+            HedgePolicy("soon")
+
+
+def test_latency_percentile_uses_recent_window():
+    tracker = LatencyTracker(window=3)
+    for sample in (10.0, 1.0, 2.0, 3.0):
+        tracker.record(sample)
+    assert tracker.percentile(100) == 3.0 and len(tracker) == 3
+
+
+@pytest.mark.asyncio
+async def test_first_successful_skips_failures_and_cancels_losers():
+    async def fail():
+        raise RuntimeError("boom")
+
+    slow = asyncio.create_task(asyncio.sleep(10, result="slow"))
+    winner = await first_successful([asyncio.create_task(fail()), asyncio.create_task(asyncio.sleep(0.01, "fast")),
+                                     slow])
+    await asyncio.sleep(0)
+
+    assert winner.result() == "fast"
+    assert slow.cancelled()
+
+
+def _result(answer):
+    result = MagicMock(final_output=answer)
+    result.to_input_list.return_value = [
+        {"role": "user", "content": "old question"},
+        {"role": "user", "content": "Skills?"},
+        {"role": "assistant", "content": answer},
+    ]
+    return result
+
+
+@patch('herald.app._build_fallback_model')
+@patch('herald.app._build_groq_model')
+@patch('herald.app.Agent', side_effect=lambda **kwargs: MagicMock(model=kwargs["model"]))
+@patch('herald.app.Runner')
+class TestHedgedRun:
+    """Tests for HeraldApp.run with hedging enabled."""
+
+    @staticmethod
+    def _app(monkeypatch, delay, primary_seconds, fallback_seconds):
+        monkeypatch.setenv("HEDGE_DELAY", delay)
+        app = HeraldApp(prompt=MagicMock(type="basic_prompt"))
+        primary = app.herald_agent()
+        cancelled = []
+
+        async def fake_run(agent, run_input, **_kwargs):
+            seconds, answer = (primary_seconds, "groq") if agent is primary else (fallback_seconds, "openai")
+            assert run_input[-1] == {"role": "user", "content": "Skills?"}
+            try:
+                await asyncio.sleep(seconds)
+            except asyncio.CancelledError:
+                cancelled.append(answer)
+                raise
+            return _result(answer)
+
+        return app, fake_run, cancelled
+
+    @staticmethod
+    def _session():
+        session = MagicMock()
+        session.get_items = AsyncMock(return_value=[{"role": "user", "content": "old question"}])
+        session.add_items = AsyncMock()
+        return session
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_loses_to_fallback(self, mock_runner, *_mocks):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            app, fake_run, cancelled = self._app(monkeypatch, "0.01", primary_seconds=10, fallback_seconds=0.01)
+            mock_runner.run = AsyncMock(side_effect=fake_run)
+            session = self._session()
+
+            answers = [answer async for answer in app.run(message="Skills?", session=session)]
+            await asyncio.sleep(0)
+
+        assert answers == ["openai"]
+        assert cancelled == ["groq"]
+        # only the winner's new items are written, after the existing history
+        session.add_items.assert_awaited_once_with([
+            {"role": "user", "content": "Skills?"},
+            {"role": "assistant", "content": "openai"},
+        ])
+        assert app.hedge_policy.stats()["hedged"] == 1 and app.hedge_policy.stats()["fallback_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self, mock_runner, *_mocks):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            app, fake_run, _ = self._app(monkeypatch, "5", primary_seconds=0, fallback_seconds=0)
+            mock_runner.run = AsyncMock(side_effect=fake_run)
+
+            answers = [answer async for answer in app.run(message="Skills?", session=self._session())]
+
+        assert answers == ["groq"]
+        assert mock_runner.run.await_count == 1
+        assert app.hedge_policy.stats()["samples"] == {"large": 1}
+
+    @pytest.mark.asyncio
+    async def test_missing_fallback_lets_primary_finish(self, mock_runner, _mock_agent, _mock_groq, mock_fallback):
+        mock_fallback.side_effect = OpenAIError("The api_key client option must be set")
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            app, _, _ = self._app(monkeypatch, "0.01", primary_seconds=0, fallback_seconds=0)
+
+            async def slow_primary(agent, _message, **_kwargs):
+                await asyncio.sleep(0.05)
+                return _result("groq" if agent is app.herald_agent() else "openai")
+
+            mock_runner.run = AsyncMock(side_effect=slow_primary)
+
+            answers = [answer async for answer in app.run(message="Skills?", session=self._session())]
+
+        assert answers == ["groq"]
+        assert mock_runner.run.await_count == 1 and app.hedge_policy.stats()["hedged"] == 0
+
+
+class TestCircuitBreaker:
+    """Tests for the closed / open / half-open transitions."""
+
+    @staticmethod
+    def _breaker(**options):
+        return CircuitBreaker("groq", **{"failure_threshold": 3, "error_rate": 0.5, "window": 10, "cooldown": 30,
+                                         **options})
+
+    def test_consecutive_failures_open_circuit(self):
+        breaker = self._breaker()
+        for _ in range(3):
+            assert breaker.allow_request()
+            breaker.record_failure()
+
+        assert breaker.state == "open" and not breaker.allow_request()
+        assert breaker.stats()["times_opened"] == 1
+
+    def test_error_rate_opens_circuit(self):
+        breaker = self._breaker(failure_threshold=100)
+        for failed in (True, False, True, False, True):
+            if failed:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+        assert breaker.state == "open"
+
+    def test_half_open_probe_closes_circuit(self):
+        breaker = self._breaker()
+        with patch("herald.resilience.time.monotonic", return_value=100.0):
+            for _ in range(3):
+                breaker.record_failure()
+        with patch("herald.resilience.time.monotonic", return_value=130.0):
+            assert breaker.allow_request()  # the probe
+            assert not breaker.allow_request()  # everyone else waits for it
+            breaker.record_success()
+
+        assert breaker.state == "closed" and breaker.allow_request()
+
+    def test_failed_probe_reopens_circuit(self):
+        breaker = self._breaker()
+        with patch("herald.resilience.time.monotonic", return_value=100.0):
+            for _ in range(3):
+                breaker.record_failure()
+        with patch("herald.resilience.time.monotonic", return_value=130.0):
+            assert breaker.allow_request()
+            breaker.record_failure()
+            assert breaker.state == "open" and not breaker.allow_request()
+
+    def test_track_releases_cancelled_probe(self):
+        breaker = self._breaker(cooldown=0)
+        for _ in range(3):
+            breaker.record_failure()
+        assert breaker.allow_request()
+
+        with pytest.raises(asyncio.CancelledError):
+            with breaker.track((APIConnectionError,)):
+                raise asyncio.CancelledError
+
+        assert breaker.state == "half_open" and breaker.allow_request()
+
+
+@patch('herald.app._build_fallback_model')
+@patch('herald.app._build_groq_model')
+@patch('herald.app.Agent', side_effect=lambda **kwargs: MagicMock(model=kwargs["model"]))
+@patch('herald.app.Runner')
+class TestCircuitBreakerRouting:
+    """Tests for HeraldApp skipping Groq while its circuit is open."""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_goes_straight_to_fallback(self, mock_runner, *_mocks):
+        app = HeraldApp(prompt=MagicMock(type="basic_prompt"))
+        primary = app.herald_agent()
+        mock_runner.run = AsyncMock()
+        for _ in range(circuit_breaker("groq").failure_threshold):
+            mock_runner.run.side_effect = [APIConnectionError(request=MagicMock()), MagicMock(final_output="openai")]
+            await _collect(app)
+        assert circuit_breaker("groq").state == "open"
+
+        mock_runner.run = AsyncMock(return_value=MagicMock(final_output="openai"))
+        assert await _collect(app) == ["openai"]
+        assert all(call.args[0] is not primary for call in mock_runner.run.await_args_list)
+        assert circuit_breaker("openai").stats()["consecutive_failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_streams_from_fallback(self, mock_runner, *_mocks):
+        app = HeraldApp(prompt=MagicMock(type="basic_prompt"))
+        for _ in range(circuit_breaker("groq").failure_threshold):
+            circuit_breaker("groq").record_failure()
+
+        async def stream_events():
+            return
+            yield  # pylint: disable=unreachable
+
+        mock_runner.run_streamed.return_value = MagicMock(final_output="openai", stream_events=stream_events)
+        events = [event async for event in app.run_stream(message="Skills?", session=MagicMock())]
+
+        assert events == [{"type": "done", "response": "openai"}]
+        assert mock_runner.run_streamed.call_args.args[0] is app._fallback_agent()  # pylint: disable=protected-access
+
+
+async def _collect(app):
+    return [answer async for answer in app.run(message="Skills?", session=MagicMock())]
@@ -0,0 +1,154 @@
+"""Tests for routing questions between the fast and the large model."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from agents.usage import Usage
+from openai import APIConnectionError
+
+from herald.app import HeraldApp
+from herald.routing import FAST, LARGE, ROUTE_EXEMPLARS, ModelRouter, RouteDecision
+from herald.usage_tracker import TokenUsage
+
+
+def _embed_texts(texts):
+    """Embed every exemplar on the axis of its tier."""
+    tiers = {question: tier for tier, questions in ROUTE_EXEMPLARS.items() for question in questions}
+    return [[1.0, 0.0] if tiers[text] == FAST else [0.0, 1.0] for text in texts]
+
+
+def _router(query_embedding=None, **kwargs):
+    if query_embedding is None:
+        return ModelRouter(**kwargs)
+    return ModelRouter(AsyncMock(return_value=query_embedding), MagicMock(side_effect=_embed_texts), **kwargs)
+
+
+class TestModelRouter:
+    """Tests for the routing heuristics, the embedding classifier and the route statistics."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("message, topics, tier, reason", [
+        ("What's your email?", None, FAST, "heuristics"),
+        ("Did you ever work with Kubernetes in production at any of the companies you were employed at?",
+         None, LARGE, "length"),
+        ("Skills?", ["Skills", "Experience"], LARGE, "topics"),
+        ("Can you summarize your experience?", ["Experience"], LARGE, "keywords"),
+    ])
+    async def test_heuristics(self, message, topics, tier, reason):
+        decision = await _router(max_fast_words=12).route(message, topics)
+        assert (decision.tier, decision.reason) == (tier, reason)
+
+    @pytest.mark.asyncio
+    async def test_embedding_classifier_picks_nearest_tier(self):
+        assert (await _router([0.2, 0.9]).route("What ties your roles together?")).tier == LARGE
+        decision = await _router([0.9, 0.1]).route("Where are you based?")
+        assert (decision.tier, decision.reason) == (FAST, "embedding")
+
+    @pytest.mark.asyncio
+    async def test_failure_routes_to_large_model(self):
+        router = _router([1.0, 0.0])
+        router._embed_query.side_effect = RuntimeError("model not loaded")
+
+        decision = await router.route("Where are you based?")
+
+        assert (decision.tier, decision.reason) == (LARGE, "error")
+
+    @pytest.mark.asyncio
+    async def test_stats_per_route(self):
+        router = _router()
+        await router.route("Email?")
+        with patch("herald.routing.time.perf_counter", return_value=1.5):
+            router.record(RouteDecision(FAST, "heuristics", started=1.0),
+                          Usage(requests=1, input_tokens=800, output_tokens=40))
+
+        stats = router.stats()
+
+        assert stats["routes"][FAST] == {
+            "model": "openai/gpt-oss-20b",
+            "requests": 1,
+            "reasons": {"heuristics": 1},
+            "seconds_per_answer": 0.5,
+            "input_tokens_per_answer": 800,
+            "output_tokens_per_answer": 40,
+        }
+        assert stats["routes"][LARGE]["requests"] == 0
+        assert stats["routes"][LARGE]["seconds_per_answer"] is None
+
+    @pytest.mark.asyncio
+    async def test_fallback_answers_are_reported_apart(self):
+        router = _router(fallback_model="gpt-5-nano")
+        decision = await router.route("Email?")
+
+        router.record(decision, Usage(requests=1, input_tokens=500, output_tokens=30), fallback=True)
+
+        stats = router.stats()
+        assert stats["routes"][FAST]["input_tokens_per_answer"] is None
+        assert stats["fallback"]["model"] == "gpt-5-nano"
+        assert stats["fallback"]["reasons"] == {FAST: 1}
+        assert stats["fallback"]["input_tokens_per_answer"] == 500
+
+    def test_tiers_are_configurable(self, monkeypatch):
+        monkeypatch.setenv("FAST_MODEL", "llama-3.1-8b-instant")
+        monkeypatch.setenv("ROUTING_MAX_FAST_WORDS", "8")
+        router = ModelRouter()
+        assert router.models[FAST] == "llama-3.1-8b-instant" and router.max_fast_words == 8
+
+
+@patch('herald.app._build_groq_model', side_effect=lambda model: model)
+@patch('herald.app.Agent')
+@patch('herald.app.Runner')
+class TestHeraldAppRouting:
+    """Tests for HeraldApp answering each question with the agent of its routed tier."""
+
+    @staticmethod
+    def _app():
+        prompt = MagicMock(type="basic_prompt")
+        with pytest.MonkeyPatch.context() as env:
+            env.setenv("MODEL_ROUTING", "true")
+            return HeraldApp(prompt=prompt)
+
+    @pytest.mark.asyncio
+    async def test_simple_and_synthesis_questions_use_their_tiers(self, mock_runner, mock_agent, _mock_build):
+        mock_agent.side_effect = lambda **options: MagicMock(model=options["model"])
+        models = []
+
+        async def fake_run(agent, _message, **_kwargs):
+            models.append(agent.model)
+            return MagicMock(final_output="answer", last_agent=agent,
+                             context_wrapper=MagicMock(usage=Usage(requests=1, input_tokens=100, output_tokens=10)))
+
+        mock_runner.run = AsyncMock(side_effect=fake_run)
+        app = self._app()
+        usage = TokenUsage()
+
+        for message in ("What's your email?", "Give me an overview of your career"):
+            assert [answer async for answer in app.run(message=message, session=MagicMock(), usage=usage)] == [
+                "answer"]
+
+        assert models == ["openai/gpt-oss-20b", "openai/gpt-oss-120b"]
+        assert set(usage.by_model) == {"openai/gpt-oss-20b", "openai/gpt-oss-120b"}
+        routes = app.router.stats()["routes"]
+        assert routes[FAST]["input_tokens_per_answer"] == routes[LARGE]["input_tokens_per_answer"] == 100
+
+    @pytest.mark.asyncio
+    @patch('herald.app._build_fallback_model', return_value="gpt-5-nano")
+    async def test_fallback_answer_is_not_booked_to_routed_tier(self, _mock_fallback, mock_runner, mock_agent, *_mocks):
+        mock_agent.side_effect = lambda **options: MagicMock(model=options["model"])
+
+        async def fake_run(agent, _message, **_kwargs):
+            if agent.model == "openai/gpt-oss-20b":
+                raise APIConnectionError(request=MagicMock())
+            return MagicMock(final_output="answer", last_agent=agent,
+                             context_wrapper=MagicMock(usage=Usage(requests=1, input_tokens=100, output_tokens=10)))
+
+        mock_runner.run = AsyncMock(side_effect=fake_run)
+        app = self._app()
+
+        assert [answer async for answer in app.run(message="What's your email?", session=MagicMock())] == ["answer"]
+
+        stats = app.router.stats()
+        assert stats["routes"][FAST]["requests"] == 1 and stats["routes"][FAST]["seconds_per_answer"] is None
+        assert stats["fallback"]["reasons"] == {FAST: 1}
+
+    def test_disabled_by_configuration(self, *_mocks):
+        assert HeraldApp(prompt=MagicMock(type="basic_prompt")).router is None
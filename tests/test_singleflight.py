@@ -0,0 +1,116 @@
+"""Tests for coalescing identical concurrent opening questions."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from herald.app import HeraldApp
+from herald.singleflight import SingleFlight, normalize_message
+
+
+def test_normalize_message():
+    assert normalize_message("  What do you   DO? ") == normalize_message("what do you do") == "what do you do"
+
+
+class TestSingleFlight:
+    """Tests for sharing one call between concurrent callers."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        call = MagicMock(side_effect=lambda: asyncio.sleep(0.01, result="answer"))
+
+        results = await asyncio.gather(*(flight.do("key", call) for _ in range(3)))
+
+        assert results == [("answer", False), ("answer", True), ("answer", True)]
+        call.assert_called_once()
+        assert flight.stats() == {"leaders": 1, "coalesced": 2, "coalesced_share": 2 / 3, "in_flight": 0}
+
+    @pytest.mark.asyncio
+    async def test_finished_call_is_not_reused(self):
+        flight = SingleFlight()
+        call = AsyncMock(return_value="answer")
+        await flight.do("key", call)
+        await flight.do("key", call)
+        assert call.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_leader_going_away_does_not_cancel_shared_call(self):
+        flight = SingleFlight()
+        leader = asyncio.create_task(flight.do("key", lambda: asyncio.sleep(0.02, result="answer")))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", AsyncMock()))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+
+        assert await follower == ("answer", True)
+
+    @pytest.mark.asyncio
+    async def test_failure_reaches_every_caller(self):
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider down")
+
+        results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@patch('herald.app._build_groq_model')
+@patch('herald.app.Agent')
+@patch('herald.app.Runner')
+class TestHeraldAppCoalescing:
+    """Tests for HeraldApp answering identical opening questions with one agent run."""
+
+    @staticmethod
+    def _session(history=()):
+        session = MagicMock()
+        session.get_items = AsyncMock(return_value=list(history))
+        session.add_items = AsyncMock()
+        return session
+
+    @staticmethod
+    def _app():
+        prompt = MagicMock(type="basic_prompt", cv_md_content="# CV")
+        with pytest.MonkeyPatch.context() as env:
+            env.setenv("SINGLEFLIGHT", "true")
+            return HeraldApp(prompt=prompt)
+
+    @pytest.mark.asyncio
+    async def test_identical_opening_questions_share_one_run(self, mock_runner, *_mocks):
+        async def fake_run(_agent, message, session, **_kwargs):
+            await asyncio.sleep(0.01)
+            await session.add_items([{"role": "user", "content": message}, {"role": "assistant", "content": "I build"}])
+            return MagicMock(final_output="I build")
+
+        mock_runner.run = AsyncMock(side_effect=fake_run)
+        app = self._app()
+        first, second = self._session(), self._session()
+
+        async def ask(message, session):
+            return [answer async for answer in app.run(message=message, session=session)]
+
+        answers = await asyncio.gather(ask("What do you do?", first), ask("what do you do", second))
+
+        assert answers == [["I build"], ["I build"]]
+        assert mock_runner.run.await_count == 1
+        # each visitor's session gets the shared turn with their own message
+        first.add_items.assert_awaited_once_with([{"role": "user", "content": "What do you do?"},
+                                                  {"role": "assistant", "content": "I build"}])
+        second.add_items.assert_awaited_once_with([{"role": "user", "content": "what do you do"},
+                                                   {"role": "assistant", "content": "I build"}])
+        assert app.singleflight.stats()["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_follow_up_questions_run_on_own_session(self, mock_runner, *_mocks):
+        mock_runner.run = AsyncMock(return_value=MagicMock(final_output="answer"))
+        app = self._app()
+        session = self._session(history=[{"role": "user", "content": "Hi"}])
+
+        assert [answer async for answer in app.run(message="Skills?", session=session)] == ["answer"]
+        assert mock_runner.run.await_args.kwargs["session"] is session
+        assert app.singleflight.stats()["leaders"] == 0
@@ -0,0 +1,136 @@
+"""Tests for the prebuilt knowledge snapshot."""
+
+import hashlib
+import struct
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from herald.cli import main as cli_main
+from herald.context_manager.rag import CVVectorStore
+from herald.context_manager.rag_based import CANONICAL_QUERIES, HeraldRAGContextManager
+from herald.storage.snapshot import (
+    SNAPSHOT_MAGIC,
+    load_snapshot,
+    load_snapshot_from_env,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def snapshot_file(tmp_path, sample_cv_chunks):
+    """Write a small snapshot and return its path."""
+    path = str(tmp_path / "cv.snapshot")
+    write_snapshot(
+        path,
+        markdown="# John Doe",
+        chunks=sample_cv_chunks,
+        documents=["doc name", "doc summary", "doc experience", "doc skills"],
+        topics=["name", "Summary", "Experience", "Skills"],
+        embeddings=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6], [0.7, 0.8, 0.9], [1.0, 1.1, 1.2]],
+        model_id="mock-embedder[]",
+        query_embeddings={"skills": [1.0, 1.1, 1.2]},
+    )
+    return path
+
+
+class TestSnapshotFile:
+    """Tests for writing and loading snapshot files."""
+
+    def test_round_trip(self, snapshot_file, sample_cv_chunks):
+        snapshot = load_snapshot(snapshot_file)
+
+        assert snapshot.markdown == "# John Doe"
+        assert snapshot.chunks == sample_cv_chunks
+        assert snapshot.topics == ["name", "Summary", "Experience", "Skills"]
+        assert snapshot.model_id == "mock-embedder[]"
+        assert snapshot.markdown_sha256 == hashlib.sha256(b"# John Doe").hexdigest()
+        assert snapshot.embeddings.shape == (4, 3)
+        np.testing.assert_allclose(snapshot.embeddings[2], [0.7, 0.8, 0.9], rtol=1e-6)
+
+    def test_embeddings_are_memory_mapped(self, snapshot_file):
+        assert isinstance(load_snapshot(snapshot_file).embeddings, np.memmap)
+
+    def test_rejects_non_snapshot(self, tmp_path):
+        path = tmp_path / "not.snapshot"
+        path.write_bytes(b"x" * 32)
+        with pytest.raises(ValueError, match="not a Herald knowledge snapshot"):
+            load_snapshot(str(path))
+
+    def test_rejects_unsupported_version(self, tmp_path):
+        path = tmp_path / "future.snapshot"
+        path.write_bytes(struct.pack("<8sII", SNAPSHOT_MAGIC, 99, 2) + b"{}")
+        with pytest.raises(ValueError, match="Unsupported snapshot version"):
+            load_snapshot(str(path))
+
+    def test_rejects_mismatched_lengths(self, tmp_path):
+        with pytest.raises(ValueError, match="same length"):
+            write_snapshot(str(tmp_path / "bad"), "", [], ["a"], [], [], "m")
+
+    def test_load_from_env(self, monkeypatch, snapshot_file):
+        monkeypatch.setenv("HERALD_SNAPSHOT_PATH", snapshot_file)
+        assert load_snapshot_from_env().markdown == "# John Doe"
+
+    def test_load_from_env_missing_file(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("HERALD_SNAPSHOT_PATH", str(tmp_path / "missing.snapshot"))
+        assert load_snapshot_from_env() is None
+
+    def test_load_from_env_unset(self, monkeypatch):
+        monkeypatch.delenv("HERALD_SNAPSHOT_PATH", raising=False)
+        assert load_snapshot_from_env() is None
+
+
+@pytest.mark.usefixtures("chroma_backend")
+class TestSnapshotContext:
+    """Tests for starting the context managers from a snapshot."""
+
+    @patch('herald.context_manager.vector_index.chromadb.Client')
+    @patch('pymupdf4llm.to_markdown')
+    def test_rag_manager_skips_conversion_and_embedding(
+        self, mock_to_markdown, mock_chromadb, snapshot_file, mock_embedding_function
+    ):
+        mock_collection = MagicMock()
+        mock_chromadb.return_value.create_collection.return_value = mock_collection
+
+        with patch('herald.context_manager.rag.DefaultEmbeddingFunction', return_value=mock_embedding_function):
+            manager = HeraldRAGContextManager(snapshot=load_snapshot(snapshot_file))
+
+        mock_to_markdown.assert_not_called()
+        # neither chunks nor queries are embedded — the snapshot's query embeddings fill the query cache
+        mock_embedding_function.assert_not_called()
+        assert manager.context_store.query_cache.get("skills") == [1.0, 1.1, 1.2]
+        assert manager.cv_md_content == "# John Doe"
+        assert len(mock_collection.upsert.call_args[1]['documents']) == 4
+
+    @patch('herald.context_manager.vector_index.chromadb.Client')
+    def test_model_mismatch_raises(self, mock_chromadb, snapshot_file, mock_embedding_function):
+        mock_embedding_function.name.return_value = "other-model"
+        with pytest.raises(ValueError, match="Rebuild the snapshot"):
+            CVVectorStore.from_snapshot(load_snapshot(snapshot_file), embedding_function=mock_embedding_function)
+
+    @patch('herald.context_manager.rag.tqdm.tqdm', lambda x, **kwargs: x)
+    @patch('herald.context_manager.vector_index.chromadb.Client')
+    @patch('pymupdf4llm.to_markdown')
+    @patch('os.path.exists')
+    def test_build_snapshot_command(
+        self, mock_exists, mock_to_markdown, mock_chromadb, tmp_path, mock_embedding_function
+    ):
+        cv_markdown = "### Skills\nPython, AWS\n# John Doe\nEngineer\n## Summary\nBuilds things\n"
+        mock_exists.return_value = True
+        mock_to_markdown.return_value = cv_markdown
+        output = tmp_path / "built.snapshot"
+
+        with patch('herald.context_manager.rag.DefaultEmbeddingFunction', return_value=mock_embedding_function):
+            assert cli_main(["build-snapshot", "--cv", "test.pdf", "--output", str(output)]) == 0
+
+        snapshot = load_snapshot(str(output))
+        assert snapshot.markdown == cv_markdown
+        assert snapshot.model_id == "mock-embedder[]"
+        assert len(snapshot.documents) == snapshot.embeddings.shape[0] == 4
+        assert "Skills" in snapshot.topics
+        assert set(snapshot.query_embeddings) == set(CANONICAL_QUERIES)
+
+    def test_write_empty_snapshot(self, tmp_path):
+        path = write_snapshot(str(tmp_path / "empty.snapshot"), "", [], [], [], [], "m")
+        assert load_snapshot(path).embeddings.shape[0] == 0
@@ -1,10 +1,52 @@
 """Tests for the Cloudflare R2 storage client."""
 
+import boto3
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 from botocore.exceptions import ClientError
-
-from herald.storage.r2 import _build_r2_client, download_cv_bytes
+from moto.server import ThreadedMotoServer
+
+from herald.storage import r2
+from herald.storage.r2 import _build_r2_client, download_cv_bytes, download_cv_file, get_r2_client, head_cv_etag
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_client():
+    """Drop the process-wide R2 client so every test builds its own."""
+    r2._CLIENT = None
+    yield
+    r2._CLIENT = None
+
+
+@pytest.fixture(scope="module")
+def s3_server():
+    """Local S3-compatible server standing in for Cloudflare R2."""
+    server = ThreadedMotoServer(port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def r2_bucket(s3_server, monkeypatch, tmp_path):
+    """Point the R2 client at the local server and create a bucket holding a CV."""
+    monkeypatch.setenv("R2_ENDPOINT_URL", s3_server)
+    monkeypatch.setenv("R2_ACCOUNT_ID", "acct")
+    monkeypatch.setenv("R2_ACCESS_KEY_ID", "key")
+    monkeypatch.setenv("R2_SECRET_ACCESS_KEY", "secret")
+    monkeypatch.setenv("R2_BUCKET_NAME", f"herald-cv-{tmp_path.name.lower().replace('_', '-')}"[:63])
+    monkeypatch.setenv("CV_OBJECT_KEY", "cv.pdf")
+    monkeypatch.setenv("HERALD_CACHE_DIR", str(tmp_path / "cache"))
+
+    admin = boto3.client(
+        "s3", endpoint_url=s3_server, aws_access_key_id="key", aws_secret_access_key="secret",
+        region_name="us-east-1",
+    )
+    bucket = r2._cv_location()[0]
+    admin.create_bucket(Bucket=bucket)
+    admin.put_object(Bucket=bucket, Key="cv.pdf", Body=b"%PDF-1.4 original")
+    return admin, bucket
 
 
 class TestBuildR2Client:
@@ -25,8 +67,30 @@ class TestBuildR2Client:
             aws_access_key_id="test-key",
             aws_secret_access_key="test-secret",
             region_name="auto",
+            config=ANY,
         )
 
+    @patch.dict("os.environ", {
+        "R2_ACCOUNT_ID": "test-account",
+        "R2_ACCESS_KEY_ID": "test-key",
+        "R2_SECRET_ACCESS_KEY": "test-secret",
+        "R2_ENDPOINT_URL": "http://localhost:9000",
+        "R2_MAX_POOL_CONNECTIONS": "4",
+    })
+    @patch("herald.storage.r2.boto3.client")
+    def test_endpoint_override_and_pool_size(self, mock_boto_client):
+        """R2_ENDPOINT_URL overrides the endpoint and the connection pool is sized from env."""
+        _build_r2_client()
+        _, kwargs = mock_boto_client.call_args
+        assert kwargs["endpoint_url"] == "http://localhost:9000"
+        assert kwargs["config"].max_pool_connections == 4
+
+    @patch("herald.storage.r2._build_r2_client")
+    def test_shared_client_built_once(self, mock_build_client):
+        """get_r2_client reuses one client (and connection pool) per process."""
+        assert get_r2_client() is get_r2_client()
+        mock_build_client.assert_called_once()
+
     @patch.dict("os.environ", {}, clear=True)
     def test_raises_when_all_credentials_missing(self):
         """ValueError raised when all R2 credential vars are absent."""
@@ -116,3 +180,47 @@ class TestDownloadCvBytes:
 
         with pytest.raises(ClientError):
             download_cv_bytes()
+
+
+class TestDownloadCvFile:
+    """Tests for the ETag-revalidated local object cache, against a local S3-compatible server."""
+
+    def test_disabled_without_cache(self):
+        """download_cv_file returns None when disk caching is disabled."""
+        assert download_cv_file() is None
+
+    def test_downloads_then_revalidates(self, r2_bucket):
+        """The first call downloads; later calls send If-None-Match and reuse the cached copy."""
+        path = download_cv_file()
+        with open(path, "rb") as file:
+            assert file.read() == b"%PDF-1.4 original"
+
+        client = get_r2_client()
+        with patch.object(client, "get_object", wraps=client.get_object) as spy:
+            assert download_cv_bytes() == b"%PDF-1.4 original"
+
+        assert spy.call_args[1]["IfNoneMatch"]
+
+    def test_changed_object_is_downloaded_again(self, r2_bucket):
+        """A new object version fails revalidation and replaces the cached copy."""
+        admin, bucket = r2_bucket
+        download_cv_file()
+
+        admin.put_object(Bucket=bucket, Key="cv.pdf", Body=b"%PDF-1.4 updated")
+
+        assert download_cv_bytes() == b"%PDF-1.4 updated"
+
+    def test_missing_object_propagates(self, r2_bucket, monkeypatch):
+        """Errors other than 304 Not Modified propagate to the caller."""
+        monkeypatch.setenv("CV_OBJECT_KEY", "missing.pdf")
+        with pytest.raises(ClientError):
+            download_cv_file()
+
+    def test_head_cv_etag_tracks_changes(self, r2_bucket):
+        """head_cv_etag returns the object's ETag and changes when the object is replaced."""
+        admin, bucket = r2_bucket
+        etag = head_cv_etag()
+
+        admin.put_object(Bucket=bucket, Key="cv.pdf", Body=b"%PDF-1.4 updated")
+
+        assert etag and head_cv_etag() != etag
@@ -0,0 +1,141 @@
+"""Tests for multi-tenant serving."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from herald.tenants import TenantRegistry, UnknownTenantError, estimate_context_bytes
+
+
+def _make_tenant(tenants_dir, tenant_id, files=("cv.pdf",), config=None):
+    """Create a tenant directory with placeholder files."""
+    tenant_dir = tenants_dir / tenant_id
+    tenant_dir.mkdir()
+    for name in files:
+        (tenant_dir / name).write_bytes(b"placeholder")
+    if config is not None:
+        (tenant_dir / "tenant.json").write_text(json.dumps(config))
+
+
+def _fake_context(*_args, **_kwargs):
+    """Basic-prompt context of a known size."""
+    context = MagicMock()
+    context.type = "basic_prompt"
+    context.cv_md_content = "x" * 1000
+    return context
+
+
+@pytest.fixture
+def tenants_dir(tmp_path):
+    for tenant_id in ("alice", "bob", "carol"):
+        _make_tenant(tmp_path, tenant_id)
+    return tmp_path
+
+
+class TestTenantConfig:
+    """Tests for resolving tenant directories."""
+
+    def test_snapshot_preferred_over_pdf(self, tmp_path):
+        _make_tenant(tmp_path, "dana", files=("cv.pdf", "herald.snapshot"),
+                     config={"name": "Dana Scully", "prompt_option": "basic"})
+
+        config = TenantRegistry(str(tmp_path)).config("dana")
+
+        assert config.snapshot_path.endswith("herald.snapshot") and config.cv_pdf_file is None
+        assert (config.name, config.prompt_option) == ("Dana Scully", "basic")
+
+    @pytest.mark.parametrize("tenant_id", ["missing", "../etc", "a/b", "", ".hidden"])
+    def test_unknown_or_malformed_ids_are_rejected(self, tenants_dir, tenant_id):
+        with pytest.raises(UnknownTenantError):
+            TenantRegistry(str(tenants_dir)).config(tenant_id)
+
+    def test_directory_without_cv_is_unknown(self, tmp_path):
+        _make_tenant(tmp_path, "empty", files=())
+        with pytest.raises(UnknownTenantError):
+            TenantRegistry(str(tmp_path)).config("empty")
+
+
+@pytest.mark.parametrize("embeddings, bytes_per_value", [
+    ([[0.5] * 384, [0.25] * 384], 4 + 32),  # embedded: a float32 index row and a list of Python floats
+    (np.ones((2, 384), dtype="<f4"), 4 + 4),  # snapshot: a float32 index row and a memory-mapped row
+])
+def test_estimate_counts_index_and_store_copies(embeddings, bytes_per_value):
+    context = MagicMock(type="rag_based", cv_md_content="x" * 1000)
+    context.context_store.export_index.return_value = (["doc one", "doc two"], embeddings, ["Skills", "Skills"])
+    bare = estimate_context_bytes(_fake_context())
+
+    assert estimate_context_bytes(context) - bare == len("doc one") + len("doc two") + 2 * 384 * bytes_per_value
+
+
+@patch("herald.tenants.HeraldApp")
+@patch("herald.tenants.build_context", side_effect=_fake_context)
+class TestTenantRegistry:
+    """Tests for lazy loading and LRU eviction."""
+
+    @pytest.mark.asyncio
+    async def test_loads_on_first_use_then_hits(self, mock_build_context, _mock_app, tenants_dir):
+        registry = TenantRegistry(str(tenants_dir), memory_budget_bytes=10**9)
+
+        first = await registry.get("alice")
+        second = await registry.get("alice")
+
+        assert first is second
+        mock_build_context.assert_called_once()
+        assert mock_build_context.call_args[1]["cv_pdf_file"].endswith("alice/cv.pdf")
+        assert registry.stats()["loads"] == 1 and registry.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_requests_load_once(self, mock_build_context, _mock_app, tenants_dir):
+        registry = TenantRegistry(str(tenants_dir), memory_budget_bytes=10**9)
+
+        tenants = await asyncio.gather(*(registry.get("bob") for _ in range(5)))
+
+        assert all(tenant is tenants[0] for tenant in tenants)
+        mock_build_context.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_is_evicted_over_budget(self, _mock_build_context, _mock_app, tenants_dir):
+        one_tenant = estimate_context_bytes(_fake_context())
+        registry = TenantRegistry(str(tenants_dir), memory_budget_bytes=2 * one_tenant)
+
+        alice = await registry.get("alice")
+        await registry.get("bob")
+        await registry.get("alice")  # bob is now least recently used
+        await registry.get("carol")
+
+        stats = registry.stats()
+        assert [tenant["tenant_id"] for tenant in stats["tenants"]] == ["carol", "alice"]
+        assert stats["evictions"] == 1 and stats["memory_bytes"] <= stats["memory_budget_bytes"]
+        alice.prompt.close.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_max_tenants_bound(self, _mock_build_context, _mock_app, tenants_dir):
+        registry = TenantRegistry(str(tenants_dir), memory_budget_bytes=10**9, max_tenants=1)
+
+        await registry.get("alice")
+        await registry.get("bob")
+
+        assert [tenant["tenant_id"] for tenant in registry.stats()["tenants"]] == ["bob"]
+
+    def test_evict_unloaded_tenant(self, _mock_build_context, _mock_app, tenants_dir):
+        assert TenantRegistry(str(tenants_dir)).evict("alice") is False
+
+
+class TestFromEnv:
+    """Tests for registry configuration."""
+
+    def test_disabled_without_tenants_dir(self, monkeypatch):
+        monkeypatch.delenv("HERALD_TENANTS_DIR", raising=False)
+        assert TenantRegistry.from_env() is None
+
+    def test_budget_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("HERALD_TENANTS_DIR", str(tmp_path))
+        monkeypatch.setenv("HERALD_TENANT_MEMORY_MB", "64")
+        monkeypatch.setenv("HERALD_MAX_TENANTS", "10")
+
+        registry = TenantRegistry.from_env()
+
+        assert registry.memory_budget_bytes == 64 * 2**20 and registry.max_tenants == 10
@@ -0,0 +1,82 @@
+"""Tests for the per-user daily message and token quotas."""
+
+import pytest
+from agents.usage import Usage
+from fastapi import HTTPException
+from openai.types.responses.response_usage import InputTokensDetails
+
+from herald.usage_tracker import ModelTokens, TokenUsage, UsageTracker
+
+
+def _usage(input_tokens, output_tokens, cached_tokens=0, requests=1):
+    return Usage(
+        requests=requests,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        input_tokens_details=InputTokensDetails(cached_tokens=cached_tokens),
+    )
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return UsageTracker(db_path=str(tmp_path / "usage.db"))
+
+
+def test_token_usage_adds_runs_per_model():
+    usage = TokenUsage()
+    usage.add("groq", _usage(100, 10, cached_tokens=40))
+    usage.add("groq", _usage(200, 20, requests=2))
+    usage.add("openai", _usage(50, 5))
+
+    assert usage.by_model["groq"] == ModelTokens(requests=3, input_tokens=300, output_tokens=30, cached_tokens=40)
+    assert usage.total_tokens == 385
+
+
+class TestUsageTracker:
+    """Tests for persisting usage per user, day and model."""
+
+    def test_tokens_accumulate_per_model(self, tracker):
+        first, second = TokenUsage(), TokenUsage()
+        first.add("groq", _usage(100, 10, cached_tokens=40))
+        second.add("groq", _usage(200, 20))
+        second.add("openai", _usage(50, 5))
+
+        assert tracker.record_tokens("alice", first) == 110
+        assert tracker.record_tokens("alice", second) == 385
+
+        assert tracker.get_token_usage("alice") == {
+            "groq": ModelTokens(requests=2, input_tokens=300, output_tokens=30, cached_tokens=40),
+            "openai": ModelTokens(requests=1, input_tokens=50, output_tokens=5, cached_tokens=0),
+        }
+        assert tracker.get_token_count("bob") == 0
+
+    def test_answer_without_model_call_records_nothing(self, tracker):
+        assert tracker.record_tokens("alice", TokenUsage()) == 0
+        assert not tracker.get_token_usage("alice")
+
+    def test_token_quota_is_enforced(self, tmp_path):
+        tracker = UsageTracker(db_path=str(tmp_path / "usage.db"), token_limit=100)
+        usage = TokenUsage()
+        usage.add("groq", _usage(90, 10))
+        tracker.record_tokens("alice", usage)
+
+        with pytest.raises(HTTPException) as raised:
+            tracker.check_quota("alice")
+
+        assert raised.value.status_code == 429
+        assert raised.value.detail["error"] == "daily_token_limit_reached"
+        assert tracker.check_quota("bob") == (0, 10)
+
+    def test_token_quota_disabled_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("DAILY_TOKEN_LIMIT", raising=False)
+        tracker = UsageTracker(db_path=str(tmp_path / "usage.db"))
+        usage = TokenUsage()
+        usage.add("groq", _usage(10_000_000, 10))
+        tracker.record_tokens("alice", usage)
+
+        assert tracker.check_quota("alice") == (0, 10)
+
+    def test_token_limit_is_read_when_tracker_is_built(self, tmp_path, monkeypatch):
+        # a .env loaded after herald is imported must still set the quota
+        monkeypatch.setenv("DAILY_TOKEN_LIMIT", "500")
+        assert UsageTracker(db_path=str(tmp_path / "usage.db")).token_limit == 500
@@ -0,0 +1,157 @@
+"""Tests for the vector index backends."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from herald.context_manager.rag import CVVectorStore, RetrievalRequest
+from herald.context_manager.vector_index import (
+    ChromaVectorIndex,
+    NumpyVectorIndex,
+    create_vector_index,
+)
+
+DOCUMENTS = ["python backend", "aws cloud", "react frontend", "phd physics", "go services"]
+TOPICS = ["Skills", "Skills", "Skills", "Education", "Experience"]
+
+
+@pytest.fixture
+def embeddings():
+    """Random, un-normalized embeddings — the index must normalize them itself."""
+    return np.random.default_rng(7).normal(size=(len(DOCUMENTS), 8)).astype(np.float32) * 3
+
+
+def _cosine_ranking(embeddings, query, rows):
+    """Brute-force reference ranking by cosine similarity."""
+    normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    scores = normalized[rows] @ (query / np.linalg.norm(query))
+    return [DOCUMENTS[rows[idx]] for idx in np.argsort(-scores)]
+
+
+class TestNumpyVectorIndex:
+    """Tests for the in-process NumPy index."""
+
+    def test_matrix_is_contiguous_and_normalized(self, embeddings):
+        index = NumpyVectorIndex()
+        index.add(DOCUMENTS[:2], embeddings[:2], TOPICS[:2])
+        index.add(DOCUMENTS[2:], embeddings[2:], TOPICS[2:])
+
+        assert index._matrix.dtype == np.float32 and index._matrix.flags["C_CONTIGUOUS"]
+        np.testing.assert_allclose(np.linalg.norm(index._matrix, axis=1), 1.0, rtol=1e-5)
+
+    def test_query_matches_brute_force_cosine(self, embeddings):
+        index = NumpyVectorIndex()
+        index.add(DOCUMENTS, embeddings, TOPICS)
+        query = embeddings[0] + 0.5 * embeddings[2]
+
+        assert index.query(query, top_k=3) == _cosine_ranking(embeddings, query, list(range(5)))[:3]
+
+    def test_topic_filter(self, embeddings):
+        index = NumpyVectorIndex()
+        index.add(DOCUMENTS, embeddings, TOPICS)
+
+        results = index.query(embeddings[3], top_k=10, topic="Skills")
+
+        assert results == _cosine_ranking(embeddings, embeddings[3], [0, 1, 2])
+        assert index.query(embeddings[3], top_k=2, topic="Unknown") == []
+
+    def test_documents_by_topic_in_insertion_order(self, embeddings):
+        index = NumpyVectorIndex()
+        index.add(DOCUMENTS, embeddings, TOPICS)
+
+        assert index.documents_by_topic("Skills") == DOCUMENTS[:3]
+        assert index.documents_by_topic("Projects") == []
+
+    def test_empty_index(self):
+        assert NumpyVectorIndex().query([0.1, 0.2], top_k=4) == []
+
+    def test_query_many_matches_single_queries(self, embeddings):
+        index = NumpyVectorIndex()
+        index.add(DOCUMENTS, embeddings, TOPICS)
+        queries, top_ks, topics = embeddings[[0, 3, 4]], [2, 1, 3], ["Skills", None, "Unknown"]
+
+        assert index.query_many(queries, top_ks, topics) == [
+            index.query(query, top_k, topic) for query, top_k, topic in zip(queries, top_ks, topics)
+        ]
+        assert index.query_many([], [], []) == []
+
+    def test_same_results_as_chroma(self, embeddings):
+        numpy_index, chroma_index = NumpyVectorIndex(), ChromaVectorIndex()
+        for index in (numpy_index, chroma_index):
+            index.add(DOCUMENTS, embeddings.tolist(), TOPICS)
+        query = embeddings[1] + 0.3 * embeddings[4]
+
+        try:
+            for topic in (None, "Skills"):
+                assert numpy_index.query(query.tolist(), 2, topic) == chroma_index.query(query.tolist(), 2, topic)
+        finally:
+            chroma_index.close()
+
+
+class TestCreateVectorIndex:
+    """Tests for backend selection."""
+
+    def test_numpy_is_default(self, monkeypatch):
+        monkeypatch.delenv("VECTOR_INDEX_BACKEND", raising=False)
+        assert create_vector_index().backend == "numpy"
+
+    def test_backend_from_env(self, monkeypatch):
+        monkeypatch.setenv("VECTOR_INDEX_BACKEND", "chroma")
+        index = create_vector_index()
+        assert index.backend == "chroma"
+        index.close()
+
+    def test_unsupported_backend_raises(self):
+        with pytest.raises(ValueError, match="Unsupported VECTOR_INDEX_BACKEND"):
+            create_vector_index("faiss")
+
+
+def test_vector_store_on_numpy_backend(sample_cv_chunks, mock_embedding_function, monkeypatch):
+    """CVVectorStore indexes and retrieves through the NumPy backend without ChromaDB."""
+    monkeypatch.delenv("VECTOR_INDEX_BACKEND", raising=False)
+    monkeypatch.setenv("RETRIEVAL_MODE", "vector")
+    vector_store = CVVectorStore(sample_cv_chunks, embedding_function=mock_embedding_function)
+    vector_store.vectorize_chunks()
+
+    assert vector_store.index_backend == "numpy"
+    assert len(vector_store.retrieve_relevant_chunks("Python", top_k=2)) == 2
+    assert vector_store.retrieve_relevant_chunks("Python", top_k=5, topic="Skills") == [
+        vector_store.export_index()[0][3]
+    ]
+    assert vector_store.get_all_chunks_by_topic("Experience") == [vector_store.export_index()[0][2]]
+
+
+def test_retrieve_many_embeds_in_one_batch(sample_cv_chunks, mock_embedding_function, monkeypatch):
+    """retrieve_many embeds every uncached query in one call and serves repeats from the caches."""
+    monkeypatch.delenv("VECTOR_INDEX_BACKEND", raising=False)
+    monkeypatch.setenv("RETRIEVAL_MODE", "vector")
+    vector_store = CVVectorStore(sample_cv_chunks, embedding_function=mock_embedding_function)
+    vector_store.vectorize_chunks()
+    mock_embedding_function.reset_mock()
+
+    results = vector_store.retrieve_many([("skills", "Skills", 3), ("degree", "Education", 3), ("skills", None, 2)])
+
+    mock_embedding_function.assert_called_once_with(["skills", "degree"])
+    assert results[0] == vector_store.get_all_chunks_by_topic("Skills")
+    assert results[1] == vector_store.get_all_chunks_by_topic("Education")
+    assert len(results[2]) == 2
+    assert vector_store.retrieve_many([("degree", "Education", 3)]) == [results[1]]
+    mock_embedding_function.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_retrieve_many_tool(sample_cv_chunks, mock_embedding_function):
+    """The batched tool maps each request to its chunks."""
+    with patch('herald.context_manager.rag.function_tool', side_effect=lambda f: f):
+        vector_store = CVVectorStore(sample_cv_chunks, embedding_function=mock_embedding_function)
+        vector_store.vectorize_chunks()
+        retrieve_many_chunks = vector_store.create_tools()[-1]
+
+    result = await retrieve_many_chunks([
+        RetrievalRequest(query="skills", topic="Skills"),
+        RetrievalRequest(query="anything", top_k=1),
+    ])
+
+    assert result[0] == {"query": "skills", "topic": "Skills", "chunks": vector_store.get_all_chunks_by_topic("Skills")}
+    assert result[1]["topic"] is None and len(result[1]["chunks"]) == 1